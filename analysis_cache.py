@@ -0,0 +1,225 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class SQLiteCacheBackend:
+    """Persistent second-level store for AnalysisCache entries.
+
+    Values are stored as JSON text keyed by the same content hash as the
+    in-memory cache, so analyses survive a server restart. Each process opens
+    its own connection on first use, so the backend can be created before a
+    pre-forking server starts its workers.
+
+    The file is bounded like the memory cache: prune() drops expired rows and
+    then the rows closest to expiry until at most ``max_rows`` rows and
+    ``max_bytes`` bytes of JSON remain. It runs when the backend is created
+    and after every ``prune_every`` writes.
+    """
+
+    def __init__(self, path, max_rows=10_000, max_bytes=512 * 1024 * 1024, prune_every=100):
+        self.path = path
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.prune_every = prune_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self.prune()
+
+    def _connection(self):
+        """This process's connection; call with the lock held"""
+        if self._conn is None or self._conn_pid != os.getpid():
+            # A connection inherited across fork must not be used or closed here
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn_pid = os.getpid()
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_analysis_cache_expires_at ON analysis_cache (expires_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key):
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at < time.time():
+            self.delete(key)
+            return None
+        return value, expires_at
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            conn.commit()
+            self._writes += 1
+            due = self._writes % self.prune_every == 0
+        if due:
+            self.prune()
+
+    def delete(self, key):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+            conn.commit()
+
+    def purge_expired(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM analysis_cache WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+
+    def prune(self):
+        """Drop expired rows, then the rows expiring soonest until within max_rows and max_bytes"""
+        self.purge_expired()
+        with self._lock:
+            conn = self._connection()
+            if self.max_rows is not None:
+                conn.execute(
+                    "DELETE FROM analysis_cache WHERE key IN ("
+                    "SELECT key FROM analysis_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,)
+                )
+            if self.max_bytes is not None:
+                conn.execute(
+                    "DELETE FROM analysis_cache WHERE key IN ("
+                    "SELECT key FROM (SELECT key, SUM(LENGTH(value)) OVER "
+                    "(ORDER BY expires_at DESC, key) AS kept FROM analysis_cache) WHERE kept > ?)",
+                    (self.max_bytes,)
+                )
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+class AnalysisCache:
+    """LRU + TTL cache for JSON-serializable text analyses.
+
+    Entries are evicted least-recently-used first once either ``max_entries``
+    or ``max_bytes`` (measured as the size of the JSON encoding) is exceeded,
+    and are ignored once older than ``ttl`` seconds. An optional ``backend``
+    such as SQLiteCacheBackend is consulted on a memory miss and written
+    through on every store.
+    """
+
+    def __init__(self, max_entries=256, ttl=3600.0, max_bytes=64 * 1024 * 1024, backend=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "backend_hits": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _store(self, key, value, size, expires_at):
+        """Insert into memory and evict down to the limits. Caller must hold self._lock."""
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (expires_at, size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats["evictions"] += 1
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] >= now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry[2]
+                self._remove(key)
+                self._stats["expirations"] += 1
+
+        if self.backend is not None:
+            try:
+                stored = self.backend.get(key)
+            except Exception:
+                logging.warning("Analysis cache backend read failed", exc_info=True)
+                stored = None
+            if stored is not None:
+                encoded, expires_at = stored
+                value = json.loads(encoded)
+                with self._lock:
+                    self._store(key, value, len(encoded), expires_at)
+                    self._stats["hits"] += 1
+                    self._stats["backend_hits"] += 1
+                return value
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key, value):
+        encoded = json.dumps(value)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store(key, value, len(encoded), expires_at)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, encoded, expires_at)
+            except Exception:
+                logging.warning("Analysis cache backend write failed", exc_info=True)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "backend": type(self.backend).__name__ if self.backend is not None else None,
+            })
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -1,44 +1,205 @@
 import logging
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from werkzeug.wsgi import get_input_stream
 import sqlite3
 import hashlib
-import random
-import nltk
-import re
-from datetime import datetime
+from datetime import datetime, timedelta
 import boto3
 import pymysql
-import pytesseract
-from PIL import Image
 import io
+import json
 import base64
+import click
+import gzip
 import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from db_pool import ConnectionPool, PoolTimeout
+import nltk_resources
+from quiz_generator import (build_question_bank, iter_questions, preprocess_text, questions_from_bank,
+                            text_fingerprint)
+from question_bank import QuestionBank
+from quiz_jobs import JobQueueFull, QuizJobManager
+from analysis_cache import AnalysisCache, SQLiteCacheBackend
+from ocr_pool import OcrPool, OcrQueueFull, OcrTimeout, count_pages
+from image_preprocess import preprocess_options, preprocess_options_from_args
+
+# Config profile: "development" (default) logs at DEBUG and runs the debug server from
+# __main__; "production" logs at INFO and is served by gunicorn (see wsgi.py)
+APP_ENV = os.environ.get("APP_ENV", "development")
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO" if APP_ENV == "production" else "DEBUG")
 
 # Configure logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.basicConfig(level=LOG_LEVEL.upper(), format='%(asctime)s - %(process)d - %(levelname)s - %(message)s')
+
+# NLTK startup mode: "verify" (default) only checks local resources, "download"
+# fetches anything missing, "skip" defers all checks to the first request.
+# Provision hosts once with `python nltk_resources.py provision`.
+NLTK_STARTUP = os.environ.get("NLTK_STARTUP", "verify")
+# Load the tagger/tokenizer at import so a pre-forking server shares them across workers
+NLTK_PRELOAD = os.environ.get("NLTK_PRELOAD", "0") == "1"
+
+if NLTK_STARTUP == "download":
+    nltk_resources.provision()
+elif NLTK_STARTUP == "verify":
+    nltk_resources.verify_resources()
+if NLTK_PRELOAD:
+    nltk_resources.preload()
 
-nltk.download('punkt')
-nltk.download('averaged_perceptron_tagger')
-nltk.download('punkt_tab')
-nltk.download('averaged_perceptron_tagger_eng')
 app = Flask(__name__)
 
-# AWS RDS Configuration
-RDS_HOST = "textquiz.cfw2s808cp18.ap-south-1.rds.amazonaws.com"
-RDS_USER = "admin"
-RDS_PASSWORD = "nourishesbara"
-RDS_DB = "textquiz"
+# HTTP compression: gzip JSON responses for clients that accept it, and accept
+# gzip-encoded request bodies (capped to guard against decompression bombs)
+GZIP_MIN_BYTES = 1024
+MAX_DECOMPRESSED_BYTES = int(os.environ.get("MAX_DECOMPRESSED_BYTES", str(64 * 1024 * 1024)))
+
+class GzipRequestMiddleware:
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        if environ.get('HTTP_CONTENT_ENCODING', '').lower() == 'gzip':
+            # Bounded by CONTENT_LENGTH: on a keep-alive connection the raw
+            # input never ends, and GzipFile would block looking for another member
+            try:
+                with gzip.GzipFile(fileobj=get_input_stream(environ)) as compressed:
+                    body = compressed.read(MAX_DECOMPRESSED_BYTES + 1)
+            except (OSError, EOFError):
+                start_response('400 Bad Request', [('Content-Type', 'application/json')])
+                return [b'{"error": "Invalid gzip request body"}']
+            if len(body) > MAX_DECOMPRESSED_BYTES:
+                start_response('413 Request Entity Too Large', [('Content-Type', 'application/json')])
+                return [b'{"error": "Request body too large"}']
+            environ['wsgi.input'] = io.BytesIO(body)
+            environ['CONTENT_LENGTH'] = str(len(body))
+            del environ['HTTP_CONTENT_ENCODING']
+        return self.wsgi_app(environ, start_response)
+
+app.wsgi_app = GzipRequestMiddleware(app.wsgi_app)
+
+@app.after_request
+def compress_response(response):
+    if (response.direct_passthrough or response.is_streamed or response.status_code < 200
+            or response.status_code >= 300 or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()
+            or response.mimetype != 'application/json'):
+        return response
+    data = response.get_data()
+    if len(data) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(data, 5))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+# AWS RDS Configuration (overridable to point at a local MySQL)
+RDS_HOST = os.environ.get("RDS_HOST", "textquiz.cfw2s808cp18.ap-south-1.rds.amazonaws.com")
+RDS_PORT = int(os.environ.get("RDS_PORT", "3306"))
+RDS_USER = os.environ.get("RDS_USER", "admin")
+RDS_PASSWORD = os.environ.get("RDS_PASSWORD", "nourishesbara")
+RDS_DB = os.environ.get("RDS_DB", "textquiz")
+
+# Connection pool sizing
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
+DB_POOL_MAX_LIFETIME = float(os.environ.get("DB_POOL_MAX_LIFETIME", "3600"))
+DB_POOL_IDLE_TIMEOUT = float(os.environ.get("DB_POOL_IDLE_TIMEOUT", "300"))
 
 # Establish RDS connection
 def get_db_connection():
     return pymysql.connect(
         host=RDS_HOST,
+        port=RDS_PORT,
         user=RDS_USER,
         password=RDS_PASSWORD,
         database=RDS_DB,
         cursorclass=pymysql.cursors.DictCursor
     )
 
+db_pool = ConnectionPool(
+    get_db_connection,
+    maxsize=DB_POOL_SIZE,
+    timeout=DB_POOL_TIMEOUT,
+    max_lifetime=DB_POOL_MAX_LIFETIME,
+    idle_timeout=DB_POOL_IDLE_TIMEOUT,
+)
+
+# Cache of tokenized/tagged text analyses, keyed by a hash of the preprocessed text
+ANALYSIS_CACHE_SIZE = int(os.environ.get("ANALYSIS_CACHE_SIZE", "256"))
+ANALYSIS_CACHE_TTL = float(os.environ.get("ANALYSIS_CACHE_TTL", "86400"))
+ANALYSIS_CACHE_MAX_BYTES = int(os.environ.get("ANALYSIS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+ANALYSIS_CACHE_PATH = os.environ.get("ANALYSIS_CACHE_PATH")  # SQLite file; unset keeps the cache in memory only
+# Limits for that file, enforced at startup and every 100 writes
+ANALYSIS_CACHE_DISK_MAX_ROWS = int(os.environ.get("ANALYSIS_CACHE_DISK_MAX_ROWS", "10000"))
+ANALYSIS_CACHE_DISK_MAX_BYTES = int(os.environ.get("ANALYSIS_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+
+analysis_cache = AnalysisCache(
+    max_entries=ANALYSIS_CACHE_SIZE,
+    ttl=ANALYSIS_CACHE_TTL,
+    max_bytes=ANALYSIS_CACHE_MAX_BYTES,
+    backend=SQLiteCacheBackend(ANALYSIS_CACHE_PATH, max_rows=ANALYSIS_CACHE_DISK_MAX_ROWS,
+                               max_bytes=ANALYSIS_CACHE_DISK_MAX_BYTES) if ANALYSIS_CACHE_PATH else None,
+)
+
+# Question sentences and their candidate blanks, built once per document and shared by
+# every user who submits it; loaded banks are kept in the analysis cache under their own keys
+question_bank = QuestionBank(db_pool, cache=analysis_cache)
+
+def get_question_bank(text):
+    fingerprint = text_fingerprint(preprocess_text(text))
+    return question_bank.get_or_build(fingerprint, lambda: build_question_bank(text, cache=analysis_cache))
+
+# Banks for documents seen for the first time are built here, after their first quiz is answered
+bank_builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="question-bank")
+
+def bank_text(text):
+    try:
+        get_question_bank(text)
+    except Exception:
+        logging.warning("Failed to build question bank", exc_info=True)
+
+def quiz_questions(params):
+    """Questions for a request, yielded as they are built.
+
+    A document with a bank gets sentences, blanks and distractors drawn from
+    it afresh. A new document is tagged incrementally only until
+    num_questions are built; its bank is then built in the background.
+    """
+    fingerprint = text_fingerprint(preprocess_text(params["text"]))
+    bank = question_bank.load(fingerprint)
+    if bank is not None:
+        yield from questions_from_bank(fingerprint, bank, params["num_questions"], params["question_type"],
+                                       cache=analysis_cache)
+        return
+    yield from iter_questions(params["text"], params["num_questions"], params["question_type"],
+                              cache=analysis_cache, incremental=True, complete_analysis=False)
+    # Best effort and off the request's path: the caller already has its questions
+    bank_builder.submit(bank_text, params["text"])
+
+# OCR runs in its own process pool so uploads cannot starve the other endpoints
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", "0")) or None  # default: CPU count - 1
+OCR_MAX_QUEUE = int(os.environ.get("OCR_MAX_QUEUE", "16"))
+OCR_JOB_TIMEOUT = float(os.environ.get("OCR_JOB_TIMEOUT", "30"))
+# Seconds between keep-alive lines on a /process_images stream waiting for a page
+OCR_STREAM_HEARTBEAT = 5.0
+
+ocr_pool = OcrPool(workers=OCR_WORKERS, max_queue=OCR_MAX_QUEUE, job_timeout=OCR_JOB_TIMEOUT)
+
+@app.errorhandler(OcrQueueFull)
+def handle_ocr_queue_full(e):
+    return jsonify({"error": "The server is busy processing other images, please retry shortly"}), 429, \
+        {"Retry-After": str(e.retry_after)}
+
+@app.errorhandler(OcrTimeout)
+def handle_ocr_timeout(e):
+    return jsonify({"error": f"Failed to process image: {str(e)}"}), 504
+
+@app.errorhandler(PoolTimeout)
+def handle_pool_timeout(e):
+    logging.warning(f"Database pool exhausted: {str(e)}")
+    return jsonify({"error": "Server is busy, please try again shortly"}), 503, {"Retry-After": "1"}
+
 # User Registration
 @app.route('/register', methods=['POST'])
 def register():
@@ -52,15 +213,13 @@ def register():
     hashed_password = hashlib.sha256(password.encode()).hexdigest()
 
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cursor:
-            cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", (username, hashed_password))
-        conn.commit()
+        with db_pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", (username, hashed_password))
+            conn.commit()
         return jsonify({"message": "User registered successfully"}), 201
     except pymysql.IntegrityError:
         return jsonify({"error": "Username already exists"}), 409
-    finally:
-        conn.close()
 
 # User Login
 @app.route('/login', methods=['POST'])
@@ -74,165 +233,744 @@ def login():
 
     hashed_password = hashlib.sha256(password.encode()).hexdigest()
 
-    try:
-        conn = get_db_connection()
+    with db_pool.connection() as conn:
         with conn.cursor() as cursor:
             cursor.execute("SELECT id FROM users WHERE username = %s AND password = %s", (username, hashed_password))
             user = cursor.fetchone()
-        if user:
-            return jsonify({"message": "Login successful", "user_id": user['id']}), 200
-        else:
-            return jsonify({"error": "Invalid username or password"}), 401
-    finally:
-        conn.close()
-
-# Fetch Quiz History
+    if user:
+        return jsonify({"message": "Login successful", "user_id": user['id']}), 200
+    else:
+        return jsonify({"error": "Invalid username or password"}), 401
+
+# Paging for /history and /progress
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Selectable quiz_results fields; "preview" is a short prefix of the extracted text
+RESULT_FIELDS = {
+    "id": "id",
+    "user_id": "user_id",
+    "date": "date",
+    "score": "score",
+    "total_questions": "total_questions",
+    "extracted_text": "extracted_text",
+    "preview": "LEFT(extracted_text, 60) AS preview",
+}
+
+# Server-side sort orders (?sort=, ?order=asc|desc); each is served by an index on (user_id, column)
+SORT_COLUMNS = {
+    "date": ("date", datetime.fromisoformat),
+    "score": ("score", int),
+}
+
+def encode_cursor(row, sort="date"):
+    column, _ = SORT_COLUMNS[sort]
+    value = row[column].isoformat() if isinstance(row[column], datetime) else row[column]
+    raw = f"{sort}|{value}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(token):
+    """(sort, sort value, id) from a cursor; cursors from before sorting existed are by date"""
+    parts = base64.urlsafe_b64decode(token.encode()).decode().split('|')
+    if len(parts) == 2:
+        parts.insert(0, "date")
+    sort, value, id_part = parts
+    return sort, SORT_COLUMNS[sort][1](value), int(id_part)
+
+def parse_page_args(default_fields):
+    """Read fields/limit/cursor/sort/order query parameters; raises ValueError on bad input."""
+    fields = request.args.get('fields')
+    fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else list(default_fields)
+    unknown = [f for f in fields if f not in RESULT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    sort = request.args.get('sort', 'date')
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"sort must be one of: {', '.join(SORT_COLUMNS)}")
+    order = request.args.get('order', 'desc')
+    if order not in ("asc", "desc"):
+        raise ValueError("order must be asc or desc")
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor = decode_cursor(cursor)
+        except Exception:
+            raise ValueError("Invalid cursor")
+        if cursor[0] != sort:
+            raise ValueError("Cursor belongs to a different sort")
+    return fields, limit, cursor or None, sort, order == "desc"
+
+def fetch_results_page(user_id, fields, limit, cursor, sort="date", descending=True):
+    """Keyset-paginated quiz_results rows for a user, newest (or highest) first.
+
+    Served from the (user_id, <sort column>) index; the cursor is the sort
+    value and id of the last row of the previous page, so deep pages cost the
+    same as the first. Returns the rows and the cursor for the next page
+    (None on the last page).
+    """
+    column, _ = SORT_COLUMNS[sort]
+    selected = ["id", column]
+    columns = selected + [RESULT_FIELDS[f] for f in fields if f not in selected]
+    sql = f"SELECT {', '.join(columns)} FROM quiz_results WHERE user_id = %s"
+    params = [user_id]
+    comparison, direction = ("<", "DESC") if descending else (">", "ASC")
+    if cursor:
+        sql += f" AND ({column} {comparison} %s OR ({column} = %s AND id {comparison} %s))"
+        params += [cursor[1], cursor[1], cursor[2]]
+    sql += f" ORDER BY {column} {direction}, id {direction} LIMIT %s"
+    params.append(limit + 1)
+
+    with db_pool.connection() as conn:
+        with conn.cursor() as db_cursor:
+            db_cursor.execute(sql, params)
+            rows = db_cursor.fetchall()
+
+    next_cursor = encode_cursor(rows[limit - 1], sort) if len(rows) > limit else None
+    rows = rows[:limit]
+    for key in selected:
+        if key not in fields:
+            for row in rows:
+                del row[key]
+    return rows, next_cursor
+
+def results_page_response(user_id, default_fields):
+    try:
+        fields, limit, cursor, sort, descending = parse_page_args(default_fields)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    rows, next_cursor = fetch_results_page(user_id, fields, limit, cursor, sort, descending)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    return jsonify(rows), 200, headers
+
+# Fetch Quiz History (one page; the next page's cursor is in the X-Next-Cursor header)
 @app.route('/history/<int:user_id>', methods=['GET'])
 def get_history(user_id):
-    try:
-        conn = get_db_connection()
+    return results_page_response(user_id, ["id", "user_id", "date", "score", "total_questions", "extracted_text"])
+
+# Past quizzes never change, so clients and proxies may keep them; private because they are per user
+QUIZ_CACHE_CONTROL = "private, max-age=86400, immutable"
+
+def parse_options(value):
+    """Stored options as a list: JSON arrays, or the comma-joined text older rows hold"""
+    if not value:
+        return []
+    if value.startswith("["):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value.split(",")
+
+# One Quiz with its Questions, fetched in a single indexed JOIN
+@app.route('/quiz/<int:quiz_id>', methods=['GET'])
+def get_quiz(quiz_id):
+    with db_pool.connection() as conn:
         with conn.cursor() as cursor:
-            cursor.execute("SELECT * FROM quiz_results WHERE user_id = %s ORDER BY date DESC", (user_id,))
-            history = cursor.fetchall()
-        return jsonify(history), 200
-    finally:
-        conn.close()
+            cursor.execute(
+                "SELECT r.id, r.user_id, r.date, r.score, r.total_questions, r.extracted_text, "
+                "q.id AS question_id, q.question, q.correct_answer, q.options, q.user_answer "
+                "FROM quiz_results r LEFT JOIN quiz_questions q ON q.quiz_id = r.id "
+                "WHERE r.id = %s ORDER BY q.id",
+                (quiz_id,)
+            )
+            rows = cursor.fetchall()
+    if not rows:
+        return jsonify({"error": "Quiz not found"}), 404
+
+    first = rows[0]
+    quiz = {
+        "id": first['id'],
+        "user_id": first['user_id'],
+        "date": first['date'].isoformat(),
+        "score": first['score'],
+        "total_questions": first['total_questions'],
+        "extracted_text": first['extracted_text'],
+        "questions": [
+            {"question": row['question'], "correct_answer": row['correct_answer'],
+             "options": parse_options(row['options']), "user_answer": row['user_answer']}
+            for row in rows if row['question_id'] is not None
+        ],
+    }
+    response = jsonify(quiz)
+    response.set_etag(hashlib.sha256(response.get_data()).hexdigest()[:32], weak=True)
+    response.headers['Cache-Control'] = QUIZ_CACHE_CONTROL
+    return response.make_conditional(request)
+
+# Most quiz sessions accepted by a single /results/batch request
+RESULTS_BATCH_MAX = int(os.environ.get("RESULTS_BATCH_MAX", "1000"))
+
+def validate_session(data):
+    """Return an error message for an invalid quiz session payload, or None."""
+    if not isinstance(data, dict):
+        return "Invalid data"
+    if not data.get('user_id') or not data.get('extracted_text') or data.get('score') is None \
+            or data.get('total_questions') is None or not data.get('questions'):
+        return "Invalid data"
+    for question in data['questions']:
+        if not isinstance(question, dict) or 'question' not in question or 'correct_answer' not in question:
+            return "Invalid question data"
+    if data.get('date') is not None:
+        try:
+            datetime.fromisoformat(data['date'])
+        except (TypeError, ValueError):
+            return "Invalid date"
+    return None
+
+def insert_sessions(cursor, sessions):
+    """Insert quiz sessions and all of their question rows.
+
+    Each session needs its own INSERT to learn its quiz id, but the question
+    rows for every session go out in a single executemany, which PyMySQL
+    rewrites into multi-row VALUES statements. Returns the new quiz ids.
+    """
+    quiz_ids = []
+    question_rows = []
+    for session in sessions:
+        cursor.execute(
+            "INSERT INTO quiz_results (user_id, extracted_text, score, total_questions, date) "
+            "VALUES (%s, %s, %s, %s, COALESCE(%s, CURRENT_TIMESTAMP))",
+            (session['user_id'], session['extracted_text'][:500], session['score'],
+             session['total_questions'], session.get('date'))
+        )
+        quiz_id = cursor.lastrowid
+        quiz_ids.append(quiz_id)
+        for question in session['questions']:
+            question_rows.append((quiz_id, question['question'], question['correct_answer'],
+                                  json.dumps(question.get('options') or []), question.get('user_answer')))
+
+    if question_rows:
+        cursor.executemany(
+            "INSERT INTO quiz_questions (quiz_id, question, correct_answer, options, user_answer) VALUES (%s, %s, %s, %s, %s)",
+            question_rows
+        )
+    update_progress_rollups(cursor, quiz_ids)
+    return quiz_ids
+
+# Rollup periods for /progress/summary; buckets are keyed by their first day (weeks start on Monday)
+ROLLUP_PERIODS = {
+    "day": lambda day: day,
+    "week": lambda day: day - timedelta(days=day.weekday()),
+}
+# Trailing buckets averaged into each bucket's rolling accuracy
+ROLLING_WINDOW = {"day": 7, "week": 4}
+
+def update_progress_rollups(cursor, quiz_ids):
+    """Fold newly inserted sessions into progress_rollups, in the caller's transaction.
+
+    Dates are read back from quiz_results so sessions stamped by the database
+    land in the same bucket as their row; sessions are summed per bucket first,
+    so a batch costs one upsert row per (user, period, bucket).
+    """
+    if not quiz_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(quiz_ids))
+    cursor.execute(
+        f"SELECT user_id, date, score, total_questions FROM quiz_results WHERE id IN ({placeholders})",
+        quiz_ids
+    )
+    buckets = {}
+    for row in cursor.fetchall():
+        for period, bucket_start in ROLLUP_PERIODS.items():
+            key = (row['user_id'], period, bucket_start(row['date'].date()))
+            attempts, score_sum, total_sum, best_score = buckets.get(key, (0, 0, 0, row['score']))
+            buckets[key] = (attempts + 1, score_sum + row['score'], total_sum + row['total_questions'],
+                            max(best_score, row['score']))
+
+    cursor.executemany(
+        "INSERT INTO progress_rollups (user_id, period, bucket, attempts, score_sum, total_sum, best_score) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE attempts = attempts + VALUES(attempts), score_sum = score_sum + VALUES(score_sum), "
+        "total_sum = total_sum + VALUES(total_sum), best_score = GREATEST(best_score, VALUES(best_score))",
+        [key + values for key, values in buckets.items()]
+    )
 
 # Save Quiz Results
 @app.route('/results', methods=['POST'])
 def save_results():
     data = request.json
-    user_id = data.get('user_id')
-    extracted_text = data.get('extracted_text')
-    score = data.get('score')
-    total_questions = data.get('total_questions')
-    questions = data.get('questions')
 
-    if not user_id or not extracted_text or score is None or total_questions is None or not questions:
-        return jsonify({"error": "Invalid data"}), 400
+    error = validate_session(data)
+    if error:
+        return jsonify({"error": error}), 400
 
-    try:
-        conn = get_db_connection()
+    with db_pool.connection() as conn:
         with conn.cursor() as cursor:
-            cursor.execute(
-                "INSERT INTO quiz_results (user_id, extracted_text, score, total_questions) VALUES (%s, %s, %s, %s)",
-                (user_id, extracted_text[:500], score, total_questions)
-            )
-            quiz_id = cursor.lastrowid
-
-            for question in questions:
-                cursor.execute(
-                    "INSERT INTO quiz_questions (quiz_id, question, correct_answer, options, user_answer) VALUES (%s, %s, %s, %s, %s)",
-                    (quiz_id, question['question'], question['correct_answer'], ','.join(question['options']), question['user_answer'])
-                )
+            quiz_id, = insert_sessions(cursor, [data])
         conn.commit()
-        return jsonify({"message": "Results saved successfully"}), 201
-    finally:
-        conn.close()
+    return jsonify({"message": "Results saved successfully", "quiz_id": quiz_id}), 201
+
+# Save many Quiz Results in one transaction (bulk import of historical sessions)
+@app.route('/results/batch', methods=['POST'])
+def save_results_batch():
+    data = request.json or {}
+    sessions = data.get('sessions')
 
-# Ensure required NLTK data is downloaded
+    if not isinstance(sessions, list) or not sessions:
+        return jsonify({"error": "A non-empty list of sessions is required"}), 400
+    if len(sessions) > RESULTS_BATCH_MAX:
+        return jsonify({"error": f"At most {RESULTS_BATCH_MAX} sessions per batch"}), 413
 
+    for index, session in enumerate(sessions):
+        error = validate_session(session)
+        if error:
+            return jsonify({"error": f"Session {index}: {error}"}), 400
+
+    with db_pool.connection() as conn:
+        with conn.cursor() as cursor:
+            quiz_ids = insert_sessions(cursor, sessions)
+        conn.commit()
+    return jsonify({"message": f"Saved {len(quiz_ids)} quiz sessions", "quiz_ids": quiz_ids}), 201
 
 # Generate Quiz Questions with Difficulty Levels and Question Types
-@app.route('/generate_quiz', methods=['POST'])
-def generate_quiz():
-    data = request.json
+def parse_quiz_request(data):
+    """Validate a quiz generation body; returns (params, error message)"""
     text = data.get('text')
     num_questions = data.get('num_questions', 5)
     question_type = data.get('question_type', 'mcq')  # Default to MCQ
-    difficulty = data.get('difficulty', 'medium')  # Default to medium difficulty
 
     if not text:
-        return jsonify({"error": "Text is required"}), 400
+        return None, "Text is required"
 
-    def preprocess_text(text):
-        return re.sub(r'\s+', ' ', text).strip()
-
-    def extract_key_sentences(text, num_sentences=20):
-        sentences = nltk.sent_tokenize(text)
-        sentences = [s for s in sentences if len(s.split()) > 5]
-        return random.sample(sentences, min(num_sentences, len(sentences)))
-
-    def generate_question(sentence, question_type):
-        tokens = nltk.word_tokenize(sentence)
-        tagged = nltk.pos_tag(tokens)
-        candidates = [word for word, tag in tagged if tag.startswith(('NN', 'VB', 'JJ')) and len(word) > 3]
-
-        if not candidates:
-            return None
+    try:
+        num_questions = int(num_questions)
+    except (TypeError, ValueError):
+        return None, "num_questions must be an integer"
 
-        word_to_replace = random.choice(candidates)
+    return {"text": text, "num_questions": num_questions, "question_type": question_type}, None
 
-        if question_type == 'short_answer':
-            return {"question": f"What is the meaning of '{word_to_replace}' in the context of the sentence?", "correct_answer": word_to_replace, "options": []}
-        elif question_type == 'fill_in_the_blank':
-            question = sentence.replace(word_to_replace, "_______")
-            return {"question": question, "correct_answer": word_to_replace, "options": []}
-        else:  # mcq
-            question = sentence.replace(word_to_replace, "_______")
-            options = [word_to_replace] + random.sample(candidates, min(3, len(candidates)))
-            random.shuffle(options)
-            return {"question": question, "correct_answer": word_to_replace, "options": options}
+@app.route('/generate_quiz', methods=['POST'])
+def generate_quiz():
+    params, error = parse_quiz_request(request.json)
+    if error:
+        return jsonify({"error": error}), 400
 
     try:
-        logging.debug("Preprocessing text for quiz generation.")
-        cleaned_text = preprocess_text(text)
-        key_sentences = extract_key_sentences(cleaned_text)
-        logging.debug(f"Extracted {len(key_sentences)} key sentences.")
-
-        questions = [generate_question(s, question_type) for s in key_sentences if generate_question(s, question_type)]
+        logging.debug("Generating quiz questions.")
+        questions = list(quiz_questions(params))
         logging.debug(f"Generated {len(questions)} questions.")
 
         if not questions:
             return jsonify({"error": "Failed to generate quiz questions. The text might not contain enough meaningful content."}), 400
 
-        return jsonify(questions[:num_questions]), 200
+        return jsonify(questions), 200
     except Exception as e:
         logging.error(f"Error generating quiz: {str(e)}", exc_info=True)
         return jsonify({"error": f"Failed to generate quiz: {str(e)}"}), 500
 
-# Progress Tracking
+# Background quiz jobs for long texts: submit, then poll or stream questions as they are built
+QUIZ_JOB_WORKERS = int(os.environ.get("QUIZ_JOB_WORKERS", "2"))
+QUIZ_JOB_MAX_QUEUE = int(os.environ.get("QUIZ_JOB_MAX_QUEUE", "32"))
+QUIZ_JOB_TTL = float(os.environ.get("QUIZ_JOB_TTL", "600"))  # seconds a finished job stays readable
+# Seconds between keep-alive lines on an idle stream, below the client's read timeout
+QUIZ_JOB_HEARTBEAT = 5.0
+
+quiz_jobs = QuizJobManager(
+    quiz_questions,
+    workers=QUIZ_JOB_WORKERS,
+    max_queue=QUIZ_JOB_MAX_QUEUE,
+    ttl=QUIZ_JOB_TTL,
+)
+
+@app.errorhandler(JobQueueFull)
+def handle_job_queue_full(e):
+    return jsonify({"error": "The server is busy generating other quizzes, please retry shortly"}), 429, \
+        {"Retry-After": str(e.retry_after)}
+
+# Submit a job; with ?stream=1 its questions are streamed on the same connection, which
+# also keeps the client on the worker process that owns the job
+@app.route('/quiz_jobs', methods=['POST'])
+def submit_quiz_job():
+    params, error = parse_quiz_request(request.json)
+    if error:
+        return jsonify({"error": error}), 400
+
+    job = quiz_jobs.submit(params)
+    if request.args.get('stream') == '1':
+        return Response(stream_job_events(job, 0, announce=True), mimetype="application/x-ndjson",
+                        headers={"X-Accel-Buffering": "no", "Cache-Control": "no-store",
+                                 "Location": f"/quiz_jobs/{job.id}"})
+    return jsonify(job.snapshot()), 202, {"Location": f"/quiz_jobs/{job.id}"}
+
+# Poll a job; ?after=N returns only the questions from index N on
+@app.route('/quiz_jobs/<job_id>', methods=['GET'])
+def get_quiz_job(job_id):
+    job = quiz_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Quiz job not found"}), 404
+    try:
+        after = max(0, int(request.args.get('after', 0)))
+    except ValueError:
+        return jsonify({"error": "after must be an integer"}), 400
+    return jsonify(job.snapshot(after)), 200
+
+@app.route('/quiz_jobs/<job_id>', methods=['DELETE'])
+def cancel_quiz_job(job_id):
+    job = quiz_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Quiz job not found"}), 404
+    return jsonify(job.snapshot()), 200
+
+def ndjson_line(payload):
+    return json.dumps(payload) + "\n"
+
+def stream_job_events(job, after, announce=False):
+    """NDJSON events for a job: one per question, heartbeats while idle, then a final status"""
+    if announce:
+        yield ndjson_line({"event": "job", "job_id": job.id})
+    index = after
+    while True:
+        questions, status, error = job.wait(index, QUIZ_JOB_HEARTBEAT)
+        for question in questions:
+            yield ndjson_line({"event": "question", "index": index, "question": question})
+            index += 1
+        if status in ("queued", "running"):
+            if not questions:
+                yield ndjson_line({"event": "heartbeat"})
+            continue
+        if status == "done" and index == 0:
+            status, error = "failed", "Failed to generate quiz questions. The text might not contain enough meaningful content."
+        yield ndjson_line({"event": status, "count": index, "error": error})
+        return
+
+# Stream a job's questions as NDJSON as soon as each one is generated
+@app.route('/quiz_jobs/<job_id>/stream', methods=['GET'])
+def stream_quiz_job(job_id):
+    job = quiz_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Quiz job not found"}), 404
+    try:
+        after = max(0, int(request.args.get('after', 0)))
+    except ValueError:
+        return jsonify({"error": "after must be an integer"}), 400
+    return Response(stream_job_events(job, after), mimetype="application/x-ndjson",
+                    headers={"X-Accel-Buffering": "no", "Cache-Control": "no-store"})
+
+# Progress Tracking (paged like /history)
 @app.route('/progress/<int:user_id>', methods=['GET'])
 def get_progress(user_id):
+    return results_page_response(user_id, ["date", "score", "total_questions"])
+
+def summarize_buckets(rows, window):
+    """Per-bucket and overall stats from progress_rollups rows (oldest first)"""
+    buckets = []
+    for index, row in enumerate(rows):
+        trailing = rows[max(0, index - window + 1):index + 1]
+        trailing_total = sum(r['total_sum'] for r in trailing)
+        buckets.append({
+            "bucket": row['bucket'].isoformat(),
+            "attempts": row['attempts'],
+            "mean_score": row['score_sum'] / row['attempts'],
+            "mean_total": row['total_sum'] / row['attempts'],
+            "best_score": row['best_score'],
+            "accuracy": row['score_sum'] / row['total_sum'] if row['total_sum'] else None,
+            "rolling_accuracy": sum(r['score_sum'] for r in trailing) / trailing_total if trailing_total else None,
+        })
+    attempts = sum(row['attempts'] for row in rows)
+    score_sum = sum(row['score_sum'] for row in rows)
+    total_sum = sum(row['total_sum'] for row in rows)
+    totals = {
+        "attempts": attempts,
+        "mean_score": score_sum / attempts if attempts else None,
+        "best_score": max((row['best_score'] for row in rows), default=None),
+        "accuracy": score_sum / total_sum if total_sum else None,
+    }
+    return buckets, totals
+
+# Progress Summary from the per-user rollups: cost grows with the number of buckets,
+# not sessions. ?period=day|week, ?limit=N returns only the newest N buckets
+@app.route('/progress/summary/<int:user_id>', methods=['GET'])
+def get_progress_summary(user_id):
+    period = request.args.get('period', 'day')
+    if period not in ROLLUP_PERIODS:
+        return jsonify({"error": f"period must be one of: {', '.join(ROLLUP_PERIODS)}"}), 400
     try:
-        conn = get_db_connection()
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    with db_pool.connection() as conn:
         with conn.cursor() as cursor:
-            cursor.execute("SELECT date, score, total_questions FROM quiz_results WHERE user_id = %s ORDER BY date DESC", (user_id,))
-            progress = cursor.fetchall()
-        return jsonify(progress), 200
-    finally:
-        conn.close()
+            cursor.execute(
+                "SELECT bucket, attempts, score_sum, total_sum, best_score FROM progress_rollups "
+                "WHERE user_id = %s AND period = %s ORDER BY bucket",
+                (user_id, period)
+            )
+            rows = cursor.fetchall()
+
+    buckets, totals = summarize_buckets(rows, ROLLING_WINDOW[period])
+    if limit is not None:
+        buckets = buckets[-limit:] if limit > 0 else []
+    return jsonify({"period": period, "window": ROLLING_WINDOW[period], "buckets": buckets, "totals": totals}), 200
+
+# Service Metrics
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return jsonify({
+        "db_pool": db_pool.stats(),
+        "analysis_cache": analysis_cache.stats(),
+        "ocr": ocr_pool.stats(),
+        "quiz_jobs": quiz_jobs.stats(),
+        "question_bank": question_bank.stats(),
+    }), 200
 
 # OCR Image Processing
 @app.route('/process_image', methods=['POST'])
 def process_image():
-    # Set Tesseract path for Linux
-    pytesseract.pytesseract.tesseract_cmd = "/usr/bin/tesseract"
-
     data = request.json
     image_base64 = data.get('image')
 
     if not image_base64:
         return jsonify({"error": "Image data is required"}), 400
 
+    # Optional per-request preprocessing settings, e.g. {"preprocess": {"deskew": false}}
+    try:
+        preprocess = preprocess_options(data.get('preprocess'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     try:
         # Decode the base64 image
         image_data = base64.b64decode(image_base64)
-        image = Image.open(io.BytesIO(image_data))
 
-        # Perform OCR using pytesseract
-        extracted_text = pytesseract.image_to_string(image)
+        # Perform OCR in the worker pool (tesseract path comes from TESSERACT_CMD)
+        extracted_text = ocr_pool.image_to_string(image_data, preprocess)
 
         # Clean and preprocess the extracted text
-        def preprocess_text(text):
-            return re.sub(r'\s+', ' ', text).strip()
-
         cleaned_text = preprocess_text(extracted_text)
 
         return jsonify({"extracted_text": cleaned_text}), 200
+    except (OcrQueueFull, OcrTimeout):
+        raise
     except Exception as e:
         return jsonify({"error": f"Failed to process image: {str(e)}"}), 500
 
+# Streaming uploads: size cap and where spooled files are written (default: system temp dir)
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+UPLOAD_DIR = os.environ.get("UPLOAD_DIR") or None
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+class UploadTooLarge(Exception):
+    pass
+
+def spool_upload(stream, destination):
+    """Copy a request body to ``destination`` in chunks, enforcing MAX_UPLOAD_BYTES"""
+    written = 0
+    while True:
+        chunk = stream.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            return written
+        written += len(chunk)
+        if written > MAX_UPLOAD_BYTES:
+            raise UploadTooLarge()
+        destination.write(chunk)
+
+def spool_to_temp_file(stream):
+    """Copy ``stream`` to a new temp file and return its path; the caller deletes it"""
+    fd, path = tempfile.mkstemp(prefix="upload-", dir=UPLOAD_DIR)
+    try:
+        with os.fdopen(fd, "wb") as destination:
+            written = spool_upload(stream, destination)
+        if not written:
+            raise ValueError("Image data is required")
+        return path
+    except BaseException:
+        os.unlink(path)
+        raise
+
+def save_upload_to_temp_file():
+    """Stream the uploaded image (raw body or multipart 'image' field) to a temp file.
+
+    Returns the file's path; the caller deletes it. Nothing larger than one
+    chunk is held in memory, unlike the base64 JSON route.
+    """
+    if request.content_length is not None and request.content_length > MAX_UPLOAD_BYTES:
+        raise UploadTooLarge()
+
+    if request.mimetype == "multipart/form-data":
+        # Werkzeug has already spooled large file parts to disk
+        upload = request.files.get("image")
+        if upload is None:
+            raise ValueError("Multipart field 'image' is required")
+        return spool_to_temp_file(upload.stream)
+    return spool_to_temp_file(request.stream)
+
+# OCR of a streamed image upload (raw bytes or multipart), options in the query string
+@app.route('/process_image/upload', methods=['POST'])
+def process_image_upload():
+    try:
+        preprocess = preprocess_options_from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        path = save_upload_to_temp_file()
+    except UploadTooLarge:
+        return jsonify({"error": f"Image exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB upload limit"}), 413
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        extracted_text = ocr_pool.image_to_string(path, preprocess)
+        return jsonify({"extracted_text": preprocess_text(extracted_text)}), 200
+    except (OcrQueueFull, OcrTimeout):
+        raise
+    except Exception as e:
+        return jsonify({"error": f"Failed to process image: {str(e)}"}), 500
+    finally:
+        os.unlink(path)
+
+# Batch OCR limits: files and pages per request, and total upload size
+OCR_BATCH_MAX_FILES = int(os.environ.get("OCR_BATCH_MAX_FILES", "50"))
+OCR_BATCH_MAX_PAGES = int(os.environ.get("OCR_BATCH_MAX_PAGES", "300"))
+MAX_BATCH_UPLOAD_BYTES = int(os.environ.get("MAX_BATCH_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+
+def batch_cleanup(results, paths):
+    """Close a batch's OCR results and delete its spooled files, once, however the response ends"""
+    done = []
+
+    def cleanup():
+        if done:
+            return
+        done.append(True)
+        results.close()
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+    return cleanup
+
+def stream_page_results(results, page_info, files, cleanup):
+    """Yield NDJSON events for a batch: start, one per page as it completes, done.
+
+    Pages arrive in completion order; ``page`` is the position in reading
+    order so clients can place each one. ``cleanup`` runs once the stream
+    ends, including when the client disconnects; the response also runs it
+    on close, for a stream that was never started.
+    """
+    try:
+        yield ndjson_line({"event": "start", "pages": len(page_info), "files": files})
+        texts = [None] * len(page_info)
+        reported = set()
+        failed = 0
+        try:
+            for result in results:
+                if result is None:
+                    # Still working; keeps the client's read timeout from tripping on slow pages
+                    yield ndjson_line({"event": "heartbeat"})
+                    continue
+                index, text, error = result
+                file_index, frame = page_info[index]
+                event = {"event": "page", "page": index, "file": file_index, "frame": frame}
+                if error is not None:
+                    failed += 1
+                    event["error"] = f"Failed to process page: {str(error) or type(error).__name__}"
+                else:
+                    texts[index] = event["text"] = preprocess_text(text)
+                reported.add(index)
+                yield ndjson_line(event)
+        except (OcrQueueFull, OcrTimeout) as e:
+            # The pool stayed saturated mid-batch; report what could not be processed
+            for index, (file_index, frame) in enumerate(page_info):
+                if index not in reported:
+                    failed += 1
+                    yield ndjson_line({"event": "page", "page": index, "file": file_index, "frame": frame,
+                                       "error": f"Failed to process page: {str(e)}"})
+        extracted_text = " ".join(text for text in texts if text)
+        yield ndjson_line({"event": "done", "pages": len(page_info), "failed": failed,
+                           "extracted_text": extracted_text})
+    finally:
+        cleanup()
+
+# Batch OCR: many images and multi-page TIFF/PDF files (multipart field 'images'),
+# OCR'd in parallel and streamed back as NDJSON as each page completes
+@app.route('/process_images', methods=['POST'])
+def process_images():
+    try:
+        preprocess = preprocess_options_from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if request.content_length is not None and request.content_length > MAX_BATCH_UPLOAD_BYTES:
+        return jsonify({"error": f"Upload exceeds the {MAX_BATCH_UPLOAD_BYTES // (1024 * 1024)} MB batch limit"}), 413
+    uploads = request.files.getlist("images")
+    if not uploads:
+        return jsonify({"error": "Multipart field 'images' is required"}), 400
+    if len(uploads) > OCR_BATCH_MAX_FILES:
+        return jsonify({"error": f"At most {OCR_BATCH_MAX_FILES} files can be processed at once"}), 413
+
+    paths = []
+    streaming = False
+    try:
+        files = []
+        page_info = []
+        for file_index, upload in enumerate(uploads):
+            try:
+                path = spool_to_temp_file(upload.stream)
+            except UploadTooLarge:
+                return jsonify({"error": f"{upload.filename} exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB upload limit"}), 413
+            except ValueError:
+                return jsonify({"error": f"{upload.filename} is empty"}), 400
+            paths.append(path)
+            try:
+                pages = count_pages(path)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            except Exception:
+                return jsonify({"error": f"{upload.filename} is not a supported image or PDF"}), 400
+            files.append({"name": upload.filename, "pages": pages})
+            page_info.extend((file_index, frame) for frame in range(pages))
+            if len(page_info) > OCR_BATCH_MAX_PAGES:
+                return jsonify({"error": f"At most {OCR_BATCH_MAX_PAGES} pages can be processed at once"}), 413
+
+        page_paths = [(paths[file_index], frame) for file_index, frame in page_info]
+        results = ocr_pool.map_pages(page_paths, preprocess, heartbeat=OCR_STREAM_HEARTBEAT)
+        # From here cleanup() owns the temp files and the reserved OCR slot
+        cleanup = batch_cleanup(results, paths)
+        streaming = True
+        try:
+            response = Response(stream_page_results(results, page_info, files, cleanup),
+                                mimetype="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
+            # Also runs when the client is gone before the server reads the first line
+            response.call_on_close(cleanup)
+        except BaseException:
+            cleanup()
+            raise
+        return response
+    finally:
+        if not streaming:
+            for path in paths:
+                os.unlink(path)
+
+# Pre-generate question banks for documents that will be handed out, e.g.
+#   flask --app api warm-question-bank handout.txt chapter1.png
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+@app.cli.command("warm-question-bank")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+def warm_question_bank(paths):
+    """Build and store question banks for UTF-8 text files or images (OCR'd like /process_image)."""
+    for path in paths:
+        if path.lower().endswith(IMAGE_EXTENSIONS):
+            text = preprocess_text(ocr_pool.image_to_string(path, preprocess_options()))
+        else:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        fingerprint = text_fingerprint(preprocess_text(text))
+        started = time.perf_counter()
+        bank = get_question_bank(text)
+        click.echo(f"{path}: {fingerprint[:12]} {len(bank)} question sentences "
+                   f"in {time.perf_counter() - started:.1f}s")
+    ocr_pool.shutdown()
+
 if __name__ == '__main__':
+    nltk_resources.preload()
+    # Development server only; production runs `gunicorn -c gunicorn.conf.py wsgi:app`
     # Bind to all network interfaces to make the API accessible externally
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    app.run(host="0.0.0.0", port=5000, debug=APP_ENV != "production")
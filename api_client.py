@@ -0,0 +1,489 @@
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Bytes read or written between progress updates
+CHUNK_SIZE = 64 * 1024
+
+# Seconds to establish a TCP connection, and per-endpoint seconds to wait for
+# the response; endpoints are matched by path prefix
+CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 15
+ENDPOINT_TIMEOUTS = {
+    "/login": 10,
+    "/register": 10,
+    "/history": 10,
+    "/progress": 10,
+    "/results": 15,
+    "/generate_quiz": 20,
+    # Job streams send a heartbeat every few seconds, so this only trips on a dead connection
+    "/quiz_jobs": 15,
+    "/quiz/": 10,
+    # /process_images streams a heartbeat every few seconds while pages are OCR'd
+    "/process_image": 30,
+}
+
+# Retries for idempotent calls: attempts after the first, backoff base and cap
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+MAX_BACKOFF = 8.0
+RETRY_STATUSES = {502, 503, 504}
+
+# JSON bodies at least this large are sent gzip-compressed
+GZIP_MIN_BYTES = 4096
+
+
+class ApiResponse:
+    """Fully read HTTP response handed back to the GUI thread"""
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+    def error_message(self, default="Unknown error"):
+        try:
+            return self.json().get("error", default)
+        except (ValueError, AttributeError):
+            return default
+
+
+class _ProgressReader:
+    """File-like request body that reports how much of it has been sent.
+
+    Wraps either bytes or an open binary file of ``total`` bytes; files are
+    read chunk by chunk so large uploads are never held in memory.
+    """
+
+    def __init__(self, data, callback, total=None):
+        self._data = data
+        self._total = len(data) if total is None else total
+        self._offset = 0
+        self._callback = callback
+
+    def __len__(self):
+        return self._total - self._offset
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._total - self._offset
+        if isinstance(self._data, bytes):
+            chunk = self._data[self._offset:self._offset + size]
+        else:
+            chunk = self._data.read(size)
+        self._offset += len(chunk)
+        self._callback(self._offset, self._total)
+        return chunk
+
+
+class _MultipartReader:
+    """multipart/form-data body that streams files from disk under one field name"""
+
+    def __init__(self, paths, field, callback):
+        self.boundary = uuid.uuid4().hex
+        self._callback = callback
+        self._segments = []
+        for path in paths:
+            filename = os.path.basename(path).replace('"', '%22')
+            header = (f'--{self.boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+                      f'Content-Type: application/octet-stream\r\n\r\n').encode("utf-8")
+            self._segments.extend([(header, len(header)), (path, os.path.getsize(path)), (b"\r\n", 2)])
+        closing = f"--{self.boundary}--\r\n".encode("utf-8")
+        self._segments.append((closing, len(closing)))
+        self._total = sum(size for _, size in self._segments)
+        self._offset = 0
+        self._index = 0
+        self._file = None
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return self._total - self._offset
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._total - self._offset
+        chunks = []
+        wanted = size
+        while wanted > 0 and self._index < len(self._segments):
+            segment, _ = self._segments[self._index]
+            if isinstance(segment, bytes):
+                chunk, segment_done = segment[:wanted], wanted >= len(segment)
+                self._segments[self._index] = (segment[wanted:], 0)
+            else:
+                if self._file is None:
+                    self._file = open(segment, "rb")
+                chunk = self._file.read(wanted)
+                segment_done = len(chunk) < wanted
+            if segment_done:
+                self.close()
+                self._index += 1
+            chunks.append(chunk)
+            wanted -= len(chunk)
+        data = b"".join(chunks)
+        self._offset += len(data)
+        self._callback(self._offset, self._total)
+        return data
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _CallSignals(QObject):
+    finished = pyqtSignal(object)
+    line = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    progress = pyqtSignal(int, int)
+    released = pyqtSignal()
+
+
+class ApiCall(QRunnable):
+    """One HTTP request executed on the thread pool.
+
+    Results are delivered through Qt signals, so slots run on the GUI thread.
+    Once cancelled, the call stops reading the response and none of its
+    signals reach their slots.
+    """
+
+    def __init__(self, send, on_complete=None, stream_lines=False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self._send = send
+        self._on_complete = on_complete
+        self._stream_lines = stream_lines
+        self._cancelled = threading.Event()
+        self.signals = _CallSignals()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def wait(self, seconds):
+        """Sleep for ``seconds`` unless cancelled first; returns True if cancelled"""
+        return self._cancelled.wait(seconds)
+
+    def report_progress(self, done, total):
+        if not self.is_cancelled():
+            self.signals.progress.emit(done, total)
+
+    def run(self):
+        try:
+            self._run()
+        finally:
+            self.signals.released.emit()
+
+    def _run(self):
+        if self.is_cancelled():
+            return
+        started = time.perf_counter()
+        status = None
+        try:
+            response = self._send(self)
+            if response is None:
+                return
+            status = response.status_code
+            try:
+                total = int(response.headers.get("Content-Length") or 0)
+                chunks = []
+                done = 0
+                # NDJSON success bodies are emitted line by line as they arrive; error bodies are read whole
+                stream_lines = self._stream_lines and response.status_code == 200
+                # Without a chunk size, iter_content yields whatever has arrived instead of waiting for a full chunk
+                for chunk in response.iter_content(None if stream_lines else CHUNK_SIZE):
+                    if self.is_cancelled():
+                        return
+                    done += len(chunk)
+                    self.report_progress(done, total)
+                    if stream_lines:
+                        *lines, rest = b"".join(chunks + [chunk]).split(b"\n")
+                        chunks = [rest]
+                        for line in lines:
+                            if line.strip() and not self.is_cancelled():
+                                self.signals.line.emit(json.loads(line))
+                    else:
+                        chunks.append(chunk)
+                result = ApiResponse(response.status_code, response.headers, b"".join(chunks))
+            finally:
+                response.close()
+        except Exception as e:
+            if not self.is_cancelled():
+                self.signals.failed.emit(e)
+            return
+        finally:
+            if self._on_complete is not None and not self.is_cancelled():
+                self._on_complete(time.perf_counter() - started, status)
+        if not self.is_cancelled():
+            self.signals.finished.emit(result)
+
+
+class LocalCall(ApiCall):
+    """Local, CPU- or subprocess-bound work run on the same pool as API calls.
+
+    ``finished`` carries the function's return value instead of an ApiResponse.
+    A running function cannot be interrupted; cancelling only drops its result.
+    """
+
+    def __init__(self, func):
+        super().__init__(None)
+        self._func = func
+
+    def _run(self):
+        if self.is_cancelled():
+            return
+        try:
+            result = self._func()
+        except Exception as e:
+            if not self.is_cancelled():
+                self.signals.failed.emit(e)
+            return
+        if not self.is_cancelled():
+            self.signals.finished.emit(result)
+
+
+class ApiClient(QObject):
+    """Non-blocking client for the TextQuiz API.
+
+    Every request runs on a QThreadPool worker and reports back through
+    ``on_success(ApiResponse)``, ``on_error(exception)`` and
+    ``on_progress(done, total)`` callbacks invoked on the GUI thread. Calls
+    made on behalf of a widget are cancelled when that widget is destroyed or
+    when ``cancel_for(widget)`` is called as the user navigates away.
+    """
+
+    def __init__(self, base_url, max_threads=4, parent=None):
+        super().__init__(parent)
+        self.base_url = base_url
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._latency = {}
+        self._latency_lock = threading.Lock()
+        self._max_threads = max_threads
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """One keep-alive session shared by all workers; retries are handled in
+        _send so they can honour cancellation and per-call idempotency.
+
+        Created on first use so importing this module (and painting the login
+        window) does not pay for importing requests.
+        """
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._max_threads, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers["Accept-Encoding"] = "gzip"
+                self._session = session
+            return self._session
+
+    @staticmethod
+    def endpoint_key(method, path):
+        """Collapse ids out of a path so latency is grouped per endpoint"""
+        route = re.sub(r'/\d+', '/<id>', path.split('?')[0])
+        return f"{method} {route}"
+
+    @staticmethod
+    def timeout_for(path):
+        for prefix, read_timeout in ENDPOINT_TIMEOUTS.items():
+            if path.startswith(prefix):
+                return CONNECT_TIMEOUT, read_timeout
+        return CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT
+
+    def request(self, method, path, on_success=None, on_error=None, on_progress=None,
+                owner=None, json_body=None, upload_file=None, upload_files=None, upload_progress=False,
+                idempotent=None, on_line=None, **kwargs):
+        """Queue a request and return its ApiCall.
+
+        GET requests are retried with exponential backoff on connection errors
+        and 502/503/504 responses; pass ``idempotent=True`` to opt other
+        methods in (e.g. POSTs that do not change server state).
+
+        ``upload_file`` is a path whose raw bytes are streamed as the request
+        body; the file is opened on the worker thread for every attempt.
+        ``upload_files`` is ``(field, paths)`` to stream several files as a
+        multipart form instead.
+
+        With ``on_line`` a 200 response is treated as NDJSON: each line is
+        parsed on the worker and passed to ``on_line`` as soon as it arrives,
+        and ``on_success`` then receives any unterminated remainder.
+        """
+        url = f"{self.base_url}{path}"
+        if idempotent is None:
+            idempotent = method in ("GET", "HEAD")
+        kwargs.setdefault("timeout", self.timeout_for(path))
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            headers = kwargs.setdefault("headers", {})
+            headers["Content-Type"] = "application/json"
+            kwargs["data"] = body
+        elif upload_file is not None:
+            headers = kwargs.setdefault("headers", {})
+            headers.setdefault("Content-Type", "application/octet-stream")
+
+        key = self.endpoint_key(method, path)
+        compress = json_body is not None and len(kwargs["data"]) >= GZIP_MIN_BYTES
+        call = ApiCall(lambda call: self._send(call, method, url, kwargs, idempotent, upload_progress, compress,
+                                               upload_file, upload_files),
+                       on_complete=lambda elapsed, status: self._record(key, elapsed, status),
+                       stream_lines=on_line is not None)
+        self._track(call, owner)
+        call.signals.released.connect(lambda: self._untrack(call))
+        call.signals.finished.connect(lambda response: self._deliver(call, on_success, response))
+        call.signals.failed.connect(lambda error: self._deliver(call, on_error, error))
+        if on_line is not None:
+            call.signals.line.connect(lambda line: self._deliver(call, on_line, line))
+        if on_progress is not None:
+            call.signals.progress.connect(lambda done, total: None if call.is_cancelled() else on_progress(done, total))
+        self.pool.start(call)
+        return call
+
+    def _send(self, call, method, url, kwargs, idempotent, upload_progress, compress, upload_file=None,
+              upload_files=None):
+        session = self.session
+        import requests
+        if compress:
+            # Compressed here rather than in request() to keep the work off the GUI thread
+            kwargs["data"] = gzip.compress(kwargs["data"], 5)
+            kwargs["headers"]["Content-Encoding"] = "gzip"
+        attempts = 1 + (MAX_RETRIES if idempotent else 0)
+        for attempt in range(attempts):
+            request_kwargs = dict(kwargs)
+            upload = None
+            if upload_files is not None:
+                field, paths = upload_files
+                body = _MultipartReader(paths, field, call.report_progress if upload_progress else lambda done, total: None)
+                request_kwargs["data"] = body
+                request_kwargs["headers"] = dict(request_kwargs.get("headers") or {}, **{"Content-Type": body.content_type})
+                upload = body
+            elif upload_file is not None:
+                upload = open(upload_file, "rb")
+                size = os.fstat(upload.fileno()).st_size
+                # Wrapped even without progress so requests sends a Content-Length, not chunked encoding
+                request_kwargs["data"] = _ProgressReader(
+                    upload, call.report_progress if upload_progress else lambda done, total: None, size)
+            elif upload_progress and isinstance(request_kwargs.get("data"), bytes):
+                request_kwargs["data"] = _ProgressReader(request_kwargs["data"], call.report_progress)
+            last_attempt = attempt == attempts - 1
+            try:
+                try:
+                    response = session.request(method, url, stream=True, **request_kwargs)
+                finally:
+                    if upload is not None:
+                        upload.close()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if last_attempt:
+                    raise
+                delay = None
+            else:
+                if last_attempt or response.status_code not in RETRY_STATUSES:
+                    return response
+                delay = response.headers.get("Retry-After")
+                response.close()
+
+            backoff = min(MAX_BACKOFF, BACKOFF_FACTOR * (2 ** attempt))
+            if delay is not None:
+                try:
+                    backoff = min(MAX_BACKOFF, max(backoff, float(delay)))
+                except ValueError:
+                    pass
+            logging.info(f"Retrying {method} {url} in {backoff:.1f}s (attempt {attempt + 2}/{attempts})")
+            if call.wait(backoff):
+                return None
+
+    def _record(self, key, elapsed, status):
+        with self._latency_lock:
+            stats = self._latency.setdefault(key, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0, "last": 0.0})
+            stats["count"] += 1
+            if status is None or status >= 500:
+                stats["errors"] += 1
+            stats["total"] += elapsed
+            stats["max"] = max(stats["max"], elapsed)
+            stats["last"] = elapsed
+        logging.debug(f"{key} -> {status} in {elapsed * 1000:.0f} ms")
+
+    def latency_stats(self):
+        """Per-endpoint call count, error count and mean/max/last latency in seconds"""
+        with self._latency_lock:
+            result = {}
+            for key, stats in self._latency.items():
+                result[key] = dict(stats, mean=stats["total"] / stats["count"] if stats["count"] else 0.0)
+            return result
+
+    def run_local(self, func, on_success=None, on_error=None, owner=None):
+        """Run ``func()`` on the worker pool with the same cancellation and callbacks as a request"""
+        call = LocalCall(func)
+        self._track(call, owner)
+        call.signals.released.connect(lambda: self._untrack(call))
+        call.signals.finished.connect(lambda result: self._deliver(call, on_success, result))
+        call.signals.failed.connect(lambda error: self._deliver(call, on_error, error))
+        self.pool.start(call)
+        return call
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def _track(self, call, owner):
+        with self._lock:
+            self._calls[call] = owner
+        if owner is not None:
+            owner.destroyed.connect(call.cancel)
+
+    def _untrack(self, call):
+        with self._lock:
+            owner = self._calls.pop(call, None)
+        if owner is not None:
+            # Long-lived owners (pages reused by WindowManager) would otherwise
+            # keep a connection, and the call, for every request they ever made
+            try:
+                owner.destroyed.disconnect(call.cancel)
+            except (TypeError, RuntimeError):
+                # Already disconnected, or the owner is being destroyed
+                pass
+
+    def _deliver(self, call, callback, value):
+        if callback is not None and not call.is_cancelled():
+            callback(value)
+
+    def cancel_for(self, owner):
+        """Cancel every pending call made on behalf of ``owner``"""
+        # Calls stay tracked until their worker releases them, which keeps the
+        # runnable alive while its thread is still unwinding
+        with self._lock:
+            calls = [call for call, call_owner in self._calls.items() if call_owner is owner]
+        for call in calls:
+            call.cancel()
+
+    def cancel_all(self):
+        with self._lock:
+            calls = list(self._calls)
+        for call in calls:
+            call.cancel()
+
+    def pending(self):
+        with self._lock:
+            return sum(1 for call in self._calls if not call.is_cancelled())
@@ -0,0 +1,46 @@
+"""Cold-start time of the API module under each NLTK startup mode.
+
+Usage: python benchmarks/bench_api_startup.py [--runs 5]
+
+Imports api.py in a fresh interpreter for every run and reports the median
+wall-clock import time for NLTK_STARTUP=download (the old behaviour of calling
+nltk.download() for every resource at import), NLTK_STARTUP=verify, and
+verify with NLTK_PRELOAD=1 (what a pre-forking master pays once).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+MODES = [
+    ("download", {"NLTK_STARTUP": "download"}),
+    ("verify", {"NLTK_STARTUP": "verify"}),
+    ("verify+preload", {"NLTK_STARTUP": "verify", "NLTK_PRELOAD": "1"}),
+]
+
+
+def time_import(extra_env):
+    env = dict(os.environ, **extra_env)
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import api"], cwd=ROOT, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'mode':>16} {'median s':>10} {'min s':>8}")
+    for name, extra_env in MODES:
+        timings = [time_import(extra_env) for _ in range(args.runs)]
+        print(f"{name:>16} {statistics.median(timings):>10.3f} {min(timings):>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Desktop client cold start: import-time breakdown and wall-clock to the first painted frame.
+
+Usage: python benchmarks/bench_client_startup.py [--runs 5] [--top 15]
+
+Each run starts a fresh interpreter with QT_QPA_PLATFORM=offscreen (set it
+to your platform to include real window-system costs), imports main.py,
+builds MainApplication and shows it. Time is measured from process launch
+until the login window receives its first paint event. The "eager" mode
+imports what main.py used to load at module top (matplotlib.pyplot, the
+Qt canvas and requests) before main, to compare with the lazy startup.
+The breakdown lists the slowest top-level imports from ``-X importtime``.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+EAGER_IMPORTS = "import matplotlib.pyplot, matplotlib.backends.backend_qtagg, requests\n"
+
+FIRST_FRAME = """
+import sys
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QApplication
+import main
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            print("FIRST_FRAME", flush=True)
+            QApplication.instance().exit(0)
+        return False
+
+app = QApplication(sys.argv)
+window = main.MainApplication()
+window.installEventFilter(FirstPaint(app))
+window.show()
+sys.exit(app.exec())
+"""
+
+
+def run_env():
+    return dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+
+
+def time_to_first_frame(eager):
+    script = (EAGER_IMPORTS if eager else "") + FIRST_FRAME
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", script], cwd=ROOT, env=run_env(),
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    for line in process.stdout:
+        if line.startswith("FIRST_FRAME"):
+            elapsed = time.perf_counter() - started
+            break
+    else:
+        raise RuntimeError("the client exited before painting a frame")
+    process.wait(timeout=30)
+    return elapsed
+
+
+def import_breakdown():
+    """(cumulative us, module) for every top-level import made by ``import main``"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=ROOT,
+                            env=run_env(), capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented under the module that triggered them
+        if not name[1:].startswith(" "):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"{'mode':>6} {'median ms':>10} {'min ms':>8}")
+    for name, eager in (("eager", True), ("lazy", False)):
+        timings = [time_to_first_frame(eager) for _ in range(args.runs)]
+        print(f"{name:>6} {statistics.median(timings) * 1000:>10.0f} {min(timings) * 1000:>8.0f}")
+
+    rows = import_breakdown()
+    print(f"\n`import main`: {sum(us for us, _ in rows) / 1000:.0f} ms in top-level imports, slowest first")
+    for cumulative, module in rows[:args.top]:
+        print(f"{cumulative / 1000:>10.1f} ms  {module}")
+
+
+if __name__ == '__main__':
+    main()
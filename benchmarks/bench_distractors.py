@@ -0,0 +1,91 @@
+"""MCQ generation time and option quality: per-sentence sampling versus the distractor index.
+
+Usage: python benchmarks/bench_distractors.py [--words 100000] [--runs 5] [--num-questions 20]
+
+Builds a synthetic text of --words words (sentences from
+bench_generate_quiz.py) and times generate_questions cold (empty cache, so
+tagging and the index build are included) and warm (analysis and index
+cached). It also rebuilds the same questions with the old
+``random.sample(candidates, 3)`` distractors and reports, for both, how
+often the answer reappears among the distractors, how often an option is
+duplicated, and the mean number of distinct options per question.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from analysis_cache import AnalysisCache
+from bench_generate_quiz import synthetic_text
+from quiz_generator import (analyze_text, candidate_words, generate_questions, get_distractor_index,
+                            preprocess_text, text_fingerprint)
+
+
+def old_options(answer, tagged):
+    """The previous behaviour: distractors sampled from the question's own sentence"""
+    candidates = [word for word, _ in candidate_words(tagged)]
+    return [answer] + random.sample(candidates, min(3, len(candidates)))
+
+
+def new_options(answer, tag, index):
+    return [answer] + index.pick(answer, tag)
+
+
+def quality(option_sets):
+    answer_repeated = sum(1 for options in option_sets if options[0].lower() in (o.lower() for o in options[1:]))
+    duplicated = sum(1 for options in option_sets if len({o.lower() for o in options}) < len(options))
+    distinct = statistics.mean(len({o.lower() for o in options}) for options in option_sets)
+    total = len(option_sets)
+    return answer_repeated / total, duplicated / total, distinct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--num-questions", type=int, default=20)
+    args = parser.parse_args()
+
+    # synthetic_text works in characters; its sentences average about 7 characters per word
+    text = synthetic_text(args.words * 7)
+    print(f"text: {len(text.split())} words, {len(text)} characters")
+
+    cold, warm = [], []
+    for run in range(args.runs):
+        cache = AnalysisCache()
+        started = time.perf_counter()
+        generate_questions(text, args.num_questions, "mcq", cache=cache)
+        cold.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        generate_questions(text, args.num_questions, "mcq", cache=cache)
+        warm.append(time.perf_counter() - started)
+    print(f"generate_questions cold: median {statistics.median(cold) * 1000:.1f} ms")
+    print(f"generate_questions warm: median {statistics.median(warm) * 1000:.1f} ms")
+
+    cleaned_text = preprocess_text(text)
+    analysis = analyze_text(cleaned_text)
+    started = time.perf_counter()
+    index = get_distractor_index(text_fingerprint(cleaned_text), analysis)
+    print(f"index build: {(time.perf_counter() - started) * 1000:.2f} ms for {len(analysis)} sentences")
+
+    old_sets, new_sets = [], []
+    for _, tagged in analysis:
+        candidates = candidate_words(tagged)
+        if not candidates:
+            continue
+        answer, tag = random.choice(candidates)
+        old_sets.append(old_options(answer, tagged))
+        new_sets.append(new_options(answer, tag, index))
+
+    print(f"{'distractors':>12} {'answer repeated':>16} {'duplicate option':>17} {'distinct options':>17}")
+    for name, sets in (("per-sentence", old_sets), ("index", new_sets)):
+        repeated, duplicated, distinct = quality(sets)
+        print(f"{name:>12} {repeated:>16.1%} {duplicated:>17.1%} {distinct:>17.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Per-request latency of quiz generation against input text size.
+
+Usage: python benchmarks/bench_generate_quiz.py [--runs 5] [--num-questions 5]
+
+Builds synthetic texts from 1 KB to 1 MB and reports the median and p95
+wall-clock time of the /generate_quiz handler for each size, using Flask's
+test client so request parsing and JSON encoding are included. The database
+is the SQLite stand-in (db_standin.py).
+
+"cold" runs each use a text never seen before (a new seed), so they pay for
+tagging sentences until the questions are built; the document's question
+bank is built afterwards in the background. "warm" runs repeat one text once
+its bank is built, so they only draw questions from the stored bank.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+SUBJECTS = ["The committee", "A careful student", "The river system", "Modern architecture",
+            "The ancient library", "Photosynthesis", "The local government", "An experienced pilot"]
+VERBS = ["describes", "transforms", "influences", "protects", "examines", "reveals", "supports", "requires"]
+OBJECTS = ["the complex relationship between climate and agriculture",
+           "several important historical documents from the region",
+           "a surprisingly efficient method for storing energy",
+           "the structure of traditional mountain villages",
+           "careful observation of seasonal migration patterns",
+           "detailed measurements collected during the expedition"]
+
+
+def synthetic_text(size, seed=0):
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        sentence = f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}."
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)[:size]
+
+
+def timed_post(client, payload):
+    started = time.perf_counter()
+    response = client.post("/generate_quiz", json=payload)
+    elapsed = (time.perf_counter() - started) * 1000
+    if response.status_code != 200:
+        print(f"  request failed with {response.status_code}: {response.get_json()}")
+    return elapsed
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return statistics.median(timings), timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--num-questions", type=int, default=5)
+    args = parser.parse_args()
+
+    import api
+    import db_standin
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_standin.install(api, os.path.join(directory, "generate.db"))
+        client = api.app.test_client()
+        # Loads the NLTK models; uses a seed no timed run shares
+        client.post("/generate_quiz", json={"text": synthetic_text(SIZES[0], seed=-1),
+                                            "num_questions": args.num_questions})
+
+        print(f"{'size':>10} {'cold median':>12} {'cold p95':>10} {'warm median':>12} {'warm p95':>10}  (ms)")
+        for size in SIZES:
+            cold = [timed_post(client, {"text": synthetic_text(size, seed=run), "num_questions": args.num_questions})
+                    for run in range(args.runs)]
+            # Let the background bank builds finish; the last cold text is then banked
+            api.bank_builder.submit(lambda: None).result()
+            payload = {"text": synthetic_text(size, seed=args.runs - 1), "num_questions": args.num_questions}
+            warm = [timed_post(client, payload) for _ in range(args.runs)]
+            cold_median, cold_p95 = summarize(cold)
+            warm_median, warm_p95 = summarize(warm)
+            print(f"{size:>10} {cold_median:>12.1f} {cold_p95:>10.1f} {warm_median:>12.1f} {warm_p95:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
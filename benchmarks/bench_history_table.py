@@ -0,0 +1,165 @@
+"""History table with 100k sessions: QTableWidget filled up front versus the lazy HistoryTableModel.
+
+Usage: python benchmarks/bench_history_table.py [--rows 100000] [--skip-server]
+
+Client side (headless, QT_QPA_PLATFORM=offscreen): "widget" creates three
+QTableWidgetItems per session like the old HistoryWindow; "model" shows a
+QTableView over HistoryTableModel fed from an in-memory page source, and
+reports the time until the first page is visible and the time to scroll to
+the last row, fetchMore by fetchMore. RSS growth is measured for both.
+
+Server side: the same number of sessions are inserted into the SQLite
+stand-in (db_standin.py) and every page of /history is fetched for
+sort=date (newest first) and sort=score (lowest first), reporting the
+median and slowest page; keyset pagination keeps deep pages as cheap as the
+first.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from PyQt6.QtWidgets import QApplication, QTableView, QTableWidget, QTableWidgetItem
+
+from history_model import HistoryTableModel
+
+PAGE_SIZE = 200
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def make_rows(count):
+    date = datetime(2020, 1, 1)
+    rows = []
+    for index in range(count):
+        date += timedelta(minutes=random.randint(1, 60))
+        rows.append({"id": index + 1, "date": date.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+                     "score": random.randint(0, 10), "total_questions": 10,
+                     "preview": f"Extracted text of benchmark session {index} " * 2})
+    rows.reverse()
+    return rows
+
+
+def bench_widget(app, rows):
+    before = rss_mb()
+    started = time.perf_counter()
+    table = QTableWidget()
+    table.setColumnCount(3)
+    table.setRowCount(len(rows))
+    for i, row in enumerate(rows):
+        table.setItem(i, 0, QTableWidgetItem(row["date"]))
+        table.setItem(i, 1, QTableWidgetItem(f"{row['score']}/{row['total_questions']}"))
+        table.setItem(i, 2, QTableWidgetItem(row["preview"][:50] + "..."))
+    table.show()
+    app.processEvents()
+    elapsed = time.perf_counter() - started
+    growth = rss_mb() - before
+    table.close()
+    table.deleteLater()
+    app.processEvents()
+    return elapsed, growth
+
+
+def bench_model(app, rows):
+    pages = [0]
+
+    def fetch_page(cursor, sort, descending, on_page, on_error):
+        offset = cursor or 0
+        pages[0] += 1
+        end = offset + PAGE_SIZE
+        on_page(rows[offset:end], end if end < len(rows) else None)
+
+    before = rss_mb()
+    started = time.perf_counter()
+    model = HistoryTableModel(fetch_page)
+    view = QTableView()
+    view.setModel(model)
+    view.resize(700, 500)
+    view.show()
+    model.reload()
+    app.processEvents()
+    first_page = time.perf_counter() - started
+
+    started = time.perf_counter()
+    while model.canFetchMore():
+        view.scrollToBottom()
+        app.processEvents()
+    to_end = time.perf_counter() - started
+    growth = rss_mb() - before
+    assert model.rowCount() == len(rows), model.rowCount()
+    view.close()
+    return first_page, to_end, pages[0], growth
+
+
+def bench_server(count):
+    import api
+    import db_standin
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_standin.install(api, os.path.join(directory, "history.db"))
+        client = api.app.test_client()
+        client.post("/register", json={"username": "history-bench", "password": "history-bench"})
+        user_id = client.post("/login", json={"username": "history-bench",
+                                              "password": "history-bench"}).get_json()["user_id"]
+        date = datetime(2020, 1, 1)
+        for offset in range(0, count, api.RESULTS_BATCH_MAX):
+            batch = []
+            for index in range(offset, min(count, offset + api.RESULTS_BATCH_MAX)):
+                date += timedelta(minutes=random.randint(1, 60))
+                batch.append({"user_id": user_id, "extracted_text": f"Session {index}.", "score": random.randint(0, 10),
+                              "total_questions": 10, "date": date.isoformat(" ", "seconds"),
+                              "questions": [{"question": "Benchmark _______.", "correct_answer": "blank"}]})
+            assert client.post("/results/batch", json={"sessions": batch}).status_code == 201
+
+        for sort, order in (("date", "desc"), ("score", "asc")):
+            params = {"limit": PAGE_SIZE, "fields": "id,date,score,total_questions,preview",
+                      "sort": sort, "order": order}
+            timings, seen = [], 0
+            while True:
+                started = time.perf_counter()
+                response = client.get(f"/history/{user_id}", query_string=params)
+                timings.append(time.perf_counter() - started)
+                seen += len(response.get_json())
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+                params["cursor"] = cursor
+            assert seen == count, f"sort={sort} returned {seen} rows"
+            print(f"server sort={sort:<5} {order:<4} {len(timings)} pages: median {statistics.median(timings) * 1000:.2f} ms, "
+                  f"first {timings[0] * 1000:.2f} ms, slowest {max(timings) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--skip-server", action="store_true")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    rows = make_rows(args.rows)
+
+    elapsed, growth = bench_widget(app, rows)
+    print(f"widget: all {args.rows} rows in {elapsed:.2f}s, RSS +{growth:.0f} MB")
+    first_page, to_end, pages, growth = bench_model(app, rows)
+    print(f"model:  first page in {first_page * 1000:.0f} ms, scrolled to the end in {to_end:.2f}s "
+          f"({pages} fetches), RSS +{growth:.0f} MB")
+
+    if not args.skip_server:
+        bench_server(args.rows)
+
+
+if __name__ == '__main__':
+    main()
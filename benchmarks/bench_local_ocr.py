@@ -0,0 +1,75 @@
+"""Time to extracted text: OCR on the client versus the server round trip.
+
+Usage: python benchmarks/bench_local_ocr.py [--runs 3] [--url http://127.0.0.1:5000]
+
+Uses the synthetic phone photos from bench_ocr_preprocess.py, saved as JPEG
+like a camera would. "local" is local_ocr.image_to_string on this machine;
+"remote" streams the same file to /process_image/upload on --url (skipped
+without --url) and includes upload time and server queueing. Both paths run
+the default preprocessing.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import local_ocr
+from bench_ocr_preprocess import SAMPLES, accuracy, synthetic_photo
+
+
+def time_local(path, runs):
+    timings = []
+    text = ""
+    for _ in range(runs):
+        started = time.perf_counter()
+        text = local_ocr.image_to_string(path, preprocess=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), accuracy(text)
+
+
+def time_remote(session, url, path, runs):
+    timings = []
+    text = ""
+    for _ in range(runs):
+        started = time.perf_counter()
+        with open(path, "rb") as f:
+            response = session.post(f"{url}/process_image/upload?preprocess=1", data=f,
+                                    headers={"Content-Type": "application/octet-stream"})
+        response.raise_for_status()
+        text = response.json()["extracted_text"]
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), accuracy(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--url")
+    args = parser.parse_args()
+
+    if not local_ocr.is_available():
+        sys.exit("tesseract not found; set TESSERACT_CMD")
+    session = None
+    if args.url:
+        import requests
+        session = requests.Session()
+
+    print(f"{'image':>10} {'size KB':>8} {'local s':>8} {'local acc':>10} {'remote s':>9} {'remote acc':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for seed, (name, skew, gradient, noise) in enumerate(SAMPLES):
+            path = os.path.join(directory, f"{name}.jpg")
+            synthetic_photo(seed, skew, gradient, noise).save(path, quality=90)
+            local_time, local_acc = time_local(path, args.runs)
+            remote = "-"
+            if session is not None:
+                remote_time, remote_acc = time_remote(session, args.url.rstrip("/"), path, args.runs)
+                remote = f"{remote_time:>9.2f} {remote_acc:>11.1%}"
+            print(f"{name:>10} {os.path.getsize(path) // 1024:>8} {local_time:>8.2f} {local_acc:>10.1%} {remote:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Render time of the progress chart: the old full rebuild versus ProgressChart.
+
+Usage: python benchmarks/bench_progress_chart.py [--points 100,10000,100000] [--runs 5] [--width 800]
+
+Renders headless with the Agg backend at --width pixels. "rebuild" is the
+previous plot_progress: figure.clear(), date strings as categorical x values
+and two fill_between areas over every point. "chart first" is a fresh
+ProgressChart given every session; "chart update" is the path taken when a
+page arrives on an existing chart (add the page, set_data, redraw). Each
+figure is the median over --runs full draws, including LTTB downsampling.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from progress_chart import ProgressChart
+
+DPI = 100
+PAGE_SIZE = 500
+
+
+def sessions(count):
+    date = datetime(2020, 1, 1)
+    dates, scores, totals = [], [], []
+    for _ in range(count):
+        date += timedelta(minutes=random.randint(5, 600))
+        total = random.choice((5, 10))
+        dates.append(date)
+        scores.append(random.randint(0, total))
+        totals.append(total)
+    return dates, scores, totals
+
+
+def new_figure(width):
+    figure = Figure(figsize=(width / DPI, 4), dpi=DPI)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def rebuild(figure, dates, scores, totals):
+    """The previous ProgressWindow.plot_progress"""
+    labels = [date.strftime("%a, %d %b %Y %H:%M:%S GMT") for date in dates]
+    figure.clear()
+    ax = figure.add_subplot(111)
+    ax.plot(labels, scores, label="Score", marker="o", color="blue", linewidth=2)
+    ax.fill_between(labels, scores, color="blue", alpha=0.2)
+    ax.plot(labels, totals, label="Total Questions", marker="o", color="green", linewidth=2)
+    ax.fill_between(labels, totals, color="green", alpha=0.2)
+    ax.set_title("Progress Over Time", fontsize=10, fontweight="bold")
+    ax.legend(loc="upper left", fontsize=10)
+    ax.grid(True, linestyle="--", alpha=0.6)
+    ax.tick_params(axis="x", rotation=90)
+    figure.canvas.draw()
+
+
+def chart_first(width, dates, scores, totals):
+    chart = ProgressChart(new_figure(width))
+    chart.add_sessions(dates, scores, totals)
+    drawn = chart.render()
+    chart.figure.canvas.draw()
+    return drawn
+
+
+def median_time(func, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", default="100,10000,100000")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--width", type=int, default=800)
+    parser.add_argument("--rebuild-max", type=int, default=10_000,
+                        help="skip the old rebuild above this many points (it takes minutes)")
+    args = parser.parse_args()
+
+    print(f"{'points':>8} {'method':>14} {'median ms':>10} {'drawn':>7}")
+    for count in (int(value) for value in args.points.split(",")):
+        dates, scores, totals = sessions(count)
+
+        if count <= args.rebuild_max:
+            figure = new_figure(args.width)
+            elapsed = median_time(lambda: rebuild(figure, dates, scores, totals), args.runs)
+            print(f"{count:>8} {'rebuild':>14} {elapsed * 1000:>10.1f} {count:>7}")
+
+        elapsed = median_time(lambda: chart_first(args.width, dates, scores, totals), args.runs)
+        drawn = chart_first(args.width, dates, scores, totals)
+        print(f"{count:>8} {'chart first':>14} {elapsed * 1000:>10.1f} {drawn:>7}")
+
+        # The oldest page of sessions arriving on a chart that already holds the rest
+        split = min(PAGE_SIZE, count // 2)
+        chart = ProgressChart(new_figure(args.width))
+        chart.add_sessions(dates[split:], scores[split:], totals[split:])
+        page = (dates[:split], scores[:split], totals[:split])
+        base = (chart.xs, chart.scores, chart.totals)
+
+        def update():
+            chart.xs, chart.scores, chart.totals = list(base[0]), list(base[1]), list(base[2])
+            chart.add_sessions(*page)
+            chart.render()
+            chart.figure.canvas.draw()
+
+        elapsed = median_time(update, args.runs)
+        print(f"{count:>8} {'chart update':>14} {elapsed * 1000:>10.1f} {len(chart.visible_indices()):>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Latency of /progress/summary versus aggregating every /progress page, for one heavy user.
+
+Usage: python benchmarks/bench_progress_summary.py [--sessions 50000] [--days 730] [--runs 5]
+
+The API runs in-process against the SQLite stand-in (db_standin.py). One user
+gets --sessions quiz sessions spread over --days days, inserted through
+/results/batch so the rollups are maintained exactly as in production. The
+"raw" method pages through /progress and computes the daily buckets on the
+client, which is what plotting every session used to need; the summary
+methods read the precomputed rollups. Totals from both are checked to agree.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import api
+import db_standin
+
+
+def seed(client, sessions, days):
+    username = f"bench-{uuid.uuid4().hex[:8]}"
+    client.post("/register", json={"username": username, "password": "bench-password"})
+    user_id = client.post("/login", json={"username": username, "password": "bench-password"}).get_json()["user_id"]
+
+    start = datetime.now() - timedelta(days=days)
+    dates = sorted(start + timedelta(seconds=random.randrange(days * 86400)) for _ in range(sessions))
+    batch = []
+    for index, date in enumerate(dates):
+        total = random.choice((5, 10))
+        batch.append({
+            "user_id": user_id,
+            "extracted_text": f"Benchmark session {index}.",
+            "score": random.randint(0, total),
+            "total_questions": total,
+            "date": date.isoformat(" ", "seconds"),
+            "questions": [{"question": "Benchmark _______.", "correct_answer": "blank",
+                           "options": ["blank", "gap"], "user_answer": "blank"}],
+        })
+    for offset in range(0, len(batch), api.RESULTS_BATCH_MAX):
+        response = client.post("/results/batch", json={"sessions": batch[offset:offset + api.RESULTS_BATCH_MAX]})
+        assert response.status_code == 201, response.get_json()
+    return user_id
+
+
+def raw_daily(client, user_id):
+    """Every session through /progress, bucketed per day client-side"""
+    buckets = {}
+    size = 0
+    params = {"limit": api.MAX_PAGE_SIZE}
+    while True:
+        response = client.get(f"/progress/{user_id}", query_string=params)
+        size += len(response.data)
+        for row in response.get_json():
+            day = datetime.strptime(row["date"], "%a, %d %b %Y %H:%M:%S %Z").date()
+            attempts, score_sum, total_sum = buckets.get(day, (0, 0, 0))
+            buckets[day] = (attempts + 1, score_sum + row["score"], total_sum + row["total_questions"])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params["cursor"] = cursor
+    attempts = sum(b[0] for b in buckets.values())
+    accuracy = sum(b[1] for b in buckets.values()) / sum(b[2] for b in buckets.values())
+    return (attempts, accuracy), size
+
+
+def summary(client, user_id, period):
+    response = client.get(f"/progress/summary/{user_id}", query_string={"period": period})
+    totals = response.get_json()["totals"]
+    return (totals["attempts"], totals["accuracy"]), len(response.data)
+
+
+def measure(func, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result, size = func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_standin.install(api, os.path.join(directory, "bench.db"))
+        client = api.app.test_client()
+
+        started = time.perf_counter()
+        user_id = seed(client, args.sessions, args.days)
+        print(f"seeded {args.sessions} sessions over {args.days} days in {time.perf_counter() - started:.1f}s")
+
+        methods = [
+            ("raw /progress pages", lambda: raw_daily(client, user_id)),
+            ("summary day", lambda: summary(client, user_id, "day")),
+            ("summary week", lambda: summary(client, user_id, "week")),
+        ]
+        print(f"{'method':>20} {'median ms':>10} {'response KB':>12} {'attempts':>9} {'accuracy':>9}")
+        for name, func in methods:
+            elapsed, (attempts, accuracy), size = measure(func, args.runs)
+            print(f"{name:>20} {elapsed * 1000:>10.1f} {size / 1024:>12.1f} {attempts:>9} {accuracy:>9.4f}")
+            assert attempts == args.sessions, f"{name} counted {attempts} sessions"
+
+        # Write-side cost: a single /results now also upserts two rollup rows
+        timings = []
+        for index in range(200):
+            session = {"user_id": user_id, "extracted_text": "Benchmark.", "score": 3, "total_questions": 5,
+                       "questions": [{"question": "Benchmark _______.", "correct_answer": "blank"}]}
+            started = time.perf_counter()
+            client.post("/results", json=session)
+            timings.append(time.perf_counter() - started)
+        print(f"POST /results with rollups: median {statistics.median(timings) * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Write throughput of /results versus /results/batch, in rows per second.
+
+Usage: RDS_HOST=127.0.0.1 RDS_USER=... RDS_PASSWORD=... RDS_DB=textquiz_bench \\
+       python benchmarks/bench_results_insert.py --user-id 1 [--sessions 500] [--questions 10]
+
+This inserts real rows, so point the RDS_* variables at a local or scratch
+MySQL database that has the TextQuiz schema loaded. Rows counted are one
+quiz_results row plus one quiz_questions row per question.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+
+def make_session(user_id, index, num_questions):
+    return {
+        "user_id": user_id,
+        "extracted_text": f"Benchmark session {index}. " * 20,
+        "score": index % (num_questions + 1),
+        "total_questions": num_questions,
+        "questions": [
+            {
+                "question": f"Benchmark question {index}.{q} with a _______ in it.",
+                "correct_answer": "blank",
+                "options": ["blank", "space", "gap", "hole"],
+                "user_answer": "blank" if q % 2 else "gap",
+            }
+            for q in range(num_questions)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    from api import app
+    client = app.test_client()
+    sessions = [make_session(args.user_id, i, args.questions) for i in range(args.sessions)]
+    rows = args.sessions * (1 + args.questions)
+
+    started = time.perf_counter()
+    for session in sessions:
+        response = client.post("/results", json=session)
+        assert response.status_code == 201, response.get_json()
+    single = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for start in range(0, len(sessions), args.batch_size):
+        response = client.post("/results/batch", json={"sessions": sessions[start:start + args.batch_size]})
+        assert response.status_code == 201, response.get_json()
+    batched = time.perf_counter() - started
+
+    print(f"{'path':>24} {'seconds':>10} {'rows/sec':>10}")
+    print(f"{'/results':>24} {single:>10.2f} {rows / single:>10.0f}")
+    print(f"{f'/results/batch x{args.batch_size}':>24} {batched:>10.2f} {rows / batched:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
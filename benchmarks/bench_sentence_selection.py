@@ -0,0 +1,100 @@
+"""Time and peak memory of key-sentence selection on book-length texts.
+
+Usage: python benchmarks/bench_sentence_selection.py [--runs 3] [--sizes 0.1,1,10] [--k 100]
+
+For each size (in MB of text, sentences from bench_generate_quiz.py) it
+compares the old selection (tokenize everything, random.sample), the scored
+in-memory selection with heap top-k, and the chunked streaming variant, both
+over the in-memory string and reading a file from disk. Peak memory is the
+Python heap above the input text, measured with tracemalloc.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import quiz_generator
+from bench_generate_quiz import synthetic_text
+from nltk_resources import get_sentence_tokenizer
+from quiz_generator import MIN_SENTENCE_WORDS, SCORING_CHUNK_CHARS, extract_key_sentences_streaming
+
+
+def random_selection(text, k):
+    """The previous extract_key_sentences"""
+    sentences = [s for s in get_sentence_tokenizer().tokenize(text) if len(s.split()) > MIN_SENTENCE_WORDS]
+    if len(sentences) <= k:
+        return sentences
+    picked = sorted(random.sample(range(len(sentences)), k))
+    return [sentences[i] for i in picked]
+
+
+def scored_in_memory(text, k):
+    threshold = quiz_generator.STREAMING_THRESHOLD_CHARS
+    quiz_generator.STREAMING_THRESHOLD_CHARS = float("inf")
+    try:
+        return quiz_generator.extract_key_sentences(text, k)
+    finally:
+        quiz_generator.STREAMING_THRESHOLD_CHARS = threshold
+
+
+def streamed_string(text, k):
+    return extract_key_sentences_streaming(
+        lambda: (text[i:i + SCORING_CHUNK_CHARS] for i in range(0, len(text), SCORING_CHUNK_CHARS)), k)
+
+
+def read_chunks(path):
+    with open(path, encoding="utf-8") as f:
+        while True:
+            chunk = f.read(SCORING_CHUNK_CHARS)
+            if not chunk:
+                return
+            yield chunk
+
+
+def measure(func, runs):
+    timings = []
+    peak = 0
+    for _ in range(runs):
+        tracemalloc.start()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--sizes", default="0.1,1,10")
+    parser.add_argument("--k", type=int, default=100)
+    args = parser.parse_args()
+    get_sentence_tokenizer()  # load outside the measurements
+
+    print(f"{'size MB':>8} {'method':>16} {'median s':>9} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (float(value) for value in args.sizes.split(",")):
+            text = synthetic_text(int(size * 1024 * 1024))
+            path = os.path.join(directory, "book.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            methods = [
+                ("random.sample", lambda: random_selection(text, args.k)),
+                ("scored", lambda: scored_in_memory(text, args.k)),
+                ("streamed", lambda: streamed_string(text, args.k)),
+                ("streamed file", lambda: extract_key_sentences_streaming(lambda: read_chunks(path), args.k)),
+            ]
+            for name, func in methods:
+                elapsed, peak = measure(func, args.runs)
+                print(f"{size:>8g} {name:>16} {elapsed:>9.2f} {peak / 2 ** 20:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Peak memory and transfer time of base64 JSON versus streamed image uploads.
+
+Usage: python benchmarks/bench_upload.py [--sizes 1,5,20] [--url http://127.0.0.1:5000]
+
+For each size (in MB) a valid PNG is generated and padded with trailing
+bytes, which Pillow ignores. Without --url both routes are driven through
+Flask's test client with OCR replaced by a no-op, and the peak Python heap
+(tracemalloc) while handling one upload is reported. With --url the same
+files are sent to a running server over HTTP and the median round-trip time
+is reported instead; that includes OCR, so use a small --runs.
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from PIL import Image, ImageDraw
+
+
+def make_image_file(directory, size_mb):
+    image = Image.new("L", (800, 200), 255)
+    ImageDraw.Draw(image).text((20, 80), "The water cycle moves water around the earth.", fill=0)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    data = buffer.getvalue()
+    path = os.path.join(directory, f"upload-{size_mb}mb.png")
+    with open(path, "wb") as f:
+        f.write(data)
+        f.write(b"\0" * max(0, size_mb * 1024 * 1024 - len(data)))
+    return path
+
+
+def base64_payload(path):
+    with open(path, "rb") as f:
+        return json.dumps({"image": base64.b64encode(f.read()).decode("utf-8"), "preprocess": False}).encode("utf-8")
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_local(paths):
+    import api
+    api.ocr_pool.image_to_string = lambda image_source, preprocess=None: ""
+    client = api.app.test_client()
+
+    print(f"{'size':>6} {'base64 peak MB':>15} {'stream peak MB':>15}")
+    for size_mb, path in paths:
+        payload = base64_payload(path)
+
+        def post_base64():
+            response = client.post("/process_image", data=payload, content_type="application/json")
+            assert response.status_code == 200, response.get_data(as_text=True)
+
+        def post_stream():
+            with open(path, "rb") as f:
+                response = client.post("/process_image/upload?preprocess=0", input_stream=f,
+                                       content_type="application/octet-stream",
+                                       headers={"Content-Length": str(os.path.getsize(path))})
+            assert response.status_code == 200, response.get_data(as_text=True)
+
+        base64_peak = peak_memory(post_base64)
+        stream_peak = peak_memory(post_stream)
+        print(f"{size_mb:>4}MB {base64_peak / 2 ** 20:>15.1f} {stream_peak / 2 ** 20:>15.1f}")
+
+
+def measure_remote(paths, url, runs):
+    import requests
+
+    session = requests.Session()
+    print(f"{'size':>6} {'base64 s':>9} {'stream s':>9}")
+    for size_mb, path in paths:
+        timings = {"base64": [], "stream": []}
+        for _ in range(runs):
+            started = time.perf_counter()
+            # Encoding is part of the cost the client used to pay
+            session.post(f"{url}/process_image", data=base64_payload(path),
+                         headers={"Content-Type": "application/json"}).raise_for_status()
+            timings["base64"].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            with open(path, "rb") as f:
+                session.post(f"{url}/process_image/upload?preprocess=0", data=f,
+                             headers={"Content-Type": "application/octet-stream"}).raise_for_status()
+            timings["stream"].append(time.perf_counter() - started)
+        print(f"{size_mb:>4}MB {statistics.median(timings['base64']):>9.2f} "
+              f"{statistics.median(timings['stream']):>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1,5,20")
+    parser.add_argument("--url")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [(int(size), make_image_file(directory, int(size))) for size in args.sizes.split(",")]
+        if args.url:
+            measure_remote(paths, args.url.rstrip("/"), args.runs)
+        else:
+            measure_local(paths)
+
+
+if __name__ == '__main__':
+    main()
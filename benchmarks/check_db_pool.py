@@ -0,0 +1,147 @@
+"""Checks for db_pool.ConnectionPool against the SQLite stand-in.
+
+Usage: python benchmarks/check_db_pool.py
+
+Runs without MySQL or Flask. Covers the behaviour routes depend on: a
+released connection carries no open transaction (so a pooled connection
+sees rows committed after its first use), uncommitted work is rolled back,
+the pool never opens more than ``maxsize`` connections, checkouts time out
+with PoolTimeout and count their wait, and connections failing their health
+check are replaced. Exits non-zero on the first failure.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import db_standin
+from db_pool import ConnectionPool, PoolTimeout
+
+
+def count_users(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) AS n FROM users")
+        return cursor.fetchone()["n"]
+
+
+def add_user(path, username):
+    conn = db_standin.StandInConnection(path)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", (username, "x"))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def check_fresh_snapshot(path):
+    pool = ConnectionPool(lambda: db_standin.StandInConnection(path), maxsize=1)
+    with pool.connection() as conn:
+        # A read-only route: opens a read transaction and never commits
+        with conn.cursor() as cursor:
+            cursor.execute("BEGIN")
+        before = count_users(conn)
+    add_user(path, "snapshot-check")
+    with pool.connection() as conn:
+        after = count_users(conn)
+    assert after == before + 1, f"pooled connection kept its old snapshot ({before} -> {after} users)"
+    pool.close()
+
+
+def check_uncommitted_rolled_back(path):
+    pool = ConnectionPool(lambda: db_standin.StandInConnection(path), maxsize=1)
+    with pool.connection() as conn:
+        before = count_users(conn)
+        with conn.cursor() as cursor:
+            cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", ("uncommitted", "x"))
+    with pool.connection() as conn:
+        assert count_users(conn) == before, "uncommitted insert survived the release"
+    try:
+        with pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", ("raised", "x"))
+            raise ValueError("route failed")
+    except ValueError:
+        pass
+    with pool.connection() as conn:
+        assert count_users(conn) == before, "insert from a failed block survived the release"
+    pool.close()
+
+
+def check_bounded(path, maxsize=3, threads=12):
+    pool = ConnectionPool(lambda: db_standin.StandInConnection(path), maxsize=maxsize, timeout=10)
+    peak = [0]
+    in_use = [0]
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(20):
+            with pool.connection() as conn:
+                with lock:
+                    in_use[0] += 1
+                    peak[0] = max(peak[0], in_use[0])
+                count_users(conn)
+                time.sleep(0.001)
+                with lock:
+                    in_use[0] -= 1
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    stats = pool.stats()
+    assert peak[0] <= maxsize and stats["created"] <= maxsize, (peak[0], stats)
+    assert stats["checkouts"] == threads * 20, stats
+    assert stats["in_use"] == 0, stats
+    pool.close()
+
+
+def check_timeout(path):
+    pool = ConnectionPool(lambda: db_standin.StandInConnection(path), maxsize=1, timeout=0.2)
+    with pool.connection():
+        started = time.monotonic()
+        try:
+            with pool.connection():
+                raise AssertionError("second checkout should have timed out")
+        except PoolTimeout:
+            pass
+        waited = time.monotonic() - started
+    stats = pool.stats()
+    assert stats["timeouts"] == 1 and stats["waits"] == 1, stats
+    assert stats["wait_time"] >= 0.15 and abs(stats["wait_time"] - waited) < 0.1, (stats, waited)
+    pool.close()
+
+
+def check_health_check(path):
+    def ping(conn):
+        if getattr(conn, "dead", False):
+            raise ConnectionError("gone away")
+        count_users(conn)
+
+    pool = ConnectionPool(lambda: db_standin.StandInConnection(path), maxsize=1, ping=ping)
+    with pool.connection() as conn:
+        conn.dead = True
+    with pool.connection() as conn:
+        assert not getattr(conn, "dead", False), "dead connection was handed out again"
+    stats = pool.stats()
+    assert stats["created"] == 2 and stats["discarded"] == 1, stats
+    pool.close()
+
+
+def main():
+    checks = [check_fresh_snapshot, check_uncommitted_rolled_back, check_bounded, check_timeout, check_health_check]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pool.db")
+        db_standin.create_schema(path)
+        for check in checks:
+            check(path)
+            print(f"ok  {check.__name__}")
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
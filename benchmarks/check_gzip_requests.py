@@ -0,0 +1,74 @@
+"""Gzip-encoded request bodies through the Werkzeug development server.
+
+Usage: python benchmarks/check_gzip_requests.py
+
+Starts api.app with werkzeug's server (what `python api.py` runs) on a free
+port against the SQLite stand-in (db_standin.py), then sends gzip bodies the
+way ApiClient does over one keep-alive session: a /results save with several
+KB of OCR text, twice in a row, plus a corrupt body (400) and one that
+inflates past MAX_DECOMPRESSED_BYTES (413). Every request has a short
+timeout, so a server that keeps reading the socket for another gzip member
+fails the check instead of hanging it.
+"""
+import gzip
+import json
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import requests
+from werkzeug.serving import make_server
+
+import api as api_module
+import db_standin
+
+TIMEOUT = 5
+
+
+def post_gzip(session, url, payload=None, raw=None):
+    body = raw if raw is not None else gzip.compress(json.dumps(payload).encode("utf-8"), 5)
+    return session.post(url, data=body, timeout=TIMEOUT,
+                        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        db_standin.install(api_module, os.path.join(directory, "gzip.db"))
+        server = make_server("127.0.0.1", 0, api_module.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}"
+        session = requests.Session()
+        try:
+            response = post_gzip(session, f"{url}/register", {"username": "gzip-check", "password": "gzip-check"})
+            assert response.status_code == 201, response.text
+            user_id = session.post(f"{url}/login", json={"username": "gzip-check", "password": "gzip-check"},
+                                   timeout=TIMEOUT).json()["user_id"]
+
+            text = "Photosynthesis converts light energy into chemical energy in plants. " * 100
+            for attempt in range(2):
+                response = post_gzip(session, f"{url}/results", {
+                    "user_id": user_id, "extracted_text": text, "score": 1, "total_questions": 1,
+                    "questions": [{"question": "Light _______.", "correct_answer": "energy",
+                                   "options": ["energy", "water"], "user_answer": "energy"}]})
+                assert response.status_code == 201, (attempt, response.status_code, response.text)
+            print("ok  gzip bodies over a keep-alive connection")
+
+            response = post_gzip(session, f"{url}/results", raw=b"\x1f\x8b not really gzip")
+            assert response.status_code == 400, response.status_code
+            print("ok  corrupt gzip body -> 400")
+
+            api_module.MAX_DECOMPRESSED_BYTES = 1024
+            response = post_gzip(session, f"{url}/results", {"extracted_text": "x" * 10_000})
+            assert response.status_code == 413, response.status_code
+            print("ok  oversized gzip body -> 413")
+        finally:
+            session.close()
+            server.shutdown()
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""SQLite stand-in for the MySQL database, used by the load test.
+
+It speaks just enough of PyMySQL's DictCursor interface for api.py's queries:
+``%s`` placeholders, dict rows, ``lastrowid``, cursors usable as context
+managers, DATETIME and DATE columns returned as datetime and date objects,
+MySQL's LEFT(), INSERT IGNORE and ON DUPLICATE KEY UPDATE.
+Numbers measured against it show the API's own overhead, not MySQL's.
+"""
+import os
+import re
+import sqlite3
+import sys
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from db_pool import ConnectionPool
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS users ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL UNIQUE, password TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS quiz_results ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, extracted_text TEXT NOT NULL, "
+    "score INTEGER NOT NULL, total_questions INTEGER NOT NULL, date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP)",
+    "CREATE INDEX IF NOT EXISTS idx_quiz_results_user_date ON quiz_results (user_id, date)",
+    "CREATE INDEX IF NOT EXISTS idx_quiz_results_user_score ON quiz_results (user_id, score)",
+    "CREATE TABLE IF NOT EXISTS quiz_questions ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, quiz_id INTEGER NOT NULL, question TEXT NOT NULL, "
+    "correct_answer TEXT NOT NULL, options TEXT, user_answer TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_quiz_questions_quiz_id ON quiz_questions (quiz_id)",
+    "CREATE TABLE IF NOT EXISTS question_bank ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, fingerprint TEXT NOT NULL, version INTEGER NOT NULL, "
+    "position INTEGER NOT NULL, sentence TEXT NOT NULL, candidates TEXT NOT NULL, "
+    "created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, UNIQUE (fingerprint, version, position))",
+    "CREATE TABLE IF NOT EXISTS progress_rollups ("
+    "user_id INTEGER NOT NULL, period TEXT NOT NULL, bucket DATE NOT NULL, attempts INTEGER NOT NULL, "
+    "score_sum INTEGER NOT NULL, total_sum INTEGER NOT NULL, best_score INTEGER NOT NULL, "
+    "PRIMARY KEY (user_id, period, bucket))",
+]
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+
+class StandInCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    @staticmethod
+    def _translate(sql):
+        # LEFT is a keyword in SQLite, so MySQL's LEFT() maps to a registered function
+        sql = re.sub(r"\bLEFT\(", "left_text(", sql)
+        # Upserts: the conflict target is implied by the table's only unique key, as in MySQL
+        sql = sql.replace("ON DUPLICATE KEY UPDATE", "ON CONFLICT DO UPDATE SET")
+        sql = re.sub(r"\bVALUES\((\w+)\)", r"excluded.\1", sql).replace("GREATEST(", "MAX(")
+        return sql.replace("INSERT IGNORE", "INSERT OR IGNORE").replace("%s", "?")
+
+    def execute(self, sql, params=None):
+        self._cursor.execute(self._translate(sql), tuple(params or ()))
+        return self._cursor.rowcount
+
+    def executemany(self, sql, rows):
+        self._cursor.executemany(self._translate(sql), [tuple(row) for row in rows])
+        return self._cursor.rowcount
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return dict(row) if row is not None else None
+
+    def fetchall(self):
+        return [dict(row) for row in self._cursor.fetchall()]
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+
+class StandInConnection:
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                     detect_types=sqlite3.PARSE_DECLTYPES)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.create_function("left_text", 2, lambda text, length: None if text is None else text[:length])
+
+    def cursor(self):
+        return StandInCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+def create_schema(path):
+    conn = sqlite3.connect(path)
+    try:
+        for statement in SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def install(api_module, path):
+    """Point ``api_module`` (the imported api.py) at a SQLite file instead of MySQL"""
+    create_schema(path)
+    api_module.db_pool = ConnectionPool(
+        lambda: StandInConnection(path),
+        maxsize=api_module.DB_POOL_SIZE,
+        timeout=api_module.DB_POOL_TIMEOUT,
+    )
+    api_module.question_bank.db_pool = api_module.db_pool
@@ -0,0 +1,176 @@
+"""Requests per second and latency percentiles for each API endpoint.
+
+Usage: python benchmarks/load_test.py [--concurrency 16] [--duration 10] [--workers 4]
+       python benchmarks/load_test.py --url http://127.0.0.1:5000 --user-id 1 ...
+
+Without --url the API is started under gunicorn with gunicorn.conf.py (the
+production profile) and the MySQL database replaced by the SQLite stand-in in
+db_standin.py, seeded with one user and --seed-sessions quiz results. Each
+endpoint is then hammered on its own by --concurrency client threads for
+--duration seconds. With --url an already running server is measured
+instead; its database must contain --user-id and the login below.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import requests
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+SAMPLE_TEXT = (
+    "The water cycle describes how water evaporates from the surface of the earth, rises into the "
+    "atmosphere, cools and condenses into clouds, and falls again as precipitation. Rivers carry much "
+    "of this water back to the ocean, while some of it soaks into the ground and becomes groundwater. "
+    "Plants return water to the air through a process called transpiration from their leaves. "
+    "Sunlight provides the energy that drives evaporation from oceans, lakes and rivers. "
+) * 8
+
+
+def session_payload(user_id, index):
+    return {
+        "user_id": user_id,
+        "extracted_text": SAMPLE_TEXT[:400],
+        "score": index % 6,
+        "total_questions": 5,
+        "questions": [
+            {"question": f"Load test question {index}.{q} with a _______.", "correct_answer": "blank",
+             "options": ["blank", "space", "gap", "hole"], "user_answer": "blank"}
+            for q in range(5)
+        ],
+    }
+
+
+def scenarios(user_id, username, password):
+    counter = iter(range(10 ** 9))
+    return [
+        ("POST /login", lambda s, url: s.post(f"{url}/login", json={"username": username, "password": password})),
+        ("GET /history", lambda s, url: s.get(f"{url}/history/{user_id}?limit=50")),
+        ("GET /progress", lambda s, url: s.get(f"{url}/progress/{user_id}")),
+        ("POST /results", lambda s, url: s.post(f"{url}/results", json=session_payload(user_id, next(counter)))),
+        ("POST /generate_quiz", lambda s, url: s.post(f"{url}/generate_quiz",
+                                                      json={"text": SAMPLE_TEXT, "num_questions": 5})),
+        ("GET /metrics", lambda s, url: s.get(f"{url}/metrics")),
+    ]
+
+
+def run_scenario(url, send, concurrency, duration):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        session = requests.Session()
+        local, local_errors = [], 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = send(session, url)
+                ok = response.status_code < 400
+            except requests.RequestException:
+                ok = False
+            local.append(time.perf_counter() - started)
+            local_errors += 0 if ok else 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return latencies, errors[0], elapsed
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(directory, workers):
+    port = free_port()
+    env = dict(os.environ, LOADTEST_DB=os.path.join(directory, "loadtest.db"), APP_ENV="production",
+               GUNICORN_BIND=f"127.0.0.1:{port}", GUNICORN_WORKERS=str(workers),
+               GUNICORN_ACCESS_LOG=os.devnull, LOG_LEVEL="warning")
+    server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+                               "--pythonpath", "benchmarks", "loadtest_app:app"], cwd=ROOT, env=env)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            sys.exit("gunicorn exited during startup")
+        try:
+            requests.get(f"{url}/metrics", timeout=1)
+            return server, url
+        except requests.RequestException:
+            time.sleep(0.25)
+    server.terminate()
+    sys.exit("gunicorn did not start within 60s")
+
+
+def seed(url, sessions):
+    username, password = f"load-{uuid.uuid4().hex[:8]}", "load-test-password"
+    requests.post(f"{url}/register", json={"username": username, "password": password}).raise_for_status()
+    user_id = requests.post(f"{url}/login", json={"username": username, "password": password}).json()["user_id"]
+    batch = [session_payload(user_id, i) for i in range(sessions)]
+    for start in range(0, len(batch), 500):
+        requests.post(f"{url}/results/batch", json={"sessions": batch[start:start + 500]}).raise_for_status()
+    return user_id, username, password
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url")
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn workers when starting the server")
+    parser.add_argument("--seed-sessions", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = None
+        if args.url:
+            url = args.url.rstrip("/")
+            if not (args.user_id and args.username and args.password):
+                parser.error("--url needs --user-id, --username and --password")
+            user_id, username, password = args.user_id, args.username, args.password
+        else:
+            server, url = start_server(directory, args.workers)
+            user_id, username, password = seed(url, args.seed_sessions)
+
+        try:
+            print(f"{'endpoint':<22} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+            for name, send in scenarios(user_id, username, password):
+                latencies, errors, elapsed = run_scenario(url, send, args.concurrency, args.duration)
+                if not latencies:
+                    continue
+                print(f"{name:<22} {len(latencies):>9} {errors:>7} {len(latencies) / elapsed:>9.1f} "
+                      f"{statistics.median(latencies) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f}")
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+"""WSGI app for the load test: wsgi:app with the database swapped for db_standin.
+
+    LOADTEST_DB=/tmp/loadtest.db gunicorn -c gunicorn.conf.py --pythonpath benchmarks loadtest_app:app
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import api
+import db_standin
+from wsgi import app
+
+db_standin.install(api, os.environ["LOADTEST_DB"])
+
+__all__ = ["app"]
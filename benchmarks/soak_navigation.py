@@ -0,0 +1,127 @@
+"""Navigation soak test for the desktop client: widget count and RSS must stay flat.
+
+Usage: python benchmarks/soak_navigation.py [--cycles 1000] [--warm-up 20] [--max-rss-growth-mb 20]
+
+Starts the API in-process on a free port with the SQLite stand-in
+(db_standin.py), seeds one user with a few sessions, then drives
+MainApplication headless (QT_QPA_PLATFORM=offscreen) through --cycles rounds
+of main menu -> history -> quiz details -> history -> main menu -> progress
+-> main menu -> image upload -> main menu, letting every API response and
+deferred delete land after each step. Live QWidget count and RSS are sampled after --warm-up cycles and
+at the end; the script exits non-zero if the widget count changed or RSS
+grew by more than --max-rss-growth-mb.
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import requests
+from PyQt6.QtCore import QCoreApplication, QEvent
+from PyQt6.QtWidgets import QApplication
+from werkzeug.serving import make_server
+
+import api as api_module
+import db_standin
+import main
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak rather than current RSS, which still shows growth
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def start_api(directory):
+    db_standin.install(api_module, os.path.join(directory, "soak.db"))
+    server = make_server("127.0.0.1", 0, api_module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def seed(url, sessions=50):
+    username = f"soak-{uuid.uuid4().hex[:8]}"
+    requests.post(f"{url}/register", json={"username": username, "password": "soak-password"}).raise_for_status()
+    user_id = requests.post(f"{url}/login", json={"username": username, "password": "soak-password"}).json()["user_id"]
+    batch = [{"user_id": user_id, "extracted_text": f"Soak session {i}.", "score": i % 6, "total_questions": 5,
+              "questions": [{"question": "Soak _______.", "correct_answer": "blank",
+                             "options": ["blank", "gap"], "user_answer": "blank"}]}
+             for i in range(sessions)]
+    quiz_ids = requests.post(f"{url}/results/batch", json={"sessions": batch}).json()["quiz_ids"]
+    return user_id, username, quiz_ids[0]
+
+
+def settle(app):
+    """Deliver every finished API call and run pending deleteLater()s"""
+    main.api.pool.waitForDone(30_000)
+    app.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    app.processEvents()
+
+
+def main_loop():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=1000)
+    parser.add_argument("--warm-up", type=int, default=20)
+    parser.add_argument("--max-rss-growth-mb", type=float, default=20.0)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as directory:
+        server, url = start_api(directory)
+        main.api.base_url = url
+        user_id, username, quiz_id = seed(url)
+
+        window = main.MainApplication()
+        window.show()
+        window.handle_login(user_id, username)
+        steps = [window.view_history, lambda: window.view_quiz_details(quiz_id), window.back_to_history,
+                 window.back_to_main_menu, window.view_progress, window.back_to_main_menu,
+                 window.start_new_quiz, window.back_to_main_menu]
+
+        started = time.perf_counter()
+        baseline = None
+        for cycle in range(1, args.cycles + 1):
+            for step in steps:
+                step()
+                settle(app)
+            if cycle == args.warm_up:
+                baseline = (len(QApplication.allWidgets()), rss_mb(), window.pages.live_pages())
+            if cycle % 100 == 0:
+                print(f"cycle {cycle}: {len(QApplication.allWidgets())} widgets, "
+                      f"{window.pages.live_pages()} pages, {rss_mb():.1f} MB RSS")
+        elapsed = time.perf_counter() - started
+
+        widgets, rss, pages = len(QApplication.allWidgets()), rss_mb(), window.pages.live_pages()
+        window.close()
+        server.shutdown()
+
+    print(f"{args.cycles} cycles in {elapsed:.1f}s")
+    print(f"after warm-up: {baseline[0]} widgets, {baseline[2]} pages, {baseline[1]:.1f} MB RSS")
+    print(f"at the end:    {widgets} widgets, {pages} pages, {rss:.1f} MB RSS")
+    failures = []
+    if widgets != baseline[0]:
+        failures.append(f"widget count changed from {baseline[0]} to {widgets}")
+    if rss - baseline[1] > args.max_rss_growth_mb:
+        failures.append(f"RSS grew by {rss - baseline[1]:.1f} MB")
+    if failures:
+        sys.exit("FAIL: " + "; ".join(failures))
+    print("OK")
+
+
+if __name__ == '__main__':
+    main_loop()
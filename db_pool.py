@@ -0,0 +1,215 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+def default_ping(conn):
+    """Check that a connection is still usable.
+
+    PyMySQL connections expose ``ping``; anything else (e.g. a sqlite3
+    stand-in) is probed with a trivial query.
+    """
+    ping = getattr(conn, 'ping', None)
+    if ping is not None:
+        ping(reconnect=False)
+    else:
+        conn.cursor().execute("SELECT 1")
+
+
+class _PooledConnection:
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of DB-API connections.
+
+    ``connect`` is any zero-argument callable returning a new connection, so the
+    pool works the same against RDS, a local MySQL or an in-memory sqlite3
+    database. At most ``maxsize`` connections are open at once; callers block up
+    to ``timeout`` seconds waiting for one to be returned.
+
+    Connections are health-checked on checkout with ``ping``, and recycled once
+    they are older than ``max_lifetime`` or have sat idle longer than
+    ``idle_timeout`` seconds.
+    """
+
+    def __init__(self, connect, maxsize=10, timeout=10.0, max_lifetime=3600.0,
+                 idle_timeout=300.0, ping=default_ping):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._connect = connect
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self._ping = ping
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "timeouts": 0,
+            "created": 0,
+            "discarded": 0,
+        }
+
+    def _expired(self, pooled, now):
+        if self.max_lifetime is not None and now - pooled.created_at > self.max_lifetime:
+            return True
+        if self.idle_timeout is not None and now - pooled.last_used > self.idle_timeout:
+            return True
+        return False
+
+    def _discard(self, pooled):
+        # Caller must hold self._cond; closing happens outside the lock.
+        self._size -= 1
+        self._stats["discarded"] += 1
+        self._cond.notify()
+        return pooled.conn
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            logging.debug("Error closing pooled connection", exc_info=True)
+
+    def _evict_idle(self, now):
+        """Drop expired idle connections. Caller must hold self._cond."""
+        stale = []
+        for pooled in list(self._idle):
+            if self._expired(pooled, now):
+                self._idle.remove(pooled)
+                stale.append(self._discard(pooled))
+        return stale
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        wait_started = None
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                stale = self._evict_idle(time.monotonic())
+                pooled = None
+                create = False
+                while pooled is None and not create:
+                    if self._idle:
+                        pooled = self._idle.pop()
+                    elif self._size < self.maxsize:
+                        self._size += 1
+                        create = True
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._stats["timeouts"] += 1
+                            if waited:
+                                self._stats["wait_time"] += time.monotonic() - wait_started
+                            raise PoolTimeout(
+                                f"Timed out after {self.timeout}s waiting for a database connection")
+                        if not waited:
+                            waited = True
+                            wait_started = time.monotonic()
+                            self._stats["waits"] += 1
+                        self._cond.wait(remaining)
+                if waited:
+                    self._stats["wait_time"] += time.monotonic() - wait_started
+                    waited = False
+                self._stats["checkouts"] += 1
+
+            for conn in stale:
+                self._close_quietly(conn)
+
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._stats["checkouts"] -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._stats["created"] += 1
+                return _PooledConnection(conn)
+
+            try:
+                self._ping(pooled.conn)
+                return pooled
+            except Exception:
+                logging.info("Discarding pooled connection that failed its health check")
+                with self._cond:
+                    self._stats["checkouts"] -= 1
+                    conn = self._discard(pooled)
+                self._close_quietly(conn)
+
+    def _release(self, pooled, broken=False):
+        now = time.monotonic()
+        with self._cond:
+            if broken or self._closed or self._expired(pooled, now):
+                conn = self._discard(pooled)
+            else:
+                pooled.last_used = now
+                self._idle.append(pooled)
+                self._cond.notify()
+                return
+        self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of a ``with`` block.
+
+        Whatever the block left uncommitted is rolled back when it ends, so
+        the next caller starts a fresh transaction rather than inheriting an
+        open one (and, under REPEATABLE READ, its stale snapshot).
+        Connections that fail to roll back are closed instead of being
+        returned to the pool.
+        """
+        pooled = self._acquire()
+        try:
+            yield pooled.conn
+        finally:
+            broken = False
+            try:
+                pooled.conn.rollback()
+            except Exception:
+                broken = True
+            self._release(pooled, broken=broken)
+
+    def close(self):
+        """Close idle connections and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle = [self._discard(pooled) for pooled in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "maxsize": self.maxsize,
+            })
+        stats["avg_wait_time"] = stats["wait_time"] / stats["waits"] if stats["waits"] else 0.0
+        return stats
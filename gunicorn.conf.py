@@ -0,0 +1,45 @@
+"""gunicorn settings for serving api.py in production.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Everything can be overridden with GUNICORN_* environment variables. Send
+HUP to restart workers gracefully with the same code, or USR2 followed by
+TERM to the old master to deploy new code with no dropped connections
+(the app is preloaded, so HUP alone does not pick up code changes).
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+
+# Pre-fork workers, each serving requests on a few threads; NLTK models are
+# loaded once in the master (preload_app) and shared copy-on-write
+workers = int(os.environ.get("GUNICORN_WORKERS", str(max(2, multiprocessing.cpu_count()))))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+preload_app = True
+
+# Worker heartbeat, not a request timeout: with gthread the worker keeps
+# notifying the master while its threads serve requests, so a slow request is
+# never cut off by this. Only a worker that stops responding altogether is
+# killed and replaced. Request time is bounded by the app's own OCR, quiz job
+# and database pool timeouts
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers periodically to bound memory growth, staggered so they do not all restart together
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+loglevel = os.environ.get("LOG_LEVEL", "info").lower()
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+access_log_format = '%(h)s "%(r)s" %(s)s %(b)s %(M)sms'
+
+
+def worker_exit(server, worker):
+    # Stop this worker's OCR processes and quiz job threads with it
+    from wsgi import ocr_pool, quiz_jobs
+    ocr_pool.shutdown()
+    quiz_jobs.shutdown()
@@ -0,0 +1,122 @@
+"""Table model behind HistoryWindow, filled page by page as the user scrolls.
+
+Rows come from the keyset-paginated /history endpoint through a
+``fetch_page(cursor, sort, descending, on_page, on_error)`` function, which
+must call ``on_page(rows, next_cursor)`` or ``on_error(error)`` later on the
+GUI thread. QTableView asks for more through canFetchMore/fetchMore when it
+scrolls near the end; sorting restarts from the first page of the
+server-side order instead of sorting rows locally.
+"""
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+
+# Header, and the server sort key for sortable columns
+COLUMNS = [
+    ("Date", "date"),
+    ("Score", "score"),
+    ("Text", None),
+]
+
+# Characters of the extracted text shown per row
+PREVIEW_CHARS = 50
+
+
+class HistoryTableModel(QAbstractTableModel):
+    """Quiz sessions as (id, date, score, preview) rows, fetched lazily.
+
+    Rows are stored as tuples of display strings, so 100k sessions cost a
+    few hundred bytes each and no widgets at all.
+    """
+    load_failed = pyqtSignal(object)
+
+    def __init__(self, fetch_page, parent=None):
+        super().__init__(parent)
+        self._fetch_page = fetch_page
+        self._rows = []
+        self._next_cursor = None
+        self._exhausted = True
+        self._loading = False
+        self._sort, self._descending = "date", True
+        # Bumped on every reset so responses for an earlier order are dropped
+        self._generation = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][index.column() + 1]
+        if role == Qt.ItemDataRole.UserRole:
+            return self._rows[index.row()][0]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section][0]
+        return None
+
+    def quiz_id(self, row):
+        return self._rows[row][0]
+
+    def is_sortable(self, column):
+        return COLUMNS[column][1] is not None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        generation = self._generation
+        self._fetch_page(self._next_cursor, self._sort, self._descending,
+                         lambda rows, next_cursor: self._on_page(generation, rows, next_cursor),
+                         lambda error: self._on_error(generation, error))
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if not self.is_sortable(column):
+            return
+        self.reload(COLUMNS[column][1], order == Qt.SortOrder.DescendingOrder)
+
+    def reload(self, sort=None, descending=None):
+        """Drop every row and fetch the first page, optionally in a new order"""
+        if sort is not None:
+            self._sort = sort
+        if descending is not None:
+            self._descending = descending
+        self.beginResetModel()
+        self._rows = []
+        self._next_cursor = None
+        self._exhausted = False
+        self._loading = False
+        self._generation += 1
+        self.endResetModel()
+        self.fetchMore()
+
+    def _on_page(self, generation, results, next_cursor):
+        if generation != self._generation:
+            return
+        self._loading = False
+        self._next_cursor = next_cursor
+        self._exhausted = next_cursor is None
+        if results:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(results) - 1)
+            self._rows.extend(
+                (result["id"], result["date"], f"{result['score']}/{result['total_questions']}",
+                 result["preview"][:PREVIEW_CHARS] + "...")
+                for result in results
+            )
+            self.endInsertRows()
+
+    def _on_error(self, generation, error):
+        if generation != self._generation:
+            return
+        # Stop asking until reload(); the view would otherwise retry on every scroll
+        self._loading = False
+        self._exhausted = True
+        self.load_failed.emit(error)
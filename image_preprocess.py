@@ -0,0 +1,195 @@
+"""Image clean-up applied before OCR.
+
+Tesseract time grows with pixel count and its accuracy drops on skewed,
+unevenly lit phone photos, so images are normalised first: EXIF orientation
+fix, grayscale, downscale until text lines are about ``target_text_height``
+pixels tall, deskew, binarize and crop to the inked area.
+"""
+import numpy as np
+from PIL import Image, ImageOps
+
+DEFAULT_OPTIONS = {
+    "enabled": True,
+    "exif": True,
+    "grayscale": True,
+    # Tesseract works best with text lines roughly 20-40 px tall
+    "target_text_height": 32,
+    # Hard cap used when no text lines can be measured
+    "max_pixels": 6_000_000,
+    "deskew": True,
+    "max_skew": 5.0,
+    "skew_step": 0.5,
+    "binarize": True,
+    "crop": True,
+    "crop_margin": 12,
+}
+
+# Accepted range of each numeric option, so one request cannot make a worker
+# spin far beyond tesseract's own timeout (deskew tries every angle in range)
+OPTION_LIMITS = {
+    "target_text_height": (8, 200),
+    "max_pixels": (100_000, DEFAULT_OPTIONS["max_pixels"]),
+    "max_skew": (0.5, 15.0),
+    "skew_step": (0.1, 5.0),
+    "crop_margin": (0, 200),
+}
+# Most rotations estimate_skew may try per image
+MAX_SKEW_ANGLES = 61
+
+# Longest side of the thumbnail used to measure line height and skew
+ANALYSIS_SIZE = 1000
+
+
+def preprocess_options(overrides=None):
+    """Merge per-request overrides into DEFAULT_OPTIONS; raises ValueError on bad input"""
+    options = dict(DEFAULT_OPTIONS)
+    if overrides is None:
+        return options
+    if isinstance(overrides, bool):
+        options["enabled"] = overrides
+        return options
+    if not isinstance(overrides, dict):
+        raise ValueError("preprocess must be an object or a boolean")
+    unknown = set(overrides) - set(DEFAULT_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown preprocess options: {', '.join(sorted(unknown))}")
+    for key, value in overrides.items():
+        default = DEFAULT_OPTIONS[key]
+        if isinstance(default, bool):
+            if not isinstance(value, (bool, int)):
+                raise ValueError(f"Invalid value for preprocess option '{key}'")
+            options[key] = bool(value)
+            continue
+        try:
+            options[key] = type(default)(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid value for preprocess option '{key}'")
+        low, high = OPTION_LIMITS[key]
+        if not low <= options[key] <= high:
+            raise ValueError(f"Preprocess option '{key}' must be between {low} and {high}")
+    if 2 * options["max_skew"] / options["skew_step"] + 1 > MAX_SKEW_ANGLES:
+        raise ValueError(f"max_skew / skew_step allows at most {MAX_SKEW_ANGLES} deskew angles")
+    return options
+
+
+def preprocess_options_from_args(args):
+    """Build options from query-string values such as ``?preprocess=0&deskew=false``"""
+    overrides = {}
+    for key, value in args.items():
+        if key == "preprocess":
+            key = "enabled"
+        if key not in DEFAULT_OPTIONS:
+            continue
+        if isinstance(DEFAULT_OPTIONS[key], bool):
+            lowered = value.strip().lower()
+            if lowered not in ("1", "0", "true", "false", "yes", "no", "on", "off"):
+                raise ValueError(f"Invalid value for preprocess option '{key}'")
+            overrides[key] = lowered in ("1", "true", "yes", "on")
+        else:
+            overrides[key] = value
+    return preprocess_options(overrides)
+
+
+def otsu_threshold(pixels):
+    """Otsu's threshold for an array of 8-bit gray levels; ink is ``<= threshold``"""
+    histogram = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+    total = histogram.sum()
+    if total == 0:
+        return 128
+    levels = np.arange(256)
+    weight_background = np.cumsum(histogram)
+    weight_foreground = total - weight_background
+    cumulative_mean = np.cumsum(histogram * levels)
+    mean_background = cumulative_mean / np.maximum(weight_background, 1)
+    mean_foreground = (cumulative_mean[-1] - cumulative_mean) / np.maximum(weight_foreground, 1)
+    between_variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+    return int(np.argmax(between_variance))
+
+
+def ink_mask(gray):
+    """Boolean array that is True where a grayscale image has dark (ink) pixels"""
+    pixels = np.asarray(gray, dtype=np.uint8)
+    return pixels <= otsu_threshold(pixels)
+
+
+def estimate_text_height(mask):
+    """Median height in pixels of the text lines in an ink mask, or None"""
+    row_ink = mask.mean(axis=1)
+    is_text_row = row_ink > max(0.01, row_ink.mean() * 0.3)
+    heights = []
+    run = 0
+    for value in is_text_row:
+        if value:
+            run += 1
+        elif run:
+            heights.append(run)
+            run = 0
+    if run:
+        heights.append(run)
+    heights = [h for h in heights if h >= 2]
+    if len(heights) < 2:
+        return None
+    return float(np.median(heights))
+
+
+def estimate_skew(mask, max_skew, step):
+    """Angle in degrees that makes text rows horizontal, by projection profile"""
+    image = Image.fromarray((mask * 255).astype(np.uint8))
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-max_skew, max_skew + step / 2, step):
+        rotated = np.asarray(image.rotate(float(angle), resample=Image.Resampling.NEAREST, fillcolor=0))
+        # Aligned text gives sharp alternation between inked and empty rows
+        score = float(np.var(rotated.sum(axis=1, dtype=np.float64)))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+def preprocess_image(image, options=None):
+    """Return a cleaned-up copy of ``image`` ready for tesseract"""
+    options = options or DEFAULT_OPTIONS
+    if not options.get("enabled", True):
+        return image
+
+    if options["exif"]:
+        image = ImageOps.exif_transpose(image)
+    if options["grayscale"] or options["binarize"] or options["deskew"]:
+        image = image.convert("L")
+
+    # Measure line height and skew on a thumbnail; full-size analysis is wasted work
+    thumbnail = image.convert("L")
+    thumbnail.thumbnail((ANALYSIS_SIZE, ANALYSIS_SIZE))
+    thumb_scale = image.width / thumbnail.width
+    mask = ink_mask(thumbnail)
+
+    scale = 1.0
+    text_height = estimate_text_height(mask)
+    if text_height:
+        scale = min(1.0, options["target_text_height"] / (text_height * thumb_scale))
+    pixels = image.width * image.height * scale * scale
+    if pixels > options["max_pixels"]:
+        scale *= (options["max_pixels"] / pixels) ** 0.5
+    if scale < 1.0:
+        image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                             Image.Resampling.LANCZOS)
+
+    if options["deskew"]:
+        angle = estimate_skew(mask, options["max_skew"], options["skew_step"])
+        if angle:
+            fill = 255 if image.mode == "L" else (255,) * len(image.getbands())
+            image = image.rotate(angle, resample=Image.Resampling.BICUBIC, expand=True, fillcolor=fill)
+
+    if options["binarize"]:
+        threshold = otsu_threshold(np.asarray(image, dtype=np.uint8))
+        image = image.point(lambda value: 255 if value > threshold else 0)
+
+    if options["crop"]:
+        gray = image if image.mode == "L" else image.convert("L")
+        rows, cols = np.nonzero(ink_mask(gray))
+        if rows.size:
+            margin = options["crop_margin"]
+            box = (max(0, cols.min() - margin), max(0, rows.min() - margin),
+                   min(image.width, cols.max() + margin + 1), min(image.height, rows.max() + margin + 1))
+            image = image.crop(box)
+
+    return image
@@ -0,0 +1,71 @@
+"""Client-side OCR with the locally installed tesseract.
+
+Used by the desktop app so images can be read on the user's machine and only
+the extracted text is sent to the server; callers fall back to the
+/process_image/upload endpoint when no tesseract binary is found or local
+OCR fails.
+"""
+import functools
+import os
+import shutil
+import sys
+
+# Checked in order after $TESSERACT_CMD and the PATH
+KNOWN_LOCATIONS = [
+    r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+    r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
+    "/opt/homebrew/bin/tesseract",
+    "/usr/local/bin/tesseract",
+    "/usr/bin/tesseract",
+]
+
+# Seconds before a local tesseract run is killed
+LOCAL_OCR_TIMEOUT = 60
+
+
+@functools.lru_cache(maxsize=None)
+def find_tesseract():
+    """Path of a usable tesseract executable, or None"""
+    configured = os.environ.get("TESSERACT_CMD")
+    candidates = [configured] if configured else []
+    candidates.append(shutil.which("tesseract"))
+    # A PyInstaller build may ship tesseract next to the app
+    bundle_dir = getattr(sys, "_MEIPASS", None)
+    if bundle_dir:
+        candidates.append(os.path.join(bundle_dir, "tesseract", "tesseract.exe" if os.name == "nt" else "tesseract"))
+    candidates.extend(KNOWN_LOCATIONS)
+    for path in candidates:
+        if path and os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+    return None
+
+
+def is_available():
+    return find_tesseract() is not None
+
+
+def image_to_string(image_path, preprocess=True, timeout=LOCAL_OCR_TIMEOUT):
+    """OCR the image at ``image_path`` with the local tesseract.
+
+    ``preprocess`` takes the same values as the server's option (a bool or an
+    options dict), so local and remote extraction give comparable text.
+    Raises RuntimeError if tesseract is missing, fails or times out.
+    """
+    import pytesseract
+    from PIL import Image
+    from image_preprocess import preprocess_image, preprocess_options
+
+    tesseract_cmd = find_tesseract()
+    if tesseract_cmd is None:
+        raise RuntimeError("tesseract is not installed")
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    options = preprocess_options(preprocess)
+    with Image.open(image_path) as image:
+        image.load()
+        if options["enabled"]:
+            image = preprocess_image(image, options)
+        try:
+            return pytesseract.image_to_string(image, timeout=timeout)
+        except pytesseract.TesseractError as e:
+            raise RuntimeError(f"tesseract failed: {e.message}")
@@ -1,21 +1,59 @@
 import sys
+import logging
 import os
 import re
-import pytesseract
-import requests
-import base64
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QLineEdit, QPushButton, QMessageBox, QFileDialog,
                              QRadioButton, QButtonGroup, QProgressBar, QTableWidget,
-                             QTableWidgetItem, QTextEdit, QGroupBox, QGridLayout, QStackedWidget)
+                             QTableWidgetItem, QTextEdit, QGroupBox, QGridLayout, QStackedWidget,
+                             QCheckBox, QTableView, QAbstractItemView, QListView)
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from api_client import ApiClient
+import local_ocr
+from window_manager import WindowManager
+from history_model import HistoryTableModel
+from question_list_model import QuestionListModel
+from quiz_prefetch import QuizPrefetcher, PREFETCH_DEPTH
 
 API_BASE_URL = "http://65.0.99.243:5000"  # Replace <EC2_PUBLIC_IP> with the actual public IP of your EC2 instance
 
+# Files that may hold several pages are always sent to the batch OCR endpoint
+MULTI_PAGE_EXTENSIONS = (".pdf", ".tif", ".tiff")
+
+# Rows requested per page from the paginated /history and /progress endpoints
+HISTORY_PAGE_SIZE = 200
+PROGRESS_PAGE_SIZE = 500
+# Past quizzes shown by QuizDetailsWindow, kept because they never change (quiz id -> /quiz JSON)
+QUIZ_DETAILS_CACHE_SIZE = 20
+quiz_details_cache = OrderedDict()
+
+# Questions per quiz
+QUIZ_LENGTH = 5
+# Continuous practice: quizzes generated ahead of the one being answered
+PRACTICE_PREFETCH_DEPTH = int(os.environ.get("TEXTQUIZ_PREFETCH_DEPTH", PREFETCH_DEPTH))
+
+# Pages of /progress the chart follows (the most recent sessions). Older history is drawn from
+# the daily averages of /progress/summary instead of downloading every session
+PROGRESS_CHART_MAX_PAGES = 4
+
+# All API traffic runs on worker threads so the GUI thread never blocks on I/O
+api = ApiClient(API_BASE_URL)
+
+# Heavy modules the login window does not need. They load on first use, or earlier
+# from warm_up_imports once the first window has painted
+WARM_UP_MODULES = [
+    "requests",
+    "matplotlib.figure",
+    "matplotlib.backends.backend_qtagg",
+    "progress_chart",
+]
+# Milliseconds after the main window is shown before the warm-up starts
+WARM_UP_DELAY_MS = 300
+
 def resource_path(relative_path):
     try:
         base_dir = sys._MEIPASS
@@ -29,30 +67,57 @@ def preprocess_text(text):
     text = re.sub(r'\s+', ' ', text)
     return text.strip()
 
-"""Generate a quiz based on the extracted text"""
-def generate_quiz(text, num_questions=10):
+"""Request a quiz for the extracted text; callbacks run on the GUI thread"""
+def generate_quiz(text, on_success, on_error, num_questions=10, owner=None):
     cleaned_text = preprocess_text(text)
-    try:
-        response = requests.post(f"{API_BASE_URL}/generate_quiz", json={"text": cleaned_text, "num_questions": num_questions}, timeout=20)
-        if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 400:
-            error_message = response.json().get("error", "Invalid request.")
-            QMessageBox.warning(None, "Quiz Generation Error", f"Failed to generate quiz questions: {error_message}")
-            return []
-        elif response.status_code == 500:
-            error_message = response.json().get("error", "Internal server error.")
-            QMessageBox.critical(None, "Server Error", f"Failed to generate quiz questions: {error_message}")
-            return []
-        else:
-            QMessageBox.warning(None, "Quiz Generation Error", f"Unexpected server response: {response.status_code}")
-            return []
-    except requests.exceptions.ConnectTimeout:
-        QMessageBox.critical(None, "Connection Timeout", "The server took too long to respond. Please try again later.")
-        return []
-    except requests.exceptions.RequestException as e:
-        QMessageBox.critical(None, "Connection Error", f"Failed to connect to the server: {str(e)}")
-        return []
+    return api.post("/generate_quiz", json_body={"text": cleaned_text, "num_questions": num_questions},
+                    on_success=on_success, on_error=on_error, owner=owner, idempotent=True)
+
+"""Start a quiz job and stream its NDJSON events (job id, questions, final status)"""
+def submit_quiz_job(text, on_event, on_end, on_error, num_questions=10, owner=None):
+    cleaned_text = preprocess_text(text)
+    return api.post("/quiz_jobs?stream=1", json_body={"text": cleaned_text, "num_questions": num_questions},
+                    on_line=on_event, on_success=on_end, on_error=on_error, owner=owner)
+
+"""Stream a quiz job's NDJSON events, starting after the first ``after`` questions"""
+def stream_quiz_job(job_id, on_event, on_end, on_error, after=0, owner=None):
+    return api.get(f"/quiz_jobs/{job_id}/stream?after={after}", on_line=on_event,
+                   on_success=on_end, on_error=on_error, owner=owner)
+
+"""Tell the server to stop generating questions nobody will read"""
+def cancel_quiz_job(job_id):
+    return api.request("DELETE", f"/quiz_jobs/{job_id}", idempotent=True)
+
+"""Show the right message box for a failed /generate_quiz response"""
+def show_quiz_error(parent, response):
+    if response.status_code == 400:
+        error_message = response.error_message("Invalid request.")
+        QMessageBox.warning(parent, "Quiz Generation Error", f"Failed to generate quiz questions: {error_message}")
+    elif response.status_code == 500:
+        error_message = response.error_message("Internal server error.")
+        QMessageBox.critical(parent, "Server Error", f"Failed to generate quiz questions: {error_message}")
+    else:
+        QMessageBox.warning(parent, "Quiz Generation Error", f"Unexpected server response: {response.status_code}")
+
+"""Import WARM_UP_MODULES on a background thread so later screens open without a stall"""
+def warm_up_imports():
+    def run():
+        for name in WARM_UP_MODULES:
+            try:
+                __import__(name)
+            except Exception:
+                # The screen that needs it will import it again and report the error
+                logging.warning(f"Warm-up import of {name} failed", exc_info=True)
+
+    threading.Thread(target=run, name="warm-up-imports", daemon=True).start()
+
+"""Show the right message box for a request that never got a response"""
+def show_connection_error(parent, error):
+    import requests
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        QMessageBox.critical(parent, "Connection Timeout", "The server took too long to respond. Please try again later.")
+    else:
+        QMessageBox.critical(parent, "Connection Error", f"Failed to connect to the server: {str(error)}")
 
 # Custom Widgets
 """Custom QPushButton with rounded corners"""
@@ -186,15 +251,22 @@ class LoginWindow(QWidget):
         if not username or not password:
             QMessageBox.warning(self, "Login Error", "Please enter both username and password.")
             return
-        try:
-            response = requests.post(f"{API_BASE_URL}/login", json={"username": username, "password": password}, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                self.login_successful.emit(data['user_id'], username)
-            else:
-                QMessageBox.warning(self, "Login Failed", response.json().get("error", "Unknown error"))
-        except requests.exceptions.RequestException as e:
-            QMessageBox.critical(self, "Connection Error", f"Failed to connect to the server: {str(e)}")
+        self.login_button.setEnabled(False)
+        api.post("/login", json_body={"username": username, "password": password},
+                 on_success=lambda response: self.on_login_response(response, username),
+                 on_error=self.on_login_error, owner=self, idempotent=True)
+
+    def on_login_response(self, response, username):
+        self.login_button.setEnabled(True)
+        if response.status_code == 200:
+            data = response.json()
+            self.login_successful.emit(data['user_id'], username)
+        else:
+            QMessageBox.warning(self, "Login Failed", response.error_message())
+
+    def on_login_error(self, error):
+        self.login_button.setEnabled(True)
+        show_connection_error(self, error)
 
     def register(self):
         self.register_requested.emit()
@@ -317,15 +389,21 @@ class RegisterWindow(QWidget):
         if password != confirm_password:
             QMessageBox.warning(self, "Registration Error", "Passwords do not match.")
             return
-        try:
-            response = requests.post(f"{API_BASE_URL}/register", json={"username": username, "password": password}, timeout=10)
-            if response.status_code == 201:
-                QMessageBox.information(self, "Registration Successful", "Your account has been created successfully.")
-                self.register_successful.emit()
-            else:
-                QMessageBox.warning(self, "Registration Error", response.json().get("error", "Unknown error"))
-        except requests.exceptions.RequestException as e:
-            QMessageBox.critical(self, "Connection Error", f"Failed to connect to the server: {str(e)}")
+        self.register_button.setEnabled(False)
+        api.post("/register", json_body={"username": username, "password": password},
+                 on_success=self.on_register_response, on_error=self.on_register_error, owner=self)
+
+    def on_register_response(self, response):
+        self.register_button.setEnabled(True)
+        if response.status_code == 201:
+            QMessageBox.information(self, "Registration Successful", "Your account has been created successfully.")
+            self.register_successful.emit()
+        else:
+            QMessageBox.warning(self, "Registration Error", response.error_message())
+
+    def on_register_error(self, error):
+        self.register_button.setEnabled(True)
+        show_connection_error(self, error)
 
     def go_back(self):
         self.back_to_login.emit()
@@ -348,14 +426,26 @@ class HistoryWindow(QWidget):
         title_label = QLabel("Quiz History")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         title_label.setStyleSheet("font-size: 22px; font-weight: bold; margin: 10px;")
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(3)
-        self.history_table.setHorizontalHeaderLabels(["Date", "Score", "questions"])
-        self.history_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+
+        # Rows are fetched page by page as the table scrolls; the server does the sorting
+        self.history_model = HistoryTableModel(self.fetch_page, self)
+        self.history_model.load_failed.connect(self.on_load_failed)
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
+        self.history_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.history_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.history_table.horizontalHeader().setStretchLastSection(True)
         self.history_table.setColumnWidth(0, 170)
         self.history_table.setColumnWidth(1, 100)
         self.history_table.setColumnWidth(2, 400)
+        self.history_table.doubleClicked.connect(self.open_details)
+        header = self.history_table.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(0, Qt.SortOrder.DescendingOrder)
+        self.sort_column, self.sort_order = 0, Qt.SortOrder.DescendingOrder
+        header.sortIndicatorChanged.connect(self.on_sort_changed)
+
         self.back_button = RoundedButton("Main Menu")
         self.back_button.clicked.connect(self.go_back)
         main_layout.addWidget(title_label)
@@ -363,20 +453,50 @@ class HistoryWindow(QWidget):
         main_layout.addWidget(self.back_button)
         self.setLayout(main_layout)
 
+    def refresh(self, user_id):
+        """Reload from the first page when the window is shown again"""
+        api.cancel_for(self)
+        self.user_id = user_id
+        self.load_history()
+
     def load_history(self):
-        response = requests.get(f"{API_BASE_URL}/history/{self.user_id}")
+        """Load the first page of history, replacing whatever is shown"""
+        self.history_model.reload()
+
+    def fetch_page(self, cursor, sort, descending, on_page, on_error):
+        params = {"limit": HISTORY_PAGE_SIZE, "fields": "id,date,score,total_questions,preview",
+                  "sort": sort, "order": "desc" if descending else "asc"}
+        if cursor:
+            params["cursor"] = cursor
+        api.get(f"/history/{self.user_id}", params=params,
+                on_success=lambda response: self.on_page_loaded(response, on_page, on_error),
+                on_error=on_error, owner=self)
+
+    def on_page_loaded(self, response, on_page, on_error):
         if response.status_code == 200:
-            results = response.json()
-            self.history_table.setRowCount(len(results))
-            for i, result in enumerate(results):
-                date_item = QTableWidgetItem(result["date"])
-                self.history_table.setItem(i, 0, date_item)
-                score_item = QTableWidgetItem(f"{result['score']}/{result['total_questions']}")
-                self.history_table.setItem(i, 1, score_item)
-                text_item = QTableWidgetItem(result["extracted_text"][:50] + "...")
-                self.history_table.setItem(i, 2, text_item)
+            on_page(response.json(), response.headers.get("X-Next-Cursor"))
         else:
+            on_error(None)
+
+    def on_load_failed(self, error):
+        if error is None:
             QMessageBox.warning(self, "Error", "Failed to load history.")
+        else:
+            show_connection_error(self, error)
+
+    def on_sort_changed(self, column, order):
+        header = self.history_table.horizontalHeader()
+        if not self.history_model.is_sortable(column):
+            # Put the indicator back on the column the rows are actually sorted by
+            header.blockSignals(True)
+            header.setSortIndicator(self.sort_column, self.sort_order)
+            header.blockSignals(False)
+            return
+        self.sort_column, self.sort_order = column, order
+        self.history_model.sort(column, order)
+
+    def open_details(self, index):
+        self.view_details_requested.emit(self.history_model.quiz_id(index.row()))
 
     def go_back(self):
         self.back_requested.emit()
@@ -384,13 +504,15 @@ class HistoryWindow(QWidget):
 class ResultsWindow(QWidget):
     """Window for displaying quiz results"""
     new_quiz_requested = pyqtSignal()
+    next_quiz_requested = pyqtSignal()
     back_to_menu_requested = pyqtSignal()
 
-    def __init__(self, results, extracted_text, user_id, parent=None):
+    def __init__(self, results, extracted_text, user_id, parent=None, practice=False):
         super().__init__(parent)
         self.results = results
         self.extracted_text = extracted_text
         self.user_id = user_id
+        self.practice = practice
         self.init_ui()
         self.calculate_score()
         self.save_results()
@@ -416,8 +538,14 @@ class ResultsWindow(QWidget):
         buttons_layout = QHBoxLayout()
         self.new_quiz_button = RoundedButton("New Quiz")
         self.new_quiz_button.clicked.connect(self.new_quiz)
+
+        # Continuous practice: another quiz on the same text, usually prepared already
+        self.next_quiz_button = RoundedButton("Next Quiz")
+        self.next_quiz_button.clicked.connect(self.next_quiz_requested.emit)
+        self.next_quiz_button.setVisible(self.practice)
         self.menu_button = RoundedButton("Main Menu")
         self.menu_button.clicked.connect(self.back_to_menu)
+        buttons_layout.addWidget(self.next_quiz_button)
         buttons_layout.addWidget(self.new_quiz_button)
         buttons_layout.addWidget(self.menu_button)
         main_layout.addWidget(title_label)
@@ -468,9 +596,14 @@ class ResultsWindow(QWidget):
             "total_questions": self.total,
             "questions": self.results
         }
-        response = requests.post(f"{API_BASE_URL}/results", json=data)
+        # Not owned by this window: leaving the results page must not drop the save
+        api.post("/results", json_body=data, on_success=self.on_results_saved,
+                 on_error=lambda error: show_connection_error(None, error))
+
+    @staticmethod
+    def on_results_saved(response):
         if response.status_code != 201:
-            QMessageBox.warning(self, "Error", "Failed to save results.")
+            QMessageBox.warning(None, "Error", "Failed to save results.")
 
     def new_quiz(self):
         self.new_quiz_requested.emit()
@@ -480,13 +613,17 @@ class ResultsWindow(QWidget):
 
 class ImageProcessingWindow(QWidget):
     """Window for uploading and processing images"""
-    quiz_ready = pyqtSignal(str)
+    quiz_ready = pyqtSignal(str, bool)
     back_requested = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.image_path = None
+        self.image_paths = []
         self.extracted_text = ""
+        # Batch OCR state: page index -> text (or None if the page failed)
+        self.page_texts = {}
+        self.page_labels = []
         self.init_ui()
 
     def init_ui(self):
@@ -516,6 +653,22 @@ class ImageProcessingWindow(QWidget):
         self.process_button.clicked.connect(self.process_image)
         self.process_button.setEnabled(False)
 
+        # Server-side clean-up (deskew, binarize, downscale) before OCR
+        self.enhance_checkbox = QCheckBox("Enhance image before text extraction")
+        self.enhance_checkbox.setChecked(True)
+
+        # Run tesseract on this machine when it is installed; the server is the fallback
+        self.local_ocr_checkbox = QCheckBox("Extract text on this computer")
+        self.local_ocr_checkbox.setChecked(local_ocr.is_available())
+        self.local_ocr_checkbox.setEnabled(local_ocr.is_available())
+        if not local_ocr.is_available():
+            self.local_ocr_checkbox.setToolTip("Tesseract is not installed; images are sent to the server")
+
+        # Upload / processing progress
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setVisible(False)
+
         # Text preview
         text_preview_label = QLabel("Extracted Text:")
         self.text_preview = QTextEdit()
@@ -527,6 +680,9 @@ class ImageProcessingWindow(QWidget):
         self.continue_button.clicked.connect(self.start_quiz)
         self.continue_button.setEnabled(False)
 
+        # Keep quizzing on the same text, with the next quiz prepared in the background
+        self.practice_checkbox = QCheckBox("Continuous practice")
+
         # Back button
         self.back_button = RoundedButton("Main Menu")
         self.back_button.clicked.connect(self.go_back)
@@ -540,22 +696,50 @@ class ImageProcessingWindow(QWidget):
         buttons_layout.addWidget(self.upload_button)
         buttons_layout.addWidget(self.process_button)
         main_layout.addLayout(buttons_layout)
+        main_layout.addWidget(self.enhance_checkbox)
+        main_layout.addWidget(self.local_ocr_checkbox)
+        main_layout.addWidget(self.progress_bar)
 
         main_layout.addWidget(text_preview_label)
         main_layout.addWidget(self.text_preview)
+        main_layout.addWidget(self.practice_checkbox)
         main_layout.addWidget(self.continue_button)
         main_layout.addWidget(self.back_button)
 
         self.setLayout(main_layout)
 
+    def refresh(self):
+        """Start over with no files selected when the window is shown again"""
+        api.cancel_for(self)
+        self.image_path = None
+        self.image_paths = []
+        self.extracted_text = ""
+        self.page_texts = {}
+        self.page_labels = []
+        self.image_label.clear()
+        self.image_label.setText("No image selected")
+        self.text_preview.clear()
+        self.set_busy(False)
+        self.process_button.setEnabled(False)
+        self.continue_button.setEnabled(False)
+
     def upload_image(self):
         file_dialog = QFileDialog()
-        file_path, _ = file_dialog.getOpenFileName(
-            self, "Select Image", "", "Image Files (*.png *.jpg *.jpeg *.bmp)"
+        file_paths, _ = file_dialog.getOpenFileNames(
+            self, "Select Images", "", "Images and Documents (*.png *.jpg *.jpeg *.bmp *.tif *.tiff *.pdf)"
         )
 
-        if file_path:
+        if len(file_paths) > 1 or (file_paths and file_paths[0].lower().endswith(MULTI_PAGE_EXTENSIONS)):
+            self.image_paths = file_paths
+            self.image_path = None
+            names = [os.path.basename(path) for path in file_paths]
+            listing = "\n".join(names[:10]) + (f"\n… and {len(names) - 10} more" if len(names) > 10 else "")
+            self.image_label.setText(f"{len(file_paths)} file(s) selected:\n{listing}")
+            self.process_button.setEnabled(True)
+        elif file_paths:
+            file_path = file_paths[0]
             self.image_path = file_path
+            self.image_paths = [file_path]
 
             # Display image
             pixmap = QPixmap(file_path)
@@ -572,39 +756,139 @@ class ImageProcessingWindow(QWidget):
                 self.process_button.setEnabled(False)
 
     def process_image(self):
-        # Set Tesseract path for Linux
-        pytesseract.pytesseract.tesseract_cmd = "/usr/bin/tesseract"
-
+        if self.image_paths and not self.image_path:
+            self.process_batch()
+            return
         if not self.image_path:
             return
 
-        try:
-            # Read the image and encode it in base64
-            with open(self.image_path, "rb") as image_file:
-                image_base64 = base64.b64encode(image_file.read()).decode('utf-8')
-
-            # Send the image to the API for processing
-            response = requests.post(f"{API_BASE_URL}/process_image", json={"image": image_base64}, timeout=10)
-
-            if response.status_code == 200:
-                self.extracted_text = response.json().get("extracted_text", "")
-                self.text_preview.setText(self.extracted_text)
-
-                # Enable continue button if text was extracted
-                if self.extracted_text:
-                    self.continue_button.setEnabled(True)
-                    QMessageBox.information(self, "Processing Complete", "Text extraction completed successfully.")
-                else:
-                    QMessageBox.warning(self, "Processing Warning", "No text was extracted from the image.")
+        self.set_busy(True)
+        if self.local_ocr_checkbox.isChecked():
+            image_path, enhance = self.image_path, self.enhance_checkbox.isChecked()
+            api.run_local(lambda: local_ocr.image_to_string(image_path, enhance),
+                          on_success=self.on_local_text, on_error=self.on_local_ocr_error, owner=self)
+        else:
+            self.upload_for_ocr()
+
+    def on_local_text(self, text):
+        self.set_busy(False)
+        self.show_extracted_text(preprocess_text(text))
+
+    def on_local_ocr_error(self, error):
+        logging.warning(f"Local OCR failed, falling back to the server: {error}")
+        self.upload_for_ocr()
+
+    def upload_for_ocr(self):
+        # Stream the raw file to the API; nothing is read into memory here
+        self.page_labels = []
+        preprocess = "1" if self.enhance_checkbox.isChecked() else "0"
+        api.post(f"/process_image/upload?preprocess={preprocess}", upload_file=self.image_path,
+                 upload_progress=True,
+                 on_success=self.on_image_processed, on_error=self.on_process_error,
+                 on_progress=self.on_upload_progress, owner=self)
+
+    def process_batch(self):
+        # Pages are OCR'd in parallel on the server and streamed back as each finishes
+        self.page_texts = {}
+        self.page_labels = []
+        self.extracted_text = ""
+        self.text_preview.clear()
+        self.continue_button.setEnabled(False)
+        self.set_busy(True)
+        preprocess = "1" if self.enhance_checkbox.isChecked() else "0"
+        api.post(f"/process_images?preprocess={preprocess}", upload_files=("images", self.image_paths),
+                 upload_progress=True,
+                 on_line=self.on_batch_event, on_success=self.on_batch_finished, on_error=self.on_process_error,
+                 on_progress=self.on_upload_progress, owner=self)
+
+    def on_batch_event(self, event):
+        if event.get("event") == "start":
+            self.page_labels = []
+            for file_info in event["files"]:
+                for frame in range(file_info["pages"]):
+                    suffix = f" p.{frame + 1}" if file_info["pages"] > 1 else ""
+                    self.page_labels.append(f"{file_info['name']}{suffix}")
+            self.progress_bar.setRange(0, len(self.page_labels))
+            self.progress_bar.setValue(0)
+        elif event.get("event") == "page":
+            self.page_texts[event["page"]] = event.get("text")
+            self.progress_bar.setValue(len(self.page_texts))
+            self.update_batch_preview()
+
+    def update_batch_preview(self):
+        sections = []
+        for index, label in enumerate(self.page_labels):
+            if index not in self.page_texts:
+                sections.append(f"[{label}: processing…]")
+            elif self.page_texts[index] is None:
+                sections.append(f"[{label}: could not be read]")
             else:
-                error_message = response.json().get("error", "Unknown error occurred.")
-                QMessageBox.critical(self, "Processing Error", error_message)
-        except requests.exceptions.RequestException as e:
-            QMessageBox.critical(self, "Connection Error", f"Failed to connect to the server: {str(e)}")
+                sections.append(self.page_texts[index])
+        self.text_preview.setText("\n\n".join(sections))
+
+        # Pages read so far are usable straight away, in page order
+        self.extracted_text = " ".join(self.page_texts[index] for index in sorted(self.page_texts)
+                                       if self.page_texts[index])
+        self.continue_button.setEnabled(bool(self.extracted_text))
+
+    def on_batch_finished(self, response):
+        self.set_busy(False)
+        if response.status_code != 200:
+            QMessageBox.critical(self, "Processing Error", response.error_message("Unknown error occurred."))
+            return
+        failed = sum(1 for text in self.page_texts.values() if text is None)
+        if not self.extracted_text:
+            QMessageBox.warning(self, "Processing Warning", "No text was extracted from the selected files.")
+        elif failed:
+            QMessageBox.warning(self, "Processing Warning",
+                                f"{failed} of {len(self.page_texts)} pages could not be read; the rest are ready.")
+        else:
+            QMessageBox.information(self, "Processing Complete",
+                                    f"Text extraction completed for {len(self.page_texts)} pages.")
+
+    def set_busy(self, busy):
+        self.upload_button.setEnabled(not busy)
+        self.local_ocr_checkbox.setEnabled(not busy and local_ocr.is_available())
+        self.process_button.setEnabled(not busy)
+        self.progress_bar.setVisible(busy)
+        self.progress_bar.setRange(0, 0)
+
+    def on_upload_progress(self, done, total):
+        if self.page_labels:
+            # The batch has started; the bar now counts pages
+            return
+        if total:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(done)
+        if done >= total:
+            # Upload finished; show a busy indicator while the server runs OCR
+            self.progress_bar.setRange(0, 0)
+
+    def on_image_processed(self, response):
+        self.set_busy(False)
+        if response.status_code == 200:
+            self.show_extracted_text(response.json().get("extracted_text", ""))
+        else:
+            QMessageBox.critical(self, "Processing Error", response.error_message("Unknown error occurred."))
+
+    def show_extracted_text(self, text):
+        self.extracted_text = text
+        self.text_preview.setText(self.extracted_text)
+
+        # Enable continue button if text was extracted
+        if self.extracted_text:
+            self.continue_button.setEnabled(True)
+            QMessageBox.information(self, "Processing Complete", "Text extraction completed successfully.")
+        else:
+            QMessageBox.warning(self, "Processing Warning", "No text was extracted from the image.")
+
+    def on_process_error(self, error):
+        self.set_busy(False)
+        show_connection_error(self, error)
 
     def start_quiz(self):
         if self.extracted_text.strip():
-            self.quiz_ready.emit(self.extracted_text)
+            self.quiz_ready.emit(self.extracted_text, self.practice_checkbox.isChecked())
         else:
             QMessageBox.warning(self, "Error", "No text available for quiz generation.")
 
@@ -616,18 +900,24 @@ class QuizWindow(QWidget):
     quiz_completed = pyqtSignal(list, str)
     back_requested = pyqtSignal()
 
-    def __init__(self, extracted_text, parent=None, time_limit=30):
+    def __init__(self, extracted_text, parent=None, time_limit=30, prefetcher=None):
         super().__init__(parent)
         self.extracted_text = extracted_text
+        # Continuous practice: source of the next quizzes for this text, or None
+        self.prefetcher = prefetcher
         self.questions = []
         self.current_question = 0
         self.selected_answers = []
         self.time_limit = time_limit  # Time limit in seconds per question
         self.remaining_time = self.time_limit
+        # Questions stream in from a server-side job; these track that job
+        self.job_id = None
+        self.generation_done = False
+        self.stream_retries = 0
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_timer)
         self.init_ui()
-        self.generate_quiz()
+        self.start_generation()
 
     def init_ui(self):
         self.setWindowTitle("TextQuiz - Quiz")
@@ -655,6 +945,12 @@ class QuizWindow(QWidget):
         self.question_label.setWordWrap(True)
         self.question_label.setStyleSheet("font-size: 16px; margin: 15px 0;")
 
+        # Busy indicator while questions are generated
+        self.loading_bar = QProgressBar()
+        self.loading_bar.setRange(0, 0)
+        self.loading_bar.setTextVisible(False)
+        self.loading_bar.setVisible(False)
+
         # Options group
         self.options_group = QGroupBox("Select your answer:")
         self.options_layout = QVBoxLayout()
@@ -685,6 +981,7 @@ class QuizWindow(QWidget):
         main_layout.addWidget(self.progress_label)
         main_layout.addWidget(self.timer_label)
         main_layout.addWidget(self.question_label)
+        main_layout.addWidget(self.loading_bar)
         main_layout.addWidget(self.options_group)
         main_layout.addLayout(nav_layout)
         main_layout.addWidget(self.submit_button, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -711,14 +1008,133 @@ class QuizWindow(QWidget):
         """Update the timer label with the remaining time."""
         self.timer_label.setText(f"Time Remaining: {self.remaining_time} seconds")
 
+    def start_generation(self):
+        # In continuous practice the quiz is usually ready before the window opens
+        if self.prefetcher is not None:
+            self.question_label.setText("Preparing the next quiz...")
+            self.loading_bar.setVisible(True)
+            self.next_button.setEnabled(False)
+            if self.prefetcher.take(self.on_prefetched_quiz):
+                return
+        self.generate_quiz()
+
+    def on_prefetched_quiz(self, questions):
+        if not questions:
+            # The background request failed; generate this quiz the usual way
+            self.generate_quiz()
+            return
+        self.loading_bar.setVisible(False)
+        self.next_button.setEnabled(True)
+        self.generation_done = True
+        self.questions = questions
+        self.selected_answers = [None] * len(self.questions)
+        self.current_question = 0
+        self.display_question()
+
+    def prefetch_next(self):
+        """Start generating the next practice quiz while this one is answered"""
+        if self.prefetcher is not None:
+            self.prefetcher.mark_seen(self.questions)
+            self.prefetcher.fill()
+
     def generate_quiz(self):
         # Show progress or loading indicator
         self.question_label.setText("Generating questions... Please wait.")
-        QApplication.processEvents()
+        self.loading_bar.setVisible(True)
+        self.next_button.setEnabled(False)
+
+        # Questions are generated by a server job and shown as soon as the first one arrives
+        submit_quiz_job(self.extracted_text, self.on_quiz_event, self.on_quiz_stream_end, self.on_quiz_stream_error,
+                        num_questions=QUIZ_LENGTH, owner=self)
+
+    def stream_questions(self):
+        stream_quiz_job(self.job_id, self.on_quiz_event, self.on_quiz_stream_end, self.on_quiz_stream_error,
+                        after=len(self.questions), owner=self)
+
+    def on_quiz_event(self, event):
+        kind = event.get("event")
+        if kind == "job":
+            self.job_id = event["job_id"]
+        elif kind == "question":
+            if event["index"] != len(self.questions):
+                return
+            self.questions.append(event["question"])
+            self.selected_answers.append(None)
+            if len(self.questions) == 1:
+                self.loading_bar.setVisible(False)
+                self.current_question = 0
+                self.display_question()
+            else:
+                self.update_navigation()
+        elif kind in ("done", "failed", "cancelled"):
+            self.finish_generation(event.get("error"))
+
+    def on_quiz_stream_end(self, response):
+        if response.status_code == 404 and self.job_id is None:
+            # Server without job support: fall back to the single blocking request
+            generate_quiz(self.extracted_text, self.on_quiz_response, self.on_quiz_error, num_questions=QUIZ_LENGTH, owner=self)
+        elif response.status_code == 404 and self.questions:
+            # The job expired or lives in another server process; keep what arrived
+            self.finish_generation(None)
+        elif response.status_code != 200:
+            self.loading_bar.setVisible(False)
+            show_quiz_error(self, response)
+            self.back_requested.emit()
+        elif not self.generation_done:
+            # Stream closed without a final event; pick up where it stopped
+            self.on_quiz_stream_error(None)
+
+    def on_quiz_stream_error(self, error):
+        if self.job_id is None:
+            self.on_quiz_error(error)
+        elif self.stream_retries < 2:
+            self.stream_retries += 1
+            self.stream_questions()
+        elif self.questions:
+            # Keep the questions that arrived; the quiz is just shorter
+            self.finish_generation(None)
+        else:
+            import requests
+            self.on_quiz_error(error or requests.exceptions.ConnectionError("The quiz stream was interrupted"))
+
+    def finish_generation(self, error):
+        self.generation_done = True
+        self.loading_bar.setVisible(False)
+        if not self.questions:
+            QMessageBox.warning(self, "Quiz Generation Error",
+                                error or "Failed to generate quiz questions from the extracted text. "
+                                         "The text might be too short or not contain enough meaningful content.")
+            self.back_requested.emit()
+            return
+        self.update_navigation()
+        self.prefetch_next()
+
+    def stop_generation(self):
+        if self.job_id and not self.generation_done:
+            cancel_quiz_job(self.job_id)
+            self.generation_done = True
+
+    def teardown(self):
+        """Called by WindowManager before the page is deleted (replaced, evicted or on logout)"""
+        self.timer.stop()
+        self.stop_generation()
+
+    def on_quiz_error(self, error):
+        self.loading_bar.setVisible(False)
+        show_connection_error(self, error)
+        self.back_requested.emit()
+
+    def on_quiz_response(self, response):
+        self.loading_bar.setVisible(False)
+        self.next_button.setEnabled(True)
+        self.generation_done = True
+        if response.status_code != 200:
+            show_quiz_error(self, response)
+            self.back_requested.emit()
+            return
 
-        # Generate quiz questions
         try:
-            self.questions = generate_quiz(self.extracted_text, num_questions=5)
+            self.questions = response.json()
 
             if not self.questions:
                 QMessageBox.warning(self, "Quiz Generation Error",
@@ -733,6 +1149,7 @@ class QuizWindow(QWidget):
             # Display first question
             self.current_question = 0
             self.display_question()
+            self.prefetch_next()
 
         except Exception as e:
             QMessageBox.critical(self, "Quiz Generation Error",
@@ -748,9 +1165,6 @@ class QuizWindow(QWidget):
         self.option_buttons = []
         self.option_group = QButtonGroup(self)
 
-        # Update progress label
-        self.progress_label.setText(f"Question {self.current_question + 1}/{len(self.questions)}")
-
         # Get current question
         question_data = self.questions[self.current_question]
 
@@ -770,18 +1184,24 @@ class QuizWindow(QWidget):
             if 0 <= selected_idx < len(self.option_buttons):
                 self.option_buttons[selected_idx].setChecked(True)
 
-        # Update navigation buttons
+        self.update_navigation()
+        self.start_timer()  # Start the timer for the current question
+
+    def update_navigation(self):
+        """Refresh the progress label and buttons; more questions may still be on the way"""
+        more = "" if self.generation_done else "+"
+        self.progress_label.setText(f"Question {self.current_question + 1}/{len(self.questions)}{more}")
         self.prev_button.setEnabled(self.current_question > 0)
 
-        if self.current_question == len(self.questions) - 1:
+        is_last = self.current_question == len(self.questions) - 1
+        if is_last and self.generation_done:
             self.next_button.setVisible(False)
             self.submit_button.setVisible(True)
         else:
             self.next_button.setVisible(True)
+            self.next_button.setEnabled(not is_last)
             self.submit_button.setVisible(False)
 
-        self.start_timer()  # Start the timer for the current question
-
     def next_question(self):
         # Stop the timer before moving to the next question
         self.timer.stop()
@@ -864,6 +1284,7 @@ class QuizWindow(QWidget):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
+            self.stop_generation()
             self.back_requested.emit()
 
 class QuizDetailsWindow(QWidget):
@@ -900,10 +1321,20 @@ class QuizDetailsWindow(QWidget):
         text_layout.addWidget(self.text_preview)
         text_group.setLayout(text_layout)
 
-        # Questions and answers
+        # Questions and answers; the list view only lays out the questions on screen
         questions_group = QGroupBox("Questions and Answers")
-        self.questions_layout = QVBoxLayout()
-        questions_group.setLayout(self.questions_layout)
+        questions_layout = QVBoxLayout()
+        self.questions_model = QuestionListModel(self)
+        self.questions_view = QListView()
+        self.questions_view.setModel(self.questions_model)
+        self.questions_view.setWordWrap(True)
+        self.questions_view.setSpacing(6)
+        self.questions_view.setAlternatingRowColors(True)
+        self.questions_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.questions_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.questions_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        questions_layout.addWidget(self.questions_view)
+        questions_group.setLayout(questions_layout)
 
         # Back button
         self.back_button = RoundedButton("History")
@@ -918,50 +1349,48 @@ class QuizDetailsWindow(QWidget):
 
         self.setLayout(main_layout)
 
+    def refresh(self, quiz_id):
+        api.cancel_for(self)
+        self.quiz_id = quiz_id
+        self.meta_label.clear()
+        self.text_preview.clear()
+        self.questions_model.set_questions([])
+        self.load_details()
+
     def load_details(self):
-        response = requests.get(f"{API_BASE_URL}/history/{self.quiz_id}")
+        # Past quizzes never change, so one already seen is shown without a request
+        data = quiz_details_cache.get(self.quiz_id)
+        if data is not None:
+            quiz_details_cache.move_to_end(self.quiz_id)
+            self.show_details(data)
+            return
+        api.get(f"/quiz/{self.quiz_id}", on_success=self.on_details_loaded,
+                on_error=lambda error: show_connection_error(self, error), owner=self, idempotent=True)
+
+    def on_details_loaded(self, response):
         if response.status_code == 200:
             data = response.json()
-
-            # Display metadata
-            date_str = datetime.fromisoformat(data['date']).strftime("%Y-%m-%d %H:%M")
-            score_percent = (data['score'] / data['total_questions']) * 100 if data['total_questions'] > 0 else 0
-            self.meta_label.setText(f"Date: {date_str}  |  Score: {data['score']}/{data['total_questions']} ({score_percent:.1f}%)")
-
-            # Display text
-            self.text_preview.setText(data['extracted_text'])
-
-            # Display questions
-            for question in data['questions']:
-                q_group = QGroupBox("Question")
-                q_layout = QVBoxLayout()
-
-                # Question text
-                q_label = QLabel(question['question'])
-                q_label.setWordWrap(True)
-                q_layout.addWidget(q_label)
-
-                # Options
-                options_layout = QVBoxLayout()
-                for option in question['options']:
-                    option_label = QLabel(f"• {option}")
-                    if option == question['correct_answer']:
-                        option_label.setStyleSheet("color: green; font-weight: bold;")
-                    elif option == question['user_answer']:
-                        option_label.setStyleSheet("color: red; font-weight: bold;")
-                    options_layout.addWidget(option_label)
-                q_layout.addLayout(options_layout)
-
-                # Result
-                result_label = QLabel(f"Result: {'Correct' if question['user_answer'] == question['correct_answer'] else 'Incorrect'}")
-                result_label.setStyleSheet("color: green;" if question['user_answer'] == question['correct_answer'] else "color: red;")
-                q_layout.addWidget(result_label)
-
-                q_group.setLayout(q_layout)
-                self.questions_layout.addWidget(q_group)
+            quiz_details_cache[self.quiz_id] = data
+            while len(quiz_details_cache) > QUIZ_DETAILS_CACHE_SIZE:
+                quiz_details_cache.popitem(last=False)
+            self.show_details(data)
+        elif response.status_code == 404:
+            QMessageBox.warning(self, "Error", "This quiz no longer exists.")
         else:
             QMessageBox.warning(self, "Error", "Failed to load quiz details.")
 
+    def show_details(self, data):
+        # Display metadata
+        date_str = datetime.fromisoformat(data['date']).strftime("%Y-%m-%d %H:%M")
+        score_percent = (data['score'] / data['total_questions']) * 100 if data['total_questions'] > 0 else 0
+        self.meta_label.setText(f"Date: {date_str}  |  Score: {data['score']}/{data['total_questions']} ({score_percent:.1f}%)")
+
+        # Display text
+        self.text_preview.setText(data['extracted_text'])
+
+        # Display questions
+        self.questions_model.set_questions(data['questions'])
+
     def go_back(self):
         self.back_requested.emit()
 
@@ -992,6 +1421,11 @@ class ProgressWindow(QWidget):
             color: #333;
         """)
 
+        # Overall stats from the server-side rollups
+        self.summary_label = QLabel("")
+        self.summary_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.summary_label.setStyleSheet("font-size: 16px; color: #555; margin-bottom: 10px;")
+
         # Progress table
         self.progress_table = QTableWidget()
         self.progress_table.setColumnCount(3)
@@ -1019,9 +1453,15 @@ class ProgressWindow(QWidget):
             }
         """)
 
-        # Graph area
-        self.figure = plt.figure()
+        # Graph area; matplotlib is imported here rather than at startup
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+        from progress_chart import ProgressChart
+        self.figure = Figure()
         self.canvas = FigureCanvas(self.figure)
+        self.chart = ProgressChart(self.figure)
+        # The number of points drawn follows the canvas width
+        self.canvas.mpl_connect("resize_event", lambda event: self.chart.render())
 
         # Back button
         self.back_button = RoundedButton("Back")
@@ -1043,70 +1483,111 @@ class ProgressWindow(QWidget):
 
         # Add widgets to layout
         main_layout.addWidget(title_label)
+        main_layout.addWidget(self.summary_label)
         main_layout.addWidget(self.progress_table)
         main_layout.addWidget(self.canvas)
         main_layout.addWidget(self.back_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.setLayout(main_layout)
 
+    def refresh(self, user_id):
+        api.cancel_for(self)
+        self.user_id = user_id
+        self.summary_label.clear()
+        self.load_progress()
+
     def load_progress(self):
-        response = requests.get(f"{API_BASE_URL}/progress/{self.user_id}")
+        self.loaded_pages = 0
+        self.oldest_session = None
+        self.chart.clear()
+        self.load_progress_page()
+        # Totals over every session, without downloading them
+        api.get(f"/progress/summary/{self.user_id}", params={"period": "week", "limit": 4},
+                on_success=self.on_summary_loaded, owner=self)
+
+    def load_progress_page(self, cursor=None):
+        params = {"limit": PROGRESS_PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        api.get(f"/progress/{self.user_id}", params=params,
+                on_success=self.on_progress_loaded,
+                on_error=lambda error: show_connection_error(self, error), owner=self)
+
+    def on_summary_loaded(self, response):
+        if response.status_code != 200:
+            return
+        summary = response.json()
+        totals = summary["totals"]
+        if not totals["attempts"]:
+            return
+        text = (f"{totals['attempts']} quizzes · average score {totals['mean_score']:.1f} · "
+                f"best {totals['best_score']} · accuracy {totals['accuracy']:.0%}")
+        if summary["buckets"]:
+            recent = summary["buckets"][-1]["rolling_accuracy"]
+            if recent is not None:
+                text += f" · last {summary['window']} weeks {recent:.0%}"
+        self.summary_label.setText(text)
+
+    def on_progress_loaded(self, response):
         if response.status_code == 200:
             results = response.json()
-            self.progress_table.setRowCount(len(results))
-            dates = []
-            scores = []
-            totals = []
-
-            for i, result in enumerate(results):
-                date_item = QTableWidgetItem(result["date"])
-                date_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.progress_table.setItem(i, 0, date_item)
-
-                score_item = QTableWidgetItem(f"{result['score']}/{result['total_questions']}")
-                score_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.progress_table.setItem(i, 1, score_item)
-
-                total_item = QTableWidgetItem(str(result["total_questions"]))
-                total_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.progress_table.setItem(i, 2, total_item)
-
-                # Collect data for the graph
-                dates.append(result["date"])
-                scores.append(result["score"])
-                totals.append(result["total_questions"])
-
-            self.progress_table.resizeColumnsToContents()
-            self.progress_table.resizeRowsToContents()
-
-            # Plot the graph
-            self.plot_progress(dates, scores, totals)
+
+            # The table lists the most recent page; older pages only feed the chart
+            if self.loaded_pages == 0:
+                self.progress_table.setRowCount(len(results))
+                for i, result in enumerate(results):
+                    date_item = QTableWidgetItem(result["date"])
+                    date_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                    self.progress_table.setItem(i, 0, date_item)
+
+                    score_item = QTableWidgetItem(f"{result['score']}/{result['total_questions']}")
+                    score_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                    self.progress_table.setItem(i, 1, score_item)
+
+                    total_item = QTableWidgetItem(str(result["total_questions"]))
+                    total_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                    self.progress_table.setItem(i, 2, total_item)
+
+                self.progress_table.resizeColumnsToContents()
+                self.progress_table.resizeRowsToContents()
+
+            from progress_chart import parse_api_date
+            dates = [parse_api_date(result["date"]) for result in results]
+            self.chart.add_sessions(dates, [result["score"] for result in results],
+                                    [result["total_questions"] for result in results])
+            self.loaded_pages += 1
+            if dates:
+                self.oldest_session = min(dates + [self.oldest_session or dates[0]])
+
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if next_cursor and self.loaded_pages < PROGRESS_CHART_MAX_PAGES:
+                self.load_progress_page(next_cursor)
+                return
+            # Downsampled and drawn once, after the last page
+            self.chart.render()
+            if next_cursor:
+                # Older sessions come as one point per day from the rollups, so the chart
+                # still spans the whole history
+                api.get(f"/progress/summary/{self.user_id}", params={"period": "day"},
+                        on_success=self.on_daily_history_loaded, owner=self)
         else:
             QMessageBox.warning(self, "Error", "Failed to load progress.")
 
-    def plot_progress(self, dates, scores, totals):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-
-        # Plot scores with a blue line and fill the area under the curve
-        ax.plot(dates, scores, label="Score", marker="o", color="blue", linewidth=2)
-        ax.fill_between(dates, scores, color="blue", alpha=0.2)
-
-        # Plot total questions with a green line and fill the area under the curve
-        ax.plot(dates, totals, label="Total Questions", marker="o", color="green", linewidth=2)
-        ax.fill_between(dates, totals, color="green", alpha=0.2)
-
-        # Add title, labels, legend, and grid
-        ax.set_title("Progress Over Time", fontsize=10, fontweight="bold")
-        ax.set_xlabel("Date", fontsize=1)
-        ax.set_ylabel("Score / Total Questions", fontsize=10)
-        ax.legend(loc="upper left", fontsize=10)
-        ax.grid(True, linestyle="--", alpha=0.6)
-
-        # Rotate x-axis labels for better readability
-        ax.tick_params(axis="x", rotation=90)
-
-        self.canvas.draw()
+    def on_daily_history_loaded(self, response):
+        if response.status_code != 200 or self.oldest_session is None:
+            return
+        from progress_chart import parse_api_date
+        first_day = self.oldest_session.date()
+        # Only one daily history is merged per load, even if an earlier load's reply lands late
+        self.oldest_session = None
+        older = [(parse_api_date(bucket["bucket"]), bucket) for bucket in response.json()["buckets"]]
+        older = [(day, bucket) for day, bucket in older if day.date() < first_day]
+        if not older:
+            return
+        self.chart.add_sessions([day for day, _ in older], [bucket["mean_score"] for _, bucket in older],
+                                [bucket["mean_total"] for _, bucket in older])
+        self.chart.set_note(f"Before {first_day:%Y-%m-%d}: daily averages")
+        self.chart.render()
 
     def go_back(self):
         self.back_requested.emit()
@@ -1133,9 +1614,9 @@ class MainMenuWindow(QWidget):
         main_layout.setContentsMargins(40, 20, 40, 20)
 
         # Welcome message
-        welcome_label = QLabel(f"Welcome, {self.username}!")
-        welcome_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        welcome_label.setStyleSheet("""
+        self.welcome_label = QLabel(f"Welcome, {self.username}!")
+        self.welcome_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.welcome_label.setStyleSheet("""
             font-size: 28px; 
             font-weight: bold; 
             margin: 20px 0;
@@ -1254,11 +1735,16 @@ class MainMenuWindow(QWidget):
         center_layout.addStretch(1)
 
         # Add widgets to main layout
-        main_layout.addWidget(welcome_label)
+        main_layout.addWidget(self.welcome_label)
         main_layout.addLayout(center_layout)
 
         self.setLayout(main_layout)
 
+    def refresh(self, user_id, username):
+        self.user_id = user_id
+        self.username = username
+        self.welcome_label.setText(f"Welcome, {self.username}!")
+
     def start_quiz(self):
         self.start_quiz_requested.emit()
 
@@ -1287,14 +1773,20 @@ class MainApplication(QMainWindow):
         self.stacked_layout = QStackedWidget()
         main_layout = QVBoxLayout(self.central_widget)
         main_layout.addWidget(self.stacked_layout)
+        # Pages are reused and refreshed rather than rebuilt, and only a few stay alive
+        self.pages = WindowManager(self.stacked_layout)
         self.login_window = LoginWindow()
         self.login_window.login_successful.connect(self.handle_login)
         self.login_window.register_requested.connect(self.show_register)
-        self.stacked_layout.addWidget(self.login_window)
+        self.pages.pin("login", self.login_window)
         self.register_window = RegisterWindow()
         self.register_window.register_successful.connect(self.show_login)
         self.register_window.back_to_login.connect(self.show_login)
-        self.stacked_layout.addWidget(self.register_window)
+        self.pages.pin("register", self.register_window)
+        self.current_user_id = None
+        self.current_username = None
+        # QuizPrefetcher while in continuous practice, else None
+        self.practice = None
         self.show_login()
 
     def init_ui(self):
@@ -1303,94 +1795,116 @@ class MainApplication(QMainWindow):
         self.setMinimumSize(600, 450)
 
     def show_login(self):
-        self.stacked_layout.setCurrentWidget(self.login_window)
+        self.pages.show("login", None)
 
     def show_register(self):
-        self.stacked_layout.setCurrentWidget(self.register_window)
+        self.pages.show("register", None)
 
     def handle_login(self, user_id, username):
-        self.main_menu = MainMenuWindow(user_id, username)
-        self.main_menu.logout_requested.connect(self.handle_logout)
-        self.main_menu.start_quiz_requested.connect(self.start_new_quiz)
-        self.main_menu.view_history_requested.connect(self.view_history)
-        self.main_menu.view_progress_requested.connect(self.view_progress)
-        self.stacked_layout.addWidget(self.main_menu)
-        self.stacked_layout.setCurrentWidget(self.main_menu)
         self.current_user_id = user_id
         self.current_username = username
+        self.back_to_main_menu()
 
     def handle_logout(self):
-        current_widget = self.stacked_layout.currentWidget()
-        if current_widget != self.login_window and current_widget != self.register_window:
-            self.stacked_layout.removeWidget(current_widget)
-            current_widget.deleteLater()
+        self.stop_practice()
         self.show_login()
+        self.pages.discard_all()
         self.current_user_id = None
         self.current_username = None
 
+    def create_main_menu(self, user_id, username):
+        main_menu = MainMenuWindow(user_id, username)
+        main_menu.logout_requested.connect(self.handle_logout)
+        main_menu.start_quiz_requested.connect(self.start_new_quiz)
+        main_menu.view_history_requested.connect(self.view_history)
+        main_menu.view_progress_requested.connect(self.view_progress)
+        return main_menu
+
+    def create_image_processor(self):
+        image_processor = ImageProcessingWindow()
+        image_processor.back_requested.connect(self.back_to_main_menu)
+        image_processor.quiz_ready.connect(self.start_quiz)
+        return image_processor
+
+    def create_quiz_window(self, extracted_text, prefetcher=None):
+        quiz_window = QuizWindow(extracted_text, prefetcher=prefetcher)
+        quiz_window.back_requested.connect(self.back_to_main_menu)
+        quiz_window.quiz_completed.connect(self.show_results)
+        return quiz_window
+
+    def create_results_window(self, results, extracted_text, user_id):
+        results_window = ResultsWindow(results, extracted_text, user_id, practice=self.practice is not None)
+        results_window.new_quiz_requested.connect(self.start_new_quiz)
+        results_window.next_quiz_requested.connect(self.next_practice_quiz)
+        results_window.back_to_menu_requested.connect(self.back_to_main_menu)
+        return results_window
+
+    def create_history_window(self, user_id):
+        history_window = HistoryWindow(user_id)
+        history_window.back_requested.connect(self.back_to_main_menu)
+        history_window.view_details_requested.connect(self.view_quiz_details)
+        return history_window
+
+    def create_details_window(self, quiz_id):
+        details_window = QuizDetailsWindow(quiz_id)
+        details_window.back_requested.connect(self.back_to_history)
+        return details_window
+
+    def create_progress_window(self, user_id):
+        progress_window = ProgressWindow(user_id)
+        progress_window.back_requested.connect(self.back_to_main_menu)
+        return progress_window
+
     def start_new_quiz(self):
-        self.image_processor = ImageProcessingWindow()
-        self.image_processor.back_requested.connect(self.back_to_main_menu)
-        self.image_processor.quiz_ready.connect(self.start_quiz)
-        self.stacked_layout.addWidget(self.image_processor)
-        self.stacked_layout.setCurrentWidget(self.image_processor)
-
-    def start_quiz(self, extracted_text):
-        self.quiz_window = QuizWindow(extracted_text)
-        self.quiz_window.back_requested.connect(self.back_to_main_menu)
-        self.quiz_window.quiz_completed.connect(self.show_results)
-        self.stacked_layout.addWidget(self.quiz_window)
-        self.stacked_layout.setCurrentWidget(self.quiz_window)
+        self.stop_practice()
+        self.pages.show("image_processing", self.create_image_processor)
+
+    def start_quiz(self, extracted_text, practice=False):
+        self.stop_practice()
+        if practice and PRACTICE_PREFETCH_DEPTH > 0:
+            fetch_quiz = lambda num_questions, on_success, on_error, owner: generate_quiz(
+                extracted_text, on_success, on_error, num_questions=num_questions, owner=owner)
+            self.practice = QuizPrefetcher(extracted_text, fetch_quiz, QUIZ_LENGTH,
+                                           depth=PRACTICE_PREFETCH_DEPTH, parent=self)
+        # A quiz is single-use: a new one replaces the previous quiz page
+        self.pages.show("quiz", self.create_quiz_window, extracted_text, self.practice)
+
+    def next_practice_quiz(self):
+        self.pages.show("quiz", self.create_quiz_window, self.practice.text, self.practice)
+
+    def stop_practice(self):
+        """Leave continuous practice, dropping prepared quizzes and cancelling their requests"""
+        if self.practice is not None:
+            self.practice.cancel()
+            self.practice.deleteLater()
+            self.practice = None
 
     def show_results(self, results, extracted_text):
-        self.results_window = ResultsWindow(results, extracted_text, self.current_user_id)
-        self.results_window.new_quiz_requested.connect(self.start_new_quiz)
-        self.results_window.back_to_menu_requested.connect(self.back_to_main_menu)
-        self.stacked_layout.addWidget(self.results_window)
-        self.stacked_layout.setCurrentWidget(self.results_window)
+        self.pages.show("results", self.create_results_window, results, extracted_text, self.current_user_id)
 
     def view_history(self):
-        self.history_window = HistoryWindow(self.current_user_id)
-        self.history_window.back_requested.connect(self.back_to_main_menu)
-        self.history_window.view_details_requested.connect(self.view_quiz_details)
-        self.stacked_layout.addWidget(self.history_window)
-        self.stacked_layout.setCurrentWidget(self.history_window)
+        self.pages.show("history", self.create_history_window, self.current_user_id)
 
     def view_quiz_details(self, quiz_id):
-        self.details_window = QuizDetailsWindow(quiz_id)
-        self.details_window.back_requested.connect(self.back_to_history)
-        self.stacked_layout.addWidget(self.details_window)
-        self.stacked_layout.setCurrentWidget(self.details_window)
+        self.pages.show("quiz_details", self.create_details_window, quiz_id)
 
     def view_progress(self):
-        self.progress_window = ProgressWindow(self.current_user_id)
-        self.progress_window.back_requested.connect(self.back_to_main_menu)
-        self.stacked_layout.addWidget(self.progress_window)
-        self.stacked_layout.setCurrentWidget(self.progress_window)
+        self.pages.show("progress", self.create_progress_window, self.current_user_id)
 
     def back_to_main_menu(self):
-        current_widget = self.stacked_layout.currentWidget()
-        if current_widget != self.main_menu:
-            self.stacked_layout.removeWidget(current_widget)
-            current_widget.deleteLater()
-        if not hasattr(self, 'main_menu') or self.main_menu is None:
-            self.main_menu = MainMenuWindow(self.current_user_id, self.current_username)
-            self.main_menu.logout_requested.connect(self.handle_logout)
-            self.main_menu.start_quiz_requested.connect(self.start_new_quiz)
-            self.main_menu.view_history_requested.connect(self.view_history)
-            self.main_menu.view_progress_requested.connect(self.view_progress)
-            self.stacked_layout.addWidget(self.main_menu)
-        self.stacked_layout.setCurrentWidget(self.main_menu)
+        self.stop_practice()
+        self.pages.show("main_menu", self.create_main_menu, self.current_user_id, self.current_username)
 
     def back_to_history(self):
-        self.stacked_layout.removeWidget(self.details_window)
-        self.details_window.deleteLater()
-        self.stacked_layout.setCurrentWidget(self.history_window)
+        # Back to the list as it was left, unless it has been evicted meanwhile
+        self.pages.show("history", self.create_history_window, self.current_user_id, refresh=False)
 
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
+    app.aboutToQuit.connect(api.cancel_all)
     main_app = MainApplication()
     main_app.show()
+    QTimer.singleShot(WARM_UP_DELAY_MS, warm_up_imports)
     sys.exit(app.exec())
\ No newline at end of file
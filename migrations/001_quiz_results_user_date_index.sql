@@ -0,0 +1,4 @@
+-- Keyset pagination for /history and /progress filters on user_id and orders
+-- by (date, id); without this index every page is a filesort over all of a
+-- user's sessions.
+CREATE INDEX idx_quiz_results_user_date ON quiz_results (user_id, date);
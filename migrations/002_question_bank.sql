@@ -0,0 +1,16 @@
+-- Generated questions shared by everyone who submits the same document.
+-- Rows are keyed by the SHA-256 fingerprint of the preprocessed text; the
+-- unique key doubles as the lookup index and makes concurrent builds of
+-- the same bank idempotent (INSERT IGNORE).
+CREATE TABLE IF NOT EXISTS question_bank (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    fingerprint CHAR(64) NOT NULL,
+    question_type VARCHAR(32) NOT NULL,
+    version INT NOT NULL,
+    position INT NOT NULL,
+    question TEXT NOT NULL,
+    correct_answer VARCHAR(255) NOT NULL,
+    options TEXT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_question_bank_document (fingerprint, question_type, version, position)
+);
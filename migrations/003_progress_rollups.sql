@@ -0,0 +1,26 @@
+-- Per-user daily and weekly aggregates behind /progress/summary, kept up to
+-- date by /results and /results/batch in the same transaction as the
+-- sessions they count. Buckets are keyed by their first day; weeks start on
+-- Monday. The backfill below folds in every session saved before this
+-- migration, so apply it while writes are stopped.
+CREATE TABLE IF NOT EXISTS progress_rollups (
+    user_id INT NOT NULL,
+    period ENUM('day', 'week') NOT NULL,
+    bucket DATE NOT NULL,
+    attempts INT NOT NULL,
+    score_sum INT NOT NULL,
+    total_sum INT NOT NULL,
+    best_score INT NOT NULL,
+    PRIMARY KEY (user_id, period, bucket),
+    FOREIGN KEY (user_id) REFERENCES users (id)
+);
+
+INSERT INTO progress_rollups (user_id, period, bucket, attempts, score_sum, total_sum, best_score)
+SELECT user_id, 'day', DATE(date), COUNT(*), SUM(score), SUM(total_questions), MAX(score)
+FROM quiz_results
+GROUP BY user_id, DATE(date);
+
+INSERT INTO progress_rollups (user_id, period, bucket, attempts, score_sum, total_sum, best_score)
+SELECT user_id, 'week', DATE_SUB(DATE(date), INTERVAL WEEKDAY(date) DAY), COUNT(*), SUM(score), SUM(total_questions), MAX(score)
+FROM quiz_results
+GROUP BY user_id, DATE_SUB(DATE(date), INTERVAL WEEKDAY(date) DAY);
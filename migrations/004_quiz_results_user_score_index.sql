@@ -0,0 +1,4 @@
+-- /history?sort=score pages by (score, id) for one user; InnoDB appends the
+-- primary key to secondary indexes, so this serves both the filter and the
+-- keyset ORDER BY score, id without a filesort.
+CREATE INDEX idx_quiz_results_user_score ON quiz_results (user_id, score);
@@ -0,0 +1,7 @@
+-- /quiz/<id> joins quiz_questions on quiz_id. InnoDB already keeps an
+-- implicit index for the foreign key; naming it explicitly makes the
+-- dependency visible, and InnoDB drops the implicit one once this exists.
+CREATE INDEX idx_quiz_questions_quiz_id ON quiz_questions (quiz_id);
+
+-- New rows store options as a JSON array. Older comma-joined rows are still
+-- read by splitting on commas, so no data migration is needed.
@@ -0,0 +1,16 @@
+-- Question banks now hold each question sentence with its candidate blanks
+-- (JSON [[word, POS tag], ...]) instead of finished questions, so every
+-- request picks its own blank and distractors and one bank serves every
+-- question type. The table only caches derived data: dropping it loses
+-- nothing, and banks are rebuilt the next time each document is submitted.
+DROP TABLE IF EXISTS question_bank;
+CREATE TABLE question_bank (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    fingerprint CHAR(64) NOT NULL,
+    version INT NOT NULL,
+    position INT NOT NULL,
+    sentence TEXT NOT NULL,
+    candidates TEXT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_question_bank_document (fingerprint, version, position)
+);
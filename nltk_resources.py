@@ -0,0 +1,108 @@
+"""NLTK resource provisioning and per-process model loading.
+
+Resources are provisioned once per host with
+
+    python nltk_resources.py provision [--download-dir DIR]
+
+after which the API only verifies that they are present locally and never
+touches the network at startup. Models are loaded lazily, once per process,
+or eagerly through ``preload()`` before a pre-fork server forks its workers
+so the loaded models are shared copy-on-write.
+"""
+import argparse
+import functools
+import logging
+import sys
+import nltk
+
+# Download name -> path nltk.data.find() looks for
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'averaged_perceptron_tagger_eng': 'taggers/averaged_perceptron_tagger_eng',
+}
+
+
+class MissingResourcesError(RuntimeError):
+    def __init__(self, missing):
+        self.missing = missing
+        super().__init__(
+            f"Missing NLTK resources: {', '.join(missing)}. "
+            "Run 'python nltk_resources.py provision' on this host once."
+        )
+
+
+def missing_resources():
+    missing = []
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(name)
+    return missing
+
+
+def verify_resources():
+    """Raise MissingResourcesError unless every resource is available locally."""
+    missing = missing_resources()
+    if missing:
+        raise MissingResourcesError(missing)
+
+
+def provision(download_dir=None):
+    """Download whatever resources are missing. Returns the names downloaded."""
+    missing = missing_resources()
+    for name in missing:
+        logging.info(f"Downloading NLTK resource '{name}'")
+        if not nltk.download(name, download_dir=download_dir, quiet=True):
+            raise RuntimeError(f"Failed to download NLTK resource '{name}'")
+    return missing
+
+
+@functools.lru_cache(maxsize=None)
+def get_tagger():
+    from nltk.tag import PerceptronTagger
+    return PerceptronTagger()
+
+
+@functools.lru_cache(maxsize=None)
+def get_sentence_tokenizer():
+    try:
+        from nltk.tokenize import PunktTokenizer
+    except ImportError:
+        # NLTK releases before punkt_tab ship the pickled model instead
+        return nltk.data.load('tokenizers/punkt/english.pickle')
+    return PunktTokenizer('english')
+
+
+def preload():
+    """Load the tokenizer and tagger into this process and run them once."""
+    sentences = get_sentence_tokenizer().tokenize("Preloading models. This warms the tagger.")
+    get_tagger().tag_sents([nltk.word_tokenize(s, preserve_line=True) for s in sentences])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the NLTK resources used by the TextQuiz API")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    provision_parser = subparsers.add_parser('provision', help="download missing resources")
+    provision_parser.add_argument('--download-dir', help="target directory (defaults to NLTK's data path)")
+    subparsers.add_parser('verify', help="check that all resources are available locally")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == 'provision':
+        downloaded = provision(args.download_dir)
+        print(f"Downloaded: {', '.join(downloaded)}" if downloaded else "All NLTK resources already present.")
+        return 0
+
+    missing = missing_resources()
+    if missing:
+        print(f"Missing: {', '.join(missing)}")
+        return 1
+    print("All NLTK resources present.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,353 @@
+import io
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, TimeoutError as FutureTimeout, wait
+from concurrent.futures.process import BrokenProcessPool
+
+TESSERACT_CMD = os.environ.get("TESSERACT_CMD", "/usr/bin/tesseract")
+
+
+class OcrQueueFull(Exception):
+    """Raised when every worker is busy and the wait queue is full"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f"OCR queue is full, retry after {retry_after}s")
+
+
+class OcrTimeout(Exception):
+    """Raised when a job does not finish within the per-job timeout"""
+
+
+def is_pdf(path):
+    with open(path, "rb") as f:
+        return f.read(5) == b"%PDF-"
+
+
+def count_pages(path):
+    """Number of pages in an uploaded file: PDF pages or image frames (multi-page TIFF)"""
+    if is_pdf(path):
+        try:
+            from pdf2image import pdfinfo_from_path
+        except ImportError:
+            raise ValueError("PDF uploads need the pdf2image package and poppler on the server")
+        return int(pdfinfo_from_path(path)["Pages"])
+    from PIL import Image
+    with Image.open(path) as image:
+        return getattr(image, "n_frames", 1)
+
+
+def load_page(path, page):
+    """Decode one page of an uploaded file as a PIL image"""
+    if is_pdf(path):
+        from pdf2image import convert_from_path
+        # 300 dpi is what tesseract is tuned for; preprocessing scales it down if needed
+        return convert_from_path(path, dpi=300, first_page=page + 1, last_page=page + 1)[0]
+    from PIL import Image
+    image = Image.open(path)
+    image.seek(page)
+    return image
+
+
+def run_ocr(image_source, timeout, preprocess=None, tesseract_cmd=TESSERACT_CMD):
+    """Worker-process entry point: OCR one image and return its text.
+
+    ``image_source`` is either the encoded image bytes or the path of a file
+    holding them; paths avoid copying large uploads between processes.
+    """
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(image_source) if isinstance(image_source, bytes) else image_source)
+    return _ocr_image(image, timeout, preprocess, tesseract_cmd)
+
+
+def run_ocr_page(path, page, timeout, preprocess=None, tesseract_cmd=TESSERACT_CMD):
+    """Worker-process entry point: OCR page ``page`` of a multi-page file"""
+    return _ocr_image(load_page(path, page), timeout, preprocess, tesseract_cmd)
+
+
+def _ocr_image(image, timeout, preprocess, tesseract_cmd):
+    import pytesseract
+    from image_preprocess import preprocess_image
+
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    if preprocess:
+        image = preprocess_image(image, preprocess)
+    try:
+        # pytesseract kills the tesseract subprocess once the timeout expires
+        return pytesseract.image_to_string(image, timeout=timeout)
+    except RuntimeError as e:
+        if 'timeout' in str(e).lower():
+            raise OcrTimeout(str(e))
+        raise
+
+
+class PageResults:
+    """Iterator over OcrPool.map_pages results.
+
+    A generator that never started cannot run its ``finally``, so the slot
+    map_pages reserved up front would leak if the response streaming it was
+    dropped before its first read; close() releases it in that case.
+    """
+
+    def __init__(self, pool, pages):
+        self._pool = pool
+        self._pages = pages
+        self._started = False
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self._lock:
+            if self._closed:
+                raise StopIteration
+            self._started = True
+        return next(self._pages)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            started = self._started
+        self._pages.close()
+        if not started:
+            self._pool._release_unsubmitted()
+
+
+class OcrPool:
+    """Dedicated process pool for tesseract with a bounded queue.
+
+    At most ``workers`` images are OCR'd at once and at most ``max_queue``
+    more wait for a worker; anything beyond that is rejected immediately with
+    OcrQueueFull so the web threads stay free for cheap endpoints. Jobs that
+    run longer than ``job_timeout`` seconds are killed.
+
+    The executor is created lazily in the process that first uses it, so a
+    pre-forking server can import this module before forking its workers.
+    """
+
+    def __init__(self, workers=None, max_queue=16, job_timeout=30.0):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_queue = max_queue
+        self.job_timeout = job_timeout
+        self._slots = threading.BoundedSemaphore(self.workers + max_queue)
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "in_flight": 0,
+            "latency_total": 0.0,
+            "latency_max": 0.0,
+        }
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                # spawn, not fork: the web process is multi-threaded
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _reset_executor(self, broken):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _retry_after(self):
+        with self._lock:
+            completed = self._stats["completed"]
+            mean = self._stats["latency_total"] / completed if completed else self.job_timeout / 2
+            queued = max(0, self._stats["in_flight"] - self.workers)
+        return max(1, math.ceil(mean * (queued + 1) / self.workers))
+
+    def _reserve(self, count=1):
+        """Take ``count`` queue slots at once or raise OcrQueueFull"""
+        taken = 0
+        while taken < count and self._slots.acquire(blocking=False):
+            taken += 1
+        if taken < count:
+            for _ in range(taken):
+                self._slots.release()
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise OcrQueueFull(self._retry_after())
+        self._reserved(count)
+
+    def _reserved(self, count):
+        with self._lock:
+            self._stats["submitted"] += count
+            self._stats["in_flight"] += count
+
+    def _finished(self, started, future):
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._stats["in_flight"] -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._stats["failed"] += 1
+            else:
+                self._stats["completed"] += 1
+                self._stats["latency_total"] += elapsed
+                self._stats["latency_max"] = max(self._stats["latency_max"], elapsed)
+        self._slots.release()
+
+    def _submit(self, func, *args):
+        """Submit a job that already holds a reserved slot"""
+        started = time.monotonic()
+        executor = self._get_executor()
+        try:
+            future = executor.submit(func, *args)
+        except BrokenProcessPool:
+            logging.warning("OCR process pool broke, restarting it")
+            self._reset_executor(executor)
+            future = self._get_executor().submit(func, *args)
+        future.add_done_callback(lambda f: self._finished(started, f))
+        return future
+
+    def _result(self, future):
+        try:
+            # Small grace period on top of tesseract's own timeout
+            return future.result(timeout=self.job_timeout + 5)
+        except (FutureTimeout, OcrTimeout):
+            future.cancel()
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise OcrTimeout(f"OCR did not finish within {self.job_timeout}s")
+
+    def image_to_string(self, image_source, preprocess=None):
+        """OCR one image (bytes or file path) in the pool, blocking until its text is ready.
+
+        ``preprocess`` is an options dict from image_preprocess.preprocess_options;
+        the clean-up runs in the worker process alongside tesseract.
+        """
+        self._reserve()
+        try:
+            future = self._submit(run_ocr, image_source, self.job_timeout, preprocess)
+        except BaseException:
+            self._slots.release()
+            with self._lock:
+                self._stats["in_flight"] -= 1
+            raise
+        return self._result(future)
+
+    def _release_unsubmitted(self):
+        self._slots.release()
+        with self._lock:
+            self._stats["in_flight"] -= 1
+
+    def map_pages(self, pages, preprocess=None, heartbeat=None):
+        """OCR many ``(path, page)`` pairs in parallel, yielding results as they finish.
+
+        Yields ``(index, text, error)`` tuples in completion order, where
+        ``index`` is the position in ``pages`` and exactly one of ``text`` and
+        ``error`` is set, so one bad page does not fail the batch. At most
+        ``workers`` pages of a batch are queued at once to leave room for
+        single-image requests. The first slot is reserved before this returns,
+        raising OcrQueueFull if the pool is saturated.
+
+        With ``heartbeat`` set, ``None`` is also yielded after every
+        ``heartbeat`` seconds without a finished page, so a streaming caller
+        can keep its connection alive while slow pages run.
+
+        The returned iterator must be closed: close() cancels pending pages
+        and gives back the reserved slot even if iteration never started.
+        """
+        pages = list(pages)
+        if not pages:
+            raise ValueError("No pages to process")
+        self._reserve()
+        return PageResults(self, self._iter_pages(pages, preprocess, heartbeat))
+
+    def _iter_pages(self, pages, preprocess, heartbeat):
+        window = min(self.workers, len(pages))
+        pending = {}
+        reserved = 1
+        next_page = 0
+        try:
+            while next_page < len(pages) or pending:
+                while next_page < len(pages) and len(pending) < window:
+                    if not reserved:
+                        # Only block for a slot when nothing of ours is running
+                        if pending:
+                            acquired = self._slots.acquire(blocking=False)
+                        else:
+                            acquired = False
+                            deadline = time.monotonic() + self.job_timeout
+                            while not acquired and time.monotonic() < deadline:
+                                remaining = deadline - time.monotonic()
+                                acquired = self._slots.acquire(timeout=min(remaining, heartbeat or remaining))
+                                if not acquired and heartbeat:
+                                    yield None
+                        if not acquired:
+                            if pending:
+                                break
+                            raise OcrTimeout("No OCR worker became free for the next page")
+                        self._reserved(1)
+                        reserved = 1
+                    path, page = pages[next_page]
+                    try:
+                        future = self._submit(run_ocr_page, path, page, self.job_timeout, preprocess)
+                    except BaseException:
+                        reserved = 0
+                        self._release_unsubmitted()
+                        raise
+                    reserved = 0
+                    pending[future] = next_page
+                    next_page += 1
+
+                done = None
+                deadline = time.monotonic() + self.job_timeout + 5
+                while not done and time.monotonic() < deadline:
+                    remaining = deadline - time.monotonic()
+                    done, _ = wait(pending, timeout=min(remaining, heartbeat or remaining),
+                                   return_when=FIRST_COMPLETED)
+                    if not done and heartbeat:
+                        yield None
+                if not done:
+                    with self._lock:
+                        self._stats["timeouts"] += len(pending)
+                    for future, index in pending.items():
+                        future.cancel()
+                        yield index, None, OcrTimeout(f"OCR did not finish within {self.job_timeout}s")
+                    pending.clear()
+                    continue
+                for future in done:
+                    index = pending.pop(future)
+                    error = future.exception()
+                    yield index, None if error else future.result(), error
+        finally:
+            if reserved:
+                self._release_unsubmitted()
+            for future in pending:
+                future.cancel()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queue_depth": max(0, stats["in_flight"] - self.workers),
+            "latency_mean": stats["latency_total"] / stats["completed"] if stats["completed"] else 0.0,
+        })
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,157 @@
+"""Progress chart drawn by ProgressWindow.
+
+Kept free of Qt so the same code can be rendered headless (Agg) by
+benchmarks/bench_progress_chart.py. Sessions are plotted against real dates
+and downsampled with Largest-Triangle-Three-Buckets to a number of points
+bounded by the axes' width in pixels, so drawing cost stops growing with the
+number of sessions. Artists are created once and updated with set_data.
+"""
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+import matplotlib.dates as mdates
+
+# Points kept per horizontal pixel of the axes; more cannot be seen
+POINTS_PER_PIXEL = 1
+# Floor for the downsampling target while the widget has no real size yet
+MIN_POINTS = 100
+# Below this many drawn points each session gets a marker
+MARKER_MAX_POINTS = 60
+
+
+def parse_api_date(value):
+    """A date from the API: Flask's RFC 1123 form ("Tue, 01 Jan 2024 10:00:00 GMT") or ISO 8601"""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return parsedate_to_datetime(value).replace(tzinfo=None)
+
+
+def lttb(xs, ys, threshold):
+    """Indices of the ``threshold`` points Largest-Triangle-Three-Buckets keeps.
+
+    ``xs`` must be ascending. The first and last points are always kept; each
+    bucket in between contributes the point forming the largest triangle with
+    the previously kept point and the mean of the next bucket, which preserves
+    peaks and dips that plain striding would drop.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    indices = [0]
+    a = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_start, next_end = end, min(int((bucket + 2) * every) + 1, n)
+        count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / count
+        avg_y = sum(ys[next_start:next_end]) / count
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((ax - avg_x) * (ys[i] - ay) - (ax - xs[i]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = i, area
+        indices.append(best)
+        a = best
+    indices.append(n - 1)
+    return indices
+
+
+class ProgressChart:
+    """Score and total-questions lines over time on ``figure``.
+
+    Feed sessions with ``add_sessions`` (any order, e.g. newest-first API
+    pages as they arrive) and call ``render`` to refresh the drawing, also
+    after the canvas is resized since the point budget follows its width.
+    """
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.ax = figure.add_subplot(111)
+        self.ax.xaxis.axis_date()
+        locator = mdates.AutoDateLocator()
+        self.ax.xaxis.set_major_locator(locator)
+        self.ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+
+        self.score_line, = self.ax.plot([], [], label="Score", color="blue", linewidth=2)
+        self.total_line, = self.ax.plot([], [], label="Total Questions", color="green", linewidth=2)
+        self.score_fill = None
+
+        self.ax.set_title("Progress Over Time", fontsize=10, fontweight="bold")
+        self.ax.set_ylabel("Score / Total Questions", fontsize=10)
+        self.ax.legend(loc="upper left", fontsize=10)
+        self.ax.grid(True, linestyle="--", alpha=0.6)
+        # Says which part of the range is drawn from daily averages rather than sessions
+        self.note = self.ax.text(0.99, 0.02, "", transform=self.ax.transAxes, ha="right", va="bottom",
+                                 fontsize=8, color="#555555")
+
+        # Matplotlib date numbers, ascending, with the matching values
+        self.xs = []
+        self.scores = []
+        self.totals = []
+
+    def clear(self):
+        self.xs, self.scores, self.totals = [], [], []
+        self.note.set_text("")
+
+    def set_note(self, text):
+        self.note.set_text(text)
+
+    def add_sessions(self, dates, scores, totals):
+        """Add sessions given as datetimes with their scores and totals"""
+        points = sorted(zip(mdates.date2num(dates).tolist(), scores, totals)) if dates else []
+        if not points:
+            return
+        if not self.xs or points[0][0] >= self.xs[-1]:
+            # Pages of newer sessions append; older ones go in front
+            self.xs += [p[0] for p in points]
+            self.scores += [p[1] for p in points]
+            self.totals += [p[2] for p in points]
+        elif points[-1][0] <= self.xs[0]:
+            self.xs = [p[0] for p in points] + self.xs
+            self.scores = [p[1] for p in points] + self.scores
+            self.totals = [p[2] for p in points] + self.totals
+        else:
+            merged = sorted(list(zip(self.xs, self.scores, self.totals)) + points)
+            self.xs = [p[0] for p in merged]
+            self.scores = [p[1] for p in merged]
+            self.totals = [p[2] for p in merged]
+
+    def point_budget(self):
+        width = self.ax.get_window_extent().width
+        return max(MIN_POINTS, int(width * POINTS_PER_PIXEL))
+
+    def visible_indices(self):
+        """Indices of the sessions to draw: LTTB of both series, merged"""
+        budget = self.point_budget()
+        if len(self.xs) <= budget:
+            return list(range(len(self.xs)))
+        keep = set(lttb(self.xs, self.scores, budget))
+        keep.update(lttb(self.xs, self.totals, budget))
+        return sorted(keep)
+
+    def render(self):
+        indices = self.visible_indices()
+        xs = [self.xs[i] for i in indices]
+        scores = [self.scores[i] for i in indices]
+        totals = [self.totals[i] for i in indices]
+
+        marker = "o" if len(xs) <= MARKER_MAX_POINTS else ""
+        self.score_line.set_data(xs, scores)
+        self.score_line.set_marker(marker)
+        self.total_line.set_data(xs, totals)
+        self.total_line.set_marker(marker)
+        # The fill follows the downsampled line, so replacing it stays cheap
+        if self.score_fill is not None:
+            self.score_fill.remove()
+        self.score_fill = self.ax.fill_between(xs, scores, color="blue", alpha=0.2) if xs else None
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.figure.canvas.draw_idle()
+        return len(xs)
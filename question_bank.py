@@ -0,0 +1,123 @@
+import json
+import logging
+import threading
+import time
+
+# Bump when the bank's contents change so banks built by older code are ignored
+BANK_VERSION = 2
+# Concurrent builds are serialised per document through one of this many locks
+BUILD_LOCK_STRIPES = 64
+
+
+class QuestionBank:
+    """Question material persisted per document and shared across users.
+
+    A bank is every question sentence of one document with the words that
+    can be blanked out of it (``[sentence, [[word, tag], ...]]`` pairs, see
+    quiz_generator.build_question_bank), keyed by the document's fingerprint
+    (see quiz_generator.text_fingerprint). Questions are not stored: each
+    request picks sentences, a blank and distractors afresh
+    (quiz_generator.questions_from_bank), so users sharing a document still
+    get different questions, of any type. Banks are stored in the
+    ``question_bank`` table and loaded through ``cache`` when possible.
+    Concurrent builds in one process wait for a single one instead of all
+    running the NLP pipeline.
+    """
+
+    def __init__(self, db_pool, cache=None):
+        self.db_pool = db_pool
+        self.cache = cache
+        self._build_locks = [threading.Lock() for _ in range(BUILD_LOCK_STRIPES)]
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "builds": 0,
+            "build_time": 0.0,
+            "load_failures": 0,
+            "store_failures": 0,
+        }
+
+    @staticmethod
+    def _cache_key(fingerprint):
+        return f"bank:{BANK_VERSION}:{fingerprint}"
+
+    def _count(self, stat, amount=1):
+        with self._lock:
+            self._stats[stat] += amount
+
+    def load(self, fingerprint):
+        """The stored bank for a document, or None if it has not been built or cannot be read"""
+        key = self._cache_key(fingerprint)
+        if self.cache is not None:
+            bank = self.cache.get(key)
+            if bank is not None:
+                self._count("memory_hits")
+                return bank
+
+        try:
+            with self.db_pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT sentence, candidates FROM question_bank "
+                        "WHERE fingerprint = %s AND version = %s ORDER BY position",
+                        (fingerprint, BANK_VERSION)
+                    )
+                    rows = cursor.fetchall()
+        except Exception:
+            # Quizzes must not depend on the database: treat it as a miss and build from the analysis
+            self._count("load_failures")
+            logging.warning(f"Failed to load question bank {fingerprint[:12]}", exc_info=True)
+            return None
+        if not rows:
+            return None
+        bank = [[row["sentence"], json.loads(row["candidates"])] for row in rows]
+        self._count("db_hits")
+        if self.cache is not None:
+            self.cache.set(key, bank)
+        return bank
+
+    def store(self, fingerprint, bank):
+        if self.cache is not None:
+            self.cache.set(self._cache_key(fingerprint), bank)
+        if not bank:
+            return
+        try:
+            with self.db_pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    # A racing build in another process stored the same positions; keep whichever came first
+                    cursor.executemany(
+                        "INSERT IGNORE INTO question_bank "
+                        "(fingerprint, version, position, sentence, candidates) "
+                        "VALUES (%s, %s, %s, %s, %s)",
+                        [(fingerprint, BANK_VERSION, position, sentence, json.dumps(candidates))
+                         for position, (sentence, candidates) in enumerate(bank)]
+                    )
+                conn.commit()
+        except Exception:
+            # The bank is still served from memory; the next process to miss rebuilds it
+            self._count("store_failures")
+            logging.warning(f"Failed to store question bank {fingerprint[:12]}", exc_info=True)
+
+    def get_or_build(self, fingerprint, build):
+        """Load a document's bank, building and storing it with ``build()`` on a miss"""
+        bank = self.load(fingerprint)
+        if bank is not None:
+            return bank
+        with self._build_locks[hash(fingerprint) % BUILD_LOCK_STRIPES]:
+            # Another thread may have built it while this one waited
+            bank = self.load(fingerprint)
+            if bank is not None:
+                return bank
+            started = time.perf_counter()
+            bank = build()
+            self._count("builds")
+            self._count("build_time", time.perf_counter() - started)
+            self.store(fingerprint, bank)
+            return bank
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["version"] = BANK_VERSION
+        return stats
@@ -0,0 +1,51 @@
+"""List model for the questions of a past quiz, shown by QuizDetailsWindow.
+
+Each question is one model row rendered as a wrapped text block by a
+QListView, which only lays out and paints the rows on screen, instead of a
+QGroupBox with a QLabel per option for every question.
+"""
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor
+
+CORRECT_COLOR = QColor("#2e7d32")
+INCORRECT_COLOR = QColor("#c62828")
+
+
+def format_question(number, question):
+    lines = [f"{number}. {question['question']}"]
+    for option in question['options']:
+        if option == question['correct_answer']:
+            lines.append(f"    ✔ {option}")
+        elif option == question['user_answer']:
+            lines.append(f"    ✘ {option}  (your answer)")
+        else:
+            lines.append(f"    • {option}")
+    correct = question['user_answer'] == question['correct_answer']
+    lines.append(f"Result: {'Correct' if correct else 'Incorrect'}")
+    return "\n".join(lines), correct
+
+
+class QuestionListModel(QAbstractListModel):
+    """Questions as (text, correct) rows, formatted once when set"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def set_questions(self, questions):
+        self.beginResetModel()
+        self._rows = [format_question(number, question) for number, question in enumerate(questions, start=1)]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        text, correct = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return CORRECT_COLOR if correct else INCORRECT_COLOR
+        return None
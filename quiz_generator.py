@@ -0,0 +1,384 @@
+import hashlib
+import heapq
+import math
+import random
+import re
+from collections import Counter
+import nltk
+from nltk_resources import get_sentence_tokenizer, get_tagger
+
+# Sentences with this many words or fewer are not worth asking about
+MIN_SENTENCE_WORDS = 5
+# How many sentences are sampled from the text as question candidates
+KEY_SENTENCES = 20
+# How many sentences of a document are tagged and kept in its cached analysis
+ANALYSIS_POOL_SIZE = 100
+# POS tag prefixes (nouns, verbs, adjectives) of words that can be blanked out
+CANDIDATE_TAGS = ('NN', 'VB', 'JJ')
+MIN_CANDIDATE_LENGTH = 4
+# Texts longer than this are scored in chunks of SCORING_CHUNK_CHARS (see extract_key_sentences_streaming)
+STREAMING_THRESHOLD_CHARS = 200_000
+SCORING_CHUNK_CHARS = 64 * 1024
+# Terms shorter than this, or in STOPWORDS, do not count towards a sentence's score
+MIN_TERM_LENGTH = 3
+STOPWORDS = frozenset("""
+about above after again against all also and any are because been before being below between both but
+can could did does doing down during each few for from further had has have having her here hers herself
+him himself his how into its itself just more most much must not now off once only other our ours
+ourselves out over own same she should some such than that the their theirs them themselves then there
+these they this those through too under until upon very was were what when where which while who whom
+why will with would you your yours yourself yourselves
+""".split())
+TERM_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+# Sentences tagged per batch when analysing a new text incrementally
+STREAM_BATCH_SIZE = 4
+# MCQ distractors per question, drawn from this many most frequent words of the answer's POS bucket
+MCQ_DISTRACTORS = 3
+DISTRACTOR_POOL = 50
+
+"""Clean and preprocess the extracted text"""
+def preprocess_text(text):
+    return re.sub(r'\s+', ' ', text).strip()
+
+"""Content hash of preprocessed text, used as the cache key for its analysis"""
+def text_fingerprint(cleaned_text):
+    return hashlib.sha256(cleaned_text.encode('utf-8')).hexdigest()
+
+def sentence_terms(sentence):
+    return [term for term in TERM_RE.findall(sentence.lower())
+            if len(term) >= MIN_TERM_LENGTH and term not in STOPWORDS]
+
+class TermStats:
+    """Term and sentence counts of a document, gathered in one pass.
+
+    A term's weight is its TF-IDF with sentences as the documents: frequent
+    enough in the text to be a topic, not so common that it is in every
+    sentence. Memory grows with the vocabulary, not with the text.
+    """
+
+    def __init__(self):
+        self.sentences = 0
+        self.term_counts = Counter()
+        self.sentence_counts = Counter()
+
+    def add(self, terms):
+        self.sentences += 1
+        self.term_counts.update(terms)
+        self.sentence_counts.update(set(terms))
+
+    def weights(self):
+        total = self.sentences + 1
+        return {term: count * math.log(total / self.sentence_counts[term])
+                for term, count in self.term_counts.items()}
+
+"""Keyword-density score of a sentence: summed term weights, damped for length"""
+def score_sentence(terms, weights):
+    unique = set(terms)
+    if not unique:
+        return 0.0
+    return sum(weights.get(term, 0.0) for term in unique) / math.sqrt(len(unique))
+
+def iter_chunk_sentences(chunks):
+    """Split an iterable of text chunks into sentences without joining the whole text.
+
+    The trailing, possibly incomplete sentence of each chunk is carried into
+    the next one, so only about one chunk is held in memory at a time.
+    """
+    tokenizer = get_sentence_tokenizer()
+    carry = ""
+    for chunk in chunks:
+        buffer = carry + chunk
+        spans = list(tokenizer.span_tokenize(buffer))
+        if not spans:
+            carry = buffer
+            continue
+        for start, end in spans[:-1]:
+            yield preprocess_text(buffer[start:end])
+        carry = buffer[spans[-1][0]:]
+    if carry.strip():
+        for sentence in tokenizer.tokenize(carry):
+            yield preprocess_text(sentence)
+
+def is_key_candidate(sentence):
+    return len(sentence.split()) > MIN_SENTENCE_WORDS
+
+def extract_key_sentences_streaming(open_chunks, num_sentences=KEY_SENTENCES):
+    """Top-scoring sentences of a text read as chunks, in document order.
+
+    ``open_chunks`` is a zero-argument callable returning a fresh iterable of
+    text chunks (e.g. reading a file); it is called twice, once to gather
+    term statistics and once to score sentences into a bounded heap, so
+    memory stays at one chunk plus the vocabulary plus ``num_sentences``.
+    """
+    stats = TermStats()
+    for sentence in iter_chunk_sentences(open_chunks()):
+        if is_key_candidate(sentence):
+            stats.add(sentence_terms(sentence))
+    weights = stats.weights()
+
+    heap = []
+    kept = set()
+    index = 0
+    for sentence in iter_chunk_sentences(open_chunks()):
+        if not is_key_candidate(sentence) or sentence in kept:
+            continue
+        # Ties go to the earlier sentence
+        entry = (score_sentence(sentence_terms(sentence), weights), -index, sentence)
+        kept.add(sentence)
+        if len(heap) < num_sentences:
+            heapq.heappush(heap, entry)
+        else:
+            kept.discard(heapq.heappushpop(heap, entry)[2])
+        index += 1
+    return [sentence for _, _, sentence in sorted(heap, key=lambda entry: -entry[1])]
+
+def extract_key_sentences(text, num_sentences=KEY_SENTENCES):
+    """Pick the ``num_sentences`` best question sentences, in document order.
+
+    Every sentence long enough to ask about is scored by keyword density
+    (see TermStats) in one linear pass, and the best are kept with a heap
+    instead of sorting them all. Very long texts go through the chunked
+    streaming variant so the sentence list is never materialised.
+    """
+    if len(text) > STREAMING_THRESHOLD_CHARS:
+        return extract_key_sentences_streaming(
+            lambda: (text[i:i + SCORING_CHUNK_CHARS] for i in range(0, len(text), SCORING_CHUNK_CHARS)),
+            num_sentences)
+
+    sentences = [s for s in get_sentence_tokenizer().tokenize(text) if is_key_candidate(s)]
+    stats = TermStats()
+    for sentence in sentences:
+        stats.add(sentence_terms(sentence))
+    # Repeated sentences (running headers, boilerplate) count towards the
+    # statistics but are only candidates once
+    sentences = list(dict.fromkeys(sentences))
+    if len(sentences) <= num_sentences:
+        return sentences
+    weights = stats.weights()
+    scores = [score_sentence(sentence_terms(sentence), weights) for sentence in sentences]
+    best = heapq.nlargest(num_sentences, range(len(sentences)), key=lambda i: (scores[i], -i))
+    return [sentences[i] for i in sorted(best)]
+
+"""Tokenize and POS-tag a batch of sentences with the process-wide tagger"""
+def analyze_sentences(sentences):
+    # The input is already split into sentences, so skip word_tokenize's own sentence pass
+    tokenized = [nltk.word_tokenize(sentence, preserve_line=True) for sentence in sentences]
+    tagged = get_tagger().tag_sents(tokenized)
+    return list(zip(sentences, tagged))
+
+def analyze_text(cleaned_text):
+    """Split, tokenize and tag a document's question-candidate sentences.
+
+    The result is plain JSON-compatible data (``[sentence, [[word, tag], ...]]``
+    pairs) so it can be cached and reused across requests for the same text.
+    """
+    key_sentences = extract_key_sentences(cleaned_text, ANALYSIS_POOL_SIZE)
+    return [[sentence, [list(pair) for pair in tagged]] for sentence, tagged in analyze_sentences(key_sentences)]
+
+def candidate_words(tagged):
+    return [(word, tag) for word, tag in tagged if tag.startswith(CANDIDATE_TAGS) and len(word) >= MIN_CANDIDATE_LENGTH]
+
+class DistractorIndex:
+    """A document's candidate words bucketed by POS tag, most frequent first.
+
+    Each word is filed under its exact tag (``NNS``, ``VBD``, ...) and its
+    coarse class (``NN*``, ``VB*``, ``JJ*``), so a plural noun gets plural-noun
+    distractors when the document has enough of them. Built once per text and
+    cached next to its analysis; ``pick`` then draws distractors in constant
+    time, never repeating a word or the answer.
+    """
+
+    def __init__(self, buckets=None):
+        # tag -> words ordered by descending frequency
+        self.buckets = buckets or {}
+        self._counts = {}
+        self._forms = {}
+
+    @classmethod
+    def from_analysis(cls, analysis):
+        index = cls()
+        for _, tagged in analysis:
+            index.add(tagged)
+        return index
+
+    def add(self, tagged):
+        """Count the candidate words of one more tagged sentence"""
+        changed = set()
+        for word, tag in candidate_words(tagged):
+            key = word.lower()
+            self._forms.setdefault(key, word)
+            for bucket in (tag, tag[:2] + "*"):
+                self._counts.setdefault(bucket, Counter())[key] += 1
+                changed.add(bucket)
+        for bucket in changed:
+            # Rebuilt lazily by _bucket; adding is cheap, reading is O(1) once built
+            self.buckets.pop(bucket, None)
+
+    def _bucket(self, tag):
+        words = self.buckets.get(tag)
+        if words is None:
+            counts = self._counts.get(tag)
+            if not counts:
+                return []
+            words = [self._forms[key] for key, _ in counts.most_common(DISTRACTOR_POOL)]
+            self.buckets[tag] = words
+        return words
+
+    def pick(self, answer, tag, count=MCQ_DISTRACTORS):
+        """Up to ``count`` distinct words sharing ``answer``'s part of speech"""
+        excluded = {answer.lower()}
+        picked = []
+        for bucket in (tag, tag[:2] + "*"):
+            words = self._bucket(bucket)
+            # A few random probes keep options varied; the scan below fills any gap
+            for _ in range(count * 2):
+                if len(picked) >= count or not words:
+                    break
+                word = words[random.randrange(len(words))]
+                if word.lower() not in excluded:
+                    excluded.add(word.lower())
+                    picked.append(word)
+            for word in words:
+                if len(picked) >= count:
+                    break
+                if word.lower() not in excluded:
+                    excluded.add(word.lower())
+                    picked.append(word)
+            if len(picked) >= count:
+                break
+        return picked
+
+    def to_json(self):
+        return {tag: self._bucket(tag) for tag in self._counts}
+
+    @classmethod
+    def from_json(cls, buckets):
+        return cls(dict(buckets))
+
+"""Distractor index for a text, cached under its own key next to the analysis"""
+def get_distractor_index(key, analysis, cache=None):
+    if cache is None:
+        return DistractorIndex.from_analysis(analysis)
+    buckets = cache.get_or_compute(f"{key}:distractors", lambda: DistractorIndex.from_analysis(analysis).to_json())
+    return DistractorIndex.from_json(buckets)
+
+"""Build a single question from an already tagged sentence"""
+def build_question(sentence, tagged, question_type, distractors=None):
+    candidates = candidate_words(tagged)
+
+    if not candidates:
+        return None
+
+    word_to_replace, tag = random.choice(candidates)
+
+    if question_type == 'short_answer':
+        return {"question": f"What is the meaning of '{word_to_replace}' in the context of the sentence?", "correct_answer": word_to_replace, "options": []}
+    elif question_type == 'fill_in_the_blank':
+        question = sentence.replace(word_to_replace, "_______")
+        return {"question": question, "correct_answer": word_to_replace, "options": []}
+    else:  # mcq
+        question = sentence.replace(word_to_replace, "_______")
+        # Distractors share the answer's part of speech and come from anywhere in the document
+        if distractors is None:
+            distractors = DistractorIndex()
+            distractors.add(tagged)
+        options = [word_to_replace] + distractors.pick(word_to_replace, tag)
+        random.shuffle(options)
+        return {"question": question, "correct_answer": word_to_replace, "options": options}
+
+def iter_questions(text, num_questions=5, question_type='mcq', cache=None, incremental=False,
+                   complete_analysis=True):
+    """Yield up to ``num_questions`` questions from raw text as each is built.
+
+    A cached analysis is used as-is. With ``incremental`` a miss tags the
+    sentence pool in batches of STREAM_BATCH_SIZE, question sentences first,
+    so the first question is ready after one small batch instead of after the
+    whole document; its distractors then come from the sentences tagged so
+    far. The rest of the pool is then tagged and the complete analysis and
+    distractor index are cached as usual, unless ``complete_analysis`` is
+    False: then tagging stops with the last question and the caller is
+    expected to analyse the text later (e.g. while building its bank).
+    """
+    cleaned_text = preprocess_text(text)
+    key = text_fingerprint(cleaned_text)
+    analysis = cache.get(key) if cache is not None else None
+    if analysis is None and not incremental:
+        analysis = analyze_text(cleaned_text)
+        if cache is not None:
+            cache.set(key, analysis)
+    if analysis is not None:
+        distractors = get_distractor_index(key, analysis, cache)
+        produced = 0
+        for sentence, tagged in random.sample(analysis, min(KEY_SENTENCES, len(analysis))):
+            question = build_question(sentence, tagged, question_type, distractors)
+            if question:
+                yield question
+                produced += 1
+                if produced >= num_questions:
+                    return
+        return
+
+    pool = extract_key_sentences(cleaned_text, ANALYSIS_POOL_SIZE)
+    chosen = random.sample(range(len(pool)), min(KEY_SENTENCES, len(pool)))
+    chosen_set = set(chosen)
+    order = chosen + [i for i in range(len(pool)) if i not in chosen_set]
+    analysis = [None] * len(pool)
+    distractors = DistractorIndex()
+    produced = 0
+    for start in range(0, len(order), STREAM_BATCH_SIZE):
+        batch = order[start:start + STREAM_BATCH_SIZE]
+        for index, (sentence, tagged) in zip(batch, analyze_sentences([pool[i] for i in batch])):
+            analysis[index] = [sentence, [list(pair) for pair in tagged]]
+            distractors.add(analysis[index][1])
+        for index in batch:
+            if index in chosen_set and produced < num_questions:
+                question = build_question(analysis[index][0], analysis[index][1], question_type, distractors)
+                if question:
+                    yield question
+                    produced += 1
+        if produced >= num_questions and not complete_analysis:
+            return
+    if cache is not None:
+        cache.set(key, analysis)
+        cache.set(f"{key}:distractors", distractors.to_json())
+
+def build_question_bank(text, cache=None):
+    """The text's question sentences with their blankable words, in document order.
+
+    Returns ``[sentence, [[word, tag], ...]]`` pairs for every sentence of the
+    analysis pool that has at least one candidate word, to fill a
+    QuestionBank. The analysis comes from ``cache`` when the text has been
+    seen before. No blank is chosen here; see questions_from_bank.
+    """
+    cleaned_text = preprocess_text(text)
+    key = text_fingerprint(cleaned_text)
+    if cache is not None:
+        analysis = cache.get_or_compute(key, lambda: analyze_text(cleaned_text))
+    else:
+        analysis = analyze_text(cleaned_text)
+    bank = []
+    for sentence, tagged in analysis:
+        candidates = [list(pair) for pair in candidate_words(tagged)]
+        if candidates:
+            bank.append([sentence, candidates])
+    return bank
+
+def questions_from_bank(key, bank, num_questions=5, question_type='mcq', cache=None):
+    """A fresh quiz from a bank: random sentences, each with a random blank and its own distractors.
+
+    ``key`` is the document's fingerprint; the distractor index is the one
+    cached for its analysis, or rebuilt from the bank's candidate words.
+    """
+    distractors = get_distractor_index(key, bank, cache)
+    return [build_question(sentence, candidates, question_type, distractors)
+            for sentence, candidates in random.sample(bank, min(num_questions, len(bank)))]
+
+def generate_questions(text, num_questions=5, question_type='mcq', cache=None):
+    """Generate up to ``num_questions`` questions from raw text.
+
+    The tagged analysis of the text is looked up in ``cache`` (an
+    AnalysisCache) by content hash, so re-submitting the same page skips
+    sentence splitting and tagging. Questions themselves are never cached:
+    each call samples fresh sentences and blanks from the analysis.
+    """
+    return list(iter_questions(text, num_questions, question_type, cache))
@@ -0,0 +1,219 @@
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobQueueFull(Exception):
+    """Raised when every worker is busy and the job queue is full"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f"Quiz job queue is full, retry after {retry_after}s")
+
+
+class QuizJob:
+    """One background generation job; questions are appended as they are built"""
+
+    def __init__(self, params):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = "queued"  # queued, running, done, failed, cancelled
+        self.questions = []
+        self.error = None
+        self.created = time.monotonic()
+        self.finished = None
+        self._changed = threading.Condition()
+
+    def is_finished(self):
+        return self.finished is not None
+
+    def cancel(self):
+        with self._changed:
+            if self.finished is None:
+                self.status = "cancelled"
+                self.finished = time.monotonic()
+                self._changed.notify_all()
+
+    def _start(self):
+        with self._changed:
+            if self.finished is not None:
+                return False
+            self.status = "running"
+            return True
+
+    def _append(self, question):
+        with self._changed:
+            if self.finished is not None:
+                return False
+            self.questions.append(question)
+            self._changed.notify_all()
+            return True
+
+    def _finish(self, status, error=None):
+        with self._changed:
+            if self.finished is None:
+                self.status = status
+                self.error = error
+                self.finished = time.monotonic()
+            self._changed.notify_all()
+
+    def snapshot(self, after=0):
+        """JSON-able state with the questions from index ``after`` on"""
+        with self._changed:
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "questions": self.questions[after:],
+                "generated": len(self.questions),
+                "requested": self.params["num_questions"],
+                "error": self.error,
+            }
+
+    def wait(self, after, timeout):
+        """Block until there are more than ``after`` questions or the job ends.
+
+        Returns ``(new_questions, status, error)``; an empty list with a
+        running status means the timeout expired first.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.questions) > after or self.finished is not None, timeout)
+            return self.questions[after:], self.status, self.error
+
+
+class QuizJobManager:
+    """Runs quiz generation in a bounded thread pool and keeps job state in memory.
+
+    ``run(params)`` must return an iterator of questions; each one is stored
+    on the job as soon as it is yielded so clients can poll or stream them.
+    At most ``workers`` jobs run at once and at most ``max_queue`` more wait;
+    further submissions raise JobQueueFull. Finished jobs are forgotten after
+    ``ttl`` seconds.
+
+    Jobs live in the memory of the process that accepted them, so clients
+    must reach the same process when polling (one worker process, or sticky
+    routing by job id).
+    """
+
+    def __init__(self, run, workers=2, max_queue=32, ttl=600.0):
+        self.run = run
+        self.workers = workers
+        self.max_queue = max_queue
+        self.ttl = ttl
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._jobs = {}
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "rejected": 0,
+            "active": 0,
+            "duration_total": 0.0,
+        }
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="quiz-job")
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _retry_after(self):
+        with self._lock:
+            finished = self._stats["completed"] + self._stats["failed"]
+            mean = self._stats["duration_total"] / finished if finished else 5.0
+            queued = max(0, self._stats["active"] - self.workers)
+        return max(1, math.ceil(mean * (queued + 1) / self.workers))
+
+    def _sweep(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.finished is not None and now - job.finished > self.ttl]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def submit(self, params):
+        """Queue a job for ``params`` and return it, or raise JobQueueFull"""
+        self._sweep()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise JobQueueFull(self._retry_after())
+        job = QuizJob(params)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._stats["submitted"] += 1
+            self._stats["active"] += 1
+        try:
+            self._get_executor().submit(self._execute, job)
+        except BaseException:
+            self._release(job, 0.0)
+            raise
+        return job
+
+    def _execute(self, job):
+        started = time.monotonic()
+        try:
+            if not job._start():
+                return
+            for question in self.run(job.params):
+                if not job._append(question):
+                    # Cancelled; stop generating
+                    return
+            job._finish("done")
+        except Exception as e:
+            logging.error(f"Quiz job {job.id} failed: {str(e)}", exc_info=True)
+            job._finish("failed", str(e))
+        finally:
+            self._release(job, time.monotonic() - started)
+
+    def _release(self, job, duration):
+        with self._lock:
+            self._stats["active"] -= 1
+            if job.status == "done":
+                self._stats["completed"] += 1
+                self._stats["duration_total"] += duration
+            elif job.status == "cancelled":
+                self._stats["cancelled"] += 1
+            else:
+                self._stats["failed"] += 1
+                self._stats["duration_total"] += duration
+        self._slots.release()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["stored"] = len(self._jobs)
+        stats.update({
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queue_depth": max(0, stats["active"] - self.workers),
+        })
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
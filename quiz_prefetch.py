@@ -0,0 +1,107 @@
+"""Continuous practice: the next quizzes for a text are generated while the current one is answered.
+
+QuizPrefetcher keeps up to ``depth`` quizzes ready or in flight through a
+``fetch_quiz(num_questions, on_success, on_error, owner)`` function, which
+must call back later on the GUI thread with a /generate_quiz response or an
+error. Once a document has a question bank the server only samples it, so a
+prefetched quiz costs one cheap request and the next quiz opens at once.
+"""
+import logging
+from collections import deque
+
+from PyQt6.QtCore import QObject
+
+# Quizzes generated ahead of the one being answered
+PREFETCH_DEPTH = 1
+
+
+class QuizPrefetcher(QObject):
+    """Ready quizzes for one text, refilled up to ``depth`` as they are taken.
+
+    Each request asks for twice ``num_questions`` so questions already handed
+    out this session can be skipped while unseen ones remain. Pending
+    requests are owned by the prefetcher: cancel() drops their responses and
+    deleting the prefetcher cancels them in the API client.
+    """
+
+    def __init__(self, text, fetch_quiz, num_questions, depth=PREFETCH_DEPTH, parent=None):
+        super().__init__(parent)
+        self.text = text
+        self._fetch_quiz = fetch_quiz
+        self.num_questions = num_questions
+        self.depth = max(0, depth)
+        self._ready = deque()
+        self._in_flight = 0
+        # Callbacks from take() waiting for a request that has not landed yet
+        self._waiters = deque()
+        self._seen = set()
+        # Bumped by cancel() so responses that still arrive are dropped
+        self._generation = 0
+
+    def mark_seen(self, questions):
+        self._seen.update(question["question"] for question in questions)
+
+    def fill(self):
+        """Request quizzes until ``depth`` are ready or on their way"""
+        while len(self._ready) + self._in_flight - len(self._waiters) < self.depth:
+            self._in_flight += 1
+            generation = self._generation
+            self._fetch_quiz(self.num_questions * 2,
+                             lambda response: self._on_response(generation, response),
+                             lambda error: self._on_error(generation, error), self)
+
+    def take(self, callback):
+        """Hand the next quiz to ``callback(questions)``, now or when its request lands.
+
+        Returns False when nothing is ready or on its way. ``callback(None)``
+        means the pending request failed and the caller should generate the
+        quiz itself.
+        """
+        if self._ready:
+            callback(self._ready.popleft())
+        elif self._in_flight > len(self._waiters):
+            self._waiters.append(callback)
+        else:
+            return False
+        self.fill()
+        return True
+
+    def cancel(self):
+        self._generation += 1
+        self._ready.clear()
+        self._waiters.clear()
+        self._in_flight = 0
+
+    def _on_response(self, generation, response):
+        if generation != self._generation:
+            return
+        self._in_flight -= 1
+        if response.status_code != 200:
+            self._on_error(generation, f"HTTP {response.status_code}", counted=True)
+            return
+        questions = self._pick(response.json())
+        if not questions:
+            self._on_error(generation, "no questions", counted=True)
+            return
+        if self._waiters:
+            self._waiters.popleft()(questions)
+            self.fill()
+        else:
+            self._ready.append(questions)
+
+    def _on_error(self, generation, error, counted=False):
+        if generation != self._generation:
+            return
+        if not counted:
+            self._in_flight -= 1
+        # No automatic retry; the next take() falls back to a normal generation
+        logging.warning("Prefetching the next quiz failed: %s", error)
+        if self._waiters:
+            self._waiters.popleft()(None)
+
+    def _pick(self, questions):
+        unseen = [question for question in questions if question["question"] not in self._seen]
+        seen = [question for question in questions if question["question"] in self._seen]
+        batch = (unseen + seen)[:self.num_questions]
+        self.mark_seen(batch)
+        return batch
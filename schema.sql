@@ -0,0 +1,59 @@
+-- TextQuiz database schema (MySQL / AWS RDS).
+-- Fresh databases: load this file. Existing databases: apply the files in
+-- migrations/ in order; each one is already reflected below.
+
+CREATE TABLE IF NOT EXISTS users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    username VARCHAR(255) NOT NULL UNIQUE,
+    password CHAR(64) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS quiz_results (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    extracted_text TEXT NOT NULL,
+    score INT NOT NULL,
+    total_questions INT NOT NULL,
+    date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    -- Required by the keyset pagination in /history and /progress (sort=date and sort=score)
+    INDEX idx_quiz_results_user_date (user_id, date),
+    INDEX idx_quiz_results_user_score (user_id, score)
+);
+
+CREATE TABLE IF NOT EXISTS quiz_questions (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    quiz_id INT NOT NULL,
+    question TEXT NOT NULL,
+    correct_answer VARCHAR(255) NOT NULL,
+    options TEXT,  -- JSON array (older rows: comma-joined)
+    user_answer VARCHAR(255),
+    FOREIGN KEY (quiz_id) REFERENCES quiz_results (id),
+    -- /quiz/<id> joins on quiz_id
+    INDEX idx_quiz_questions_quiz_id (quiz_id)
+);
+
+-- Question sentences and their candidate blanks per document, shared across users (see question_bank.py)
+CREATE TABLE IF NOT EXISTS question_bank (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    fingerprint CHAR(64) NOT NULL,
+    version INT NOT NULL,
+    position INT NOT NULL,
+    sentence TEXT NOT NULL,
+    candidates TEXT NOT NULL,  -- JSON [[word, POS tag], ...]
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_question_bank_document (fingerprint, version, position)
+);
+
+-- Daily/weekly per-user aggregates for /progress/summary, maintained by /results
+CREATE TABLE IF NOT EXISTS progress_rollups (
+    user_id INT NOT NULL,
+    period ENUM('day', 'week') NOT NULL,
+    bucket DATE NOT NULL,
+    attempts INT NOT NULL,
+    score_sum INT NOT NULL,
+    total_sum INT NOT NULL,
+    best_score INT NOT NULL,
+    PRIMARY KEY (user_id, period, bucket),
+    FOREIGN KEY (user_id) REFERENCES users (id)
+);
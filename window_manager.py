@@ -0,0 +1,85 @@
+"""Page lifecycle for the desktop client's QStackedWidget.
+
+MainApplication used to build a new window object on every navigation and
+leave most of them in the stack. WindowManager keeps one instance per page
+key, refreshes it when it is shown again and deletes the least recently used
+pages once more than ``max_pages`` are alive, so memory stays flat however
+long a session runs.
+"""
+from collections import OrderedDict
+
+# Unpinned pages kept alive at once; older ones are deleted and rebuilt on demand
+MAX_LIVE_PAGES = 5
+
+
+class WindowManager:
+    """Shows pages in ``stack``, reusing instances and bounding how many stay alive.
+
+    ``show(key, create, *args)`` brings back the page stored under ``key`` and
+    calls its ``refresh(*args)`` so it reloads its data, or builds one with
+    ``create(*args)`` when there is none. Pages without a ``refresh`` method
+    (a running quiz, its results) are single-use: showing their key again
+    replaces the old instance. Pinned pages (login, register) are never
+    evicted or deleted. A page's ``teardown()``, if it has one, is called
+    before it is deleted, for work that must stop with it (a quiz job still
+    generating on the server).
+    """
+
+    def __init__(self, stack, max_pages=MAX_LIVE_PAGES):
+        self.stack = stack
+        self.max_pages = max_pages
+        self._pinned = {}
+        # Unpinned pages, least recently shown first
+        self._pages = OrderedDict()
+
+    def pin(self, key, page):
+        self._pinned[key] = page
+        self.stack.addWidget(page)
+
+    def page(self, key):
+        return self._pinned.get(key) or self._pages.get(key)
+
+    def show(self, key, create, *args, refresh=True):
+        """Make the page for ``key`` current; ``refresh=False`` returns to it as it was left"""
+        replaced = None
+        if key in self._pinned:
+            page = self._pinned[key]
+        else:
+            page = self._pages.pop(key, None)
+            if page is not None and hasattr(page, "refresh"):
+                if refresh:
+                    page.refresh(*args)
+            else:
+                replaced = page
+                page = create(*args)
+                self.stack.addWidget(page)
+            self._pages[key] = page
+
+        self.stack.setCurrentWidget(page)
+        if replaced is not None:
+            self._delete(replaced)
+        while len(self._pages) > self.max_pages:
+            _, oldest = self._pages.popitem(last=False)
+            self._delete(oldest)
+        return page
+
+    def discard(self, key):
+        page = self._pages.pop(key, None)
+        if page is not None:
+            self._delete(page)
+
+    def discard_all(self):
+        """Delete every unpinned page, e.g. on logout so no user data outlives the session"""
+        while self._pages:
+            _, page = self._pages.popitem(last=False)
+            self._delete(page)
+
+    def live_pages(self):
+        return len(self._pinned) + len(self._pages)
+
+    def _delete(self, page):
+        if hasattr(page, "teardown"):
+            page.teardown()
+        # Pending API calls owned by the page are cancelled when it is destroyed
+        self.stack.removeWidget(page)
+        page.deleteLater()
@@ -0,0 +1,16 @@
+"""Production entry point: `gunicorn -c gunicorn.conf.py wsgi:app`.
+
+Defaults to the production profile and loads the NLTK tagger and sentence
+tokenizer before gunicorn forks, so every worker shares one copy of the
+models instead of loading its own on the first request.
+"""
+import os
+
+os.environ.setdefault("APP_ENV", "production")
+
+import nltk_resources
+from api import app, ocr_pool, quiz_jobs
+
+nltk_resources.preload()
+
+__all__ = ["app", "ocr_pool", "quiz_jobs"]